@@ -1,5 +1,5 @@
 import os
-from typing import Iterable, List
+from typing import Iterable, Iterator, List
 
 import pandas as pd
 from langchain_core.documents import Document
@@ -34,6 +34,8 @@ class CSVLoader(BaseLoader):
         na_fill: str = "",
         dataframe: pd.DataFrame | None = None,
         read_kwargs: dict | None = None,
+        chunksize: int = 10_000,
+        engine: str | None = None,
     ) -> None:
         # csv 파일경로
         self.file_path = file_path
@@ -51,6 +53,10 @@ class CSVLoader(BaseLoader):
         self.dataframe = dataframe
         # pd.read_csv에 그대로 전달할 추가 인자 딕셔너리
         self.read_kwargs = read_kwargs or {}
+        # lazy_load가 한 번에 읽는 행 수
+        self.chunksize = chunksize
+        # "pyarrow"면 pyarrow.csv 스트리밍 리더 사용 (없으면 pandas C 엔진)
+        self.engine = engine
 
     def load(self) -> List[Document]:
         """
@@ -58,45 +64,90 @@ class CSVLoader(BaseLoader):
             "컬럼명": "값" 문자열을 만들어서 page_content로
             metadata컬럼은 metadata로 담아 Document 객체로 리턴
         """
-        df = (
-            self.dataframe.copy()
-            if self.dataframe is not None
-            else pd.read_csv(
-                self.file_path,
-                sep=self.sep,
-                encoding=self.encoding,
-                **self.read_kwargs,
-            )
+        return list(self.lazy_load())
+
+    def lazy_load(self) -> Iterator[Document]:
+        """
+            chunksize 행씩 읽어 Document를 하나씩 내보낸다 (메모리 사용량 일정).
+            page_content/metadata는 행 단위 루프 대신 컬럼 단위 문자열 연산으로 만든다.
+        """
+        source = os.path.basename(self.file_path)
+        for frame, row_index in self._iter_frames():
+            yield from self._frame_to_documents(frame, row_index, source)
+
+    def _iter_frames(self) -> Iterator[tuple[pd.DataFrame, List[int]]]:
+        """(DataFrame 조각, 각 행의 row_index) 를 순서대로 돌려준다."""
+        if self.dataframe is not None:
+            for start in range(0, len(self.dataframe), self.chunksize):
+                frame = self.dataframe.iloc[start:start + self.chunksize]
+                yield frame, [int(i) if isinstance(i, (int, float)) else i for i in frame.index]
+            return
+
+        offset = 0
+        for frame in self._read_chunks():
+            yield frame, list(range(offset, offset + len(frame)))
+            offset += len(frame)
+
+    def _read_chunks(self) -> Iterator[pd.DataFrame]:
+        if self.engine == "pyarrow":
+            try:
+                from pyarrow import csv as pa_csv
+            except ImportError:
+                pass
+            else:
+                # pandas의 pyarrow 엔진은 chunksize를 지원하지 않아 pyarrow 스트리밍 리더를 직접 사용
+                reader = pa_csv.open_csv(
+                    self.file_path,
+                    read_options=pa_csv.ReadOptions(encoding=self.encoding),
+                    parse_options=pa_csv.ParseOptions(delimiter=self.sep),
+                )
+                for batch in reader:
+                    yield batch.to_pandas()
+                return
+
+        yield from pd.read_csv(
+            self.file_path,
+            sep=self.sep,
+            encoding=self.encoding,
+            chunksize=self.chunksize,
+            **self.read_kwargs,
         )
-        df = df.fillna(self.na_fill)
-
-        # Document 객체를 담을 리스트
-        documents = [] 
-        for idx, row in df.iterrows():
-            content_parts = []
-            used_fields = []
-            for col in self.content_columns:
-                if col not in df.columns:
-                    continue
-                value = str(row[col]).strip()
-                if not value:
-                    continue
-                content_parts.append(f"{col}: {value}")
-                used_fields.append(col)
-
-            if not content_parts:
-                continue
 
-            metadata = {
-                col: str(row[col]).strip()
-                for col in self.metadata_columns
-                if col in df.columns
-            }
-            metadata["row_index"] = idx
-            metadata["source"] = os.path.basename(self.file_path)
-            metadata["source_fields"] = used_fields
-
-            documents.append(
-                Document(page_content=" | ".join(content_parts), metadata=metadata)
-            )
-        return documents
+    def _clean(self, frame: pd.DataFrame, col: str) -> pd.Series:
+        return frame[col].fillna(self.na_fill).astype(str).str.strip()
+
+    def _frame_to_documents(
+        self, frame: pd.DataFrame, row_index: List[int], source: str
+    ) -> Iterator[Document]:
+        content_cols = [col for col in self.content_columns if col in frame.columns]
+        metadata_cols = [col for col in self.metadata_columns if col in frame.columns]
+        if not content_cols:
+            return
+        # row_index는 따로 받으므로 위치 기반 인덱스로 맞춘다 (중복 인덱스 정렬 문제 방지)
+        frame = frame.reset_index(drop=True)
+
+        # "컬럼명: 값" 을 " | " 로 잇되 빈 값은 건너뛴다 (컬럼 단위 연산)
+        content = pd.Series("", index=frame.index)
+        used = pd.DataFrame(index=frame.index)
+        for col in content_cols:
+            value = self._clean(frame, col)
+            has_value = value != ""
+            part = (col + ": " + value).where(has_value, "")
+            sep = pd.Series(" | ", index=frame.index).where((content != "") & has_value, "")
+            content = content + sep + part
+            used[col] = has_value
+
+        metadata_records = (
+            pd.DataFrame({col: self._clean(frame, col) for col in metadata_cols}, index=frame.index)
+            .to_dict("records")
+        )
+
+        for pos, (text, flags, metadata) in enumerate(
+            zip(content.tolist(), used.itertuples(index=False), metadata_records)
+        ):
+            if not text:
+                continue
+            metadata["row_index"] = row_index[pos]
+            metadata["source"] = source
+            metadata["source_fields"] = [col for col, flag in zip(content_cols, flags) if flag]
+            yield Document(page_content=text, metadata=metadata)
@@ -1,19 +1,36 @@
 from typing import Any, Dict, List, Optional, Sequence, Tuple
+import asyncio
 import json
+import os
 
-from psycopg2.extras import Json
+from psycopg2.extras import Json, execute_values
 import psycopg2
 
 from langchain_core.vectorstores import VectorStore
 from langchain_core.documents import Document
 
+from metrics import observe_vector_query
+from pg_pool import pooled_cursor
+
 class Singleton(type(VectorStore)):
-    _instances: Dict[type, VectorStore] = {}
+    """테이블별로 인스턴스(=DB 연결)를 하나만 만든다."""
+    _instances: Dict[Tuple[type, Optional[str]], VectorStore] = {}
 
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super().__call__(*args, **kwargs)
-        return cls._instances[cls]
+        key = (cls, kwargs.get("table"))
+        if key not in cls._instances:
+            cls._instances[key] = super().__call__(*args, **kwargs)
+        return cls._instances[key]
+
+
+def vector_distance_sql(column: str, index_cast: str | None = None) -> str:
+    """L2 거리 SQL 식. index_cast(예: "halfvec(3072)")가 있으면 같은 식으로 만든
+    표현식 인덱스를 탈 수 있도록 컬럼과 질의 벡터를 모두 캐스팅한다.
+    (pgvector의 ivfflat/hnsw는 vector 타입 2000차원까지만 지원)
+    """
+    if index_cast:
+        return f"({column}::{index_cast} <-> %s::{index_cast})"
+    return f"({column} <-> %s::vector)"
 
 
 class CustomPGVector(VectorStore, metaclass=Singleton):
@@ -25,12 +42,43 @@ class CustomPGVector(VectorStore, metaclass=Singleton):
         "job",
         "qualifications",
     )
+    _UPSERT_COLUMNS: Sequence[str] = (
+        "major",
+        "salary",
+        "employment",
+        "job",
+        "qualifications",
+        "universities",
+        "embedding",
+        "metadata",
+        "content_hash",
+    )
 
-    def __init__(self, conn_str, embedding_fn, table: str | None = None):
+    def __init__(
+        self,
+        conn_str,
+        embedding_fn,
+        table: str | None = None,
+        index_cast: str | None = None,
+        search_settings: Dict[str, Any] | None = None,
+    ):
         self.conn_str = conn_str
-        self.conn = psycopg2.connect(self.conn_str)
+        self._conn = None
         self.embedding_fn = embedding_fn
         self.table = table or self.DEFAULT_TABLE
+        self.index_cast = (
+            index_cast if index_cast is not None
+            else os.getenv("VECTOR_INDEX_CAST", "")
+        )
+        # 검색 트랜잭션에만 SET LOCAL로 적용할 설정 (예: {"hnsw.ef_search": 100})
+        self.search_settings = dict(search_settings or {})
+
+    @property
+    def conn(self):
+        """적재/관리용 전용 연결 (처음 쓸 때 연결). 검색은 pg_pool의 autocommit 연결을 쓴다."""
+        if self._conn is None or self._conn.closed:
+            self._conn = psycopg2.connect(self.conn_str)
+        return self._conn
 
     @classmethod
     def from_texts(
@@ -51,9 +99,21 @@ class CustomPGVector(VectorStore, metaclass=Singleton):
         texts: List[str],
         metadatas: Optional[List[Dict[str, Any]]] = None,
     ) -> None:
-        metadatas = metadatas or [{} for _ in texts]
         embeddings = self.embedding_fn.embed_documents(texts)
+        self.add_embeddings(texts, embeddings, metadatas=metadatas)
 
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        upsert: bool = False,
+    ) -> None:
+        """이미 계산된 임베딩을 저장한다 (여러 행을 INSERT 한 문장으로).
+
+        upsert=True 이면 (major_seq, chunk_index) 키가 이미 있는 행을 덮어쓴다.
+        """
+        metadatas = metadatas or [{} for _ in texts]
         insert_sql = f"""
             INSERT INTO {self.table} (
                 major_seq,
@@ -64,15 +124,95 @@ class CustomPGVector(VectorStore, metaclass=Singleton):
                 qualifications,
                 universities,
                 embedding,
-                metadata
-            ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
+                metadata,
+                chunk_index,
+                content_hash
+            ) VALUES %s
         """
+        if upsert:
+            insert_sql += f"""
+            ON CONFLICT (major_seq, chunk_index) DO UPDATE SET
+                {", ".join(f"{col} = EXCLUDED.{col}" for col in self._UPSERT_COLUMNS)}
+            """
+        rows = [
+            self._prepare_insert_payload(text, emb, meta)
+            for text, emb, meta in zip(texts, embeddings, metadatas)
+        ]
+        with self.conn.cursor() as cur:
+            execute_values(cur, insert_sql, rows, template="(%s,%s,%s,%s,%s,%s,%s,%s::vector,%s,%s,%s)", page_size=len(rows) or 1)
+        self.conn.commit()
+
+    # --- 증분 적재용 (major_seq, chunk_index, content_hash) ---
+    def ensure_chunk_key(self) -> None:
+        """chunk_index/content_hash 컬럼과 (major_seq, chunk_index) 유니크 인덱스를 준비한다.
 
+        이전 버전으로 적재된 행은 metadata의 chunk_index로 채우고, 중복 적재된 행은 최신 것만 남긴다.
+        """
+        index_name = self.table.replace(".", "_") + "_chunk_key"
         with self.conn.cursor() as cur:
-            for text, emb, meta in zip(texts, embeddings, metadatas):
-                payload = self._prepare_insert_payload(text, emb, meta)
-                cur.execute(insert_sql, payload)
+            cur.execute(f"ALTER TABLE {self.table} ADD COLUMN IF NOT EXISTS chunk_index INTEGER")
+            cur.execute(f"ALTER TABLE {self.table} ADD COLUMN IF NOT EXISTS content_hash TEXT")
+            cur.execute(
+                f"""
+                UPDATE {self.table} SET chunk_index = COALESCE((metadata->>'chunk_index')::int, 0)
+                WHERE chunk_index IS NULL
+                """
+            )
+            cur.execute(
+                f"""
+                DELETE FROM {self.table} a USING {self.table} b
+                WHERE a.major_seq = b.major_seq AND a.chunk_index = b.chunk_index AND a.id < b.id
+                """
+            )
+            schema, _, name = self.table.rpartition(".")
+            cur.execute(
+                """
+                SELECT 1 FROM pg_indexes
+                WHERE schemaname = %s AND tablename = %s
+                  AND indexdef LIKE 'CREATE UNIQUE INDEX%%(major_seq, chunk_index)'
+                """,
+                (schema or "public", name),
+            )
+            # shadow 테이블(LIKE ... INCLUDING ALL)은 이름만 다른 같은 인덱스를 이미 갖고 있다
+            if cur.fetchone() is None:
+                cur.execute(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {self.table} (major_seq, chunk_index)"
+                )
+        self.conn.commit()
+
+    def chunk_hashes(self) -> Dict[Tuple[str, int], Optional[str]]:
+        """저장된 청크의 (major_seq, chunk_index) -> content_hash"""
+        with self.conn.cursor() as cur:
+            cur.execute(f"SELECT major_seq, chunk_index, content_hash FROM {self.table}")
+            hashes = {(major_seq, chunk_index): chash for major_seq, chunk_index, chash in cur.fetchall()}
+        # 읽기 트랜잭션을 끝내 둔다 (idle in transaction으로 ACCESS SHARE 락을 쥐고 있으면 --reindex 교체가 막힘)
         self.conn.commit()
+        return hashes
+
+    def delete_chunks_except(self, keys: Sequence[Tuple[str, int]]) -> int:
+        """keys에 없는 청크(원본 행이 사라졌거나 청크 수가 줄어든 전공)를 삭제한다."""
+        major_seqs = [k[0] for k in keys]
+        chunk_indexes = [k[1] for k in keys]
+        with self.conn.cursor() as cur:
+            cur.execute(
+                f"""
+                DELETE FROM {self.table} t
+                WHERE t.chunk_index IS NULL
+                   OR NOT EXISTS (
+                        SELECT 1 FROM unnest(%s::text[], %s::int[]) AS k(major_seq, chunk_index)
+                        WHERE k.major_seq = t.major_seq AND k.chunk_index = t.chunk_index
+                   )
+                """,
+                (major_seqs, chunk_indexes),
+            )
+            deleted = cur.rowcount
+        self.conn.commit()
+        return deleted
+
+    @staticmethod
+    def chunk_key(metadata: Dict[str, Any]) -> Tuple[str, int]:
+        major_seq = metadata.get("major_seq") or metadata.get("majorSeq")
+        return str(major_seq), int(metadata.get("chunk_index") or 0)
 
     def similarity_search(
         self,
@@ -105,14 +245,14 @@ class CustomPGVector(VectorStore, metaclass=Singleton):
         if where_clauses:
             sql_query_template += " WHERE " + " AND ".join(where_clauses)
 
-        sql_query_template += """
-            ORDER BY embedding <-> %s::vector
+        sql_query_template += f"""
+            ORDER BY {vector_distance_sql("embedding", self.index_cast)}
             LIMIT %s
         """
         params.append(query_emb)
         params.append(k)
 
-        with self.conn.cursor() as cur:
+        with observe_vector_query("college", "similarity_search"), pooled_cursor(self.conn_str, self.search_settings) as cur:
             cur.execute(sql_query_template, tuple(params))
             rows = cur.fetchall()
 
@@ -124,8 +264,36 @@ class CustomPGVector(VectorStore, metaclass=Singleton):
         k: int = 4,
     ) -> List[Tuple[Document, float]]:
         query_emb = self.embedding_fn.embed_query(query)
+        return self.similarity_search_with_score_by_vector(query_emb, k=k)
 
-        with self.conn.cursor() as cur:
+    async def asimilarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+    ) -> List[Tuple[Document, float]]:
+        """임베딩은 비동기 API로 요청하고, psycopg2 조회는 스레드에서 풀 연결로 실행한다
+        (동시 요청은 PG_POOL_MAX개까지 병렬)."""
+        query_emb = await self.embedding_fn.aembed_query(query)
+        return await asyncio.to_thread(
+            self.similarity_search_with_score_by_vector, query_emb, k
+        )
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[Document, float]]:
+        """이미 계산된 질의 임베딩으로 검색한다."""
+        query_emb = embedding
+        params: List[Any] = [query_emb]
+        where_sql = ""
+        if filter:
+            where_sql = "WHERE metadata @> %s::jsonb"
+            params.append(json.dumps(filter))
+        params.append(k)
+
+        with observe_vector_query("college", "similarity_search_with_score"), pooled_cursor(self.conn_str, self.search_settings) as cur:
             cur.execute(
                 f"""
                 SELECT
@@ -137,12 +305,13 @@ class CustomPGVector(VectorStore, metaclass=Singleton):
                     qualifications,
                     universities,
                     metadata,
-                    (embedding <-> %s::vector) AS score
+                    {vector_distance_sql("embedding", self.index_cast)} AS score
                 FROM {self.table}
+                {where_sql}
                 ORDER BY score
                 LIMIT %s
                 """,
-                (query_emb, k),
+                tuple(params),
             )
             rows = cur.fetchall()
 
@@ -235,9 +404,11 @@ class CustomPGVector(VectorStore, metaclass=Singleton):
         universities = _sanitize(lookup("universities"))
 
         metadata_payload = dict(meta)
+        metadata_payload.pop("content_hash", None)
         metadata_payload.setdefault("majorSeq", major_seq)
         metadata_payload.setdefault("major", major)
         metadata_payload.setdefault("page_content", text)
+        chunk_index = meta.get("chunk_index")
 
         return (
             str(major_seq),
@@ -249,4 +420,6 @@ class CustomPGVector(VectorStore, metaclass=Singleton):
             universities,
             embedding,
             Json(metadata_payload),
+            int(chunk_index) if chunk_index is not None else 0,
+            meta.get("content_hash"),
         )
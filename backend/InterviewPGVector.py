@@ -1,18 +1,52 @@
 from typing import Any, Dict, List, Optional, Tuple
-import psycopg2
+import asyncio
+import os
 from difflib import SequenceMatcher
 
 from langchain_core.vectorstores import VectorStore
 from langchain_core.documents import Document
 
+from CustomPGvector import vector_distance_sql
+from metrics import observe_vector_query
+from pg_pool import pooled_cursor
+
 
 class InterviewPGVector(VectorStore):
-    """면접 데이터용 PGVector 클래스 (interview.vector, interview.meta_df 테이블 사용)"""
-    
-    def __init__(self, conn_str: str, embedding_fn):
+    """면접 데이터용 PGVector 클래스 ({schema}.vector, {schema}.meta_df 테이블 사용)
+
+    Args:
+        schema: 적재 스키마 (청크 설정별로 다른 스키마에 적재해 비교할 때 사용)
+        overfetch: 중복 제거를 고려해 k의 몇 배를 가져올지
+        dedupe_ratio: 질문 텍스트 유사도가 이 값을 넘으면 중복으로 간주
+        index_cast: 표현식 인덱스용 캐스팅 (예: "halfvec(3072)", 기본값: VECTOR_INDEX_CAST)
+        search_settings: 검색 트랜잭션에만 SET LOCAL로 적용할 설정 (예: {"hnsw.ef_search": 100})
+    """
+
+    DEFAULT_SCHEMA = "interview"
+    DEFAULT_OVERFETCH = 5
+    DEFAULT_DEDUPE_RATIO = 0.55
+
+    def __init__(
+        self,
+        conn_str: str,
+        embedding_fn,
+        schema: str | None = None,
+        overfetch: int | None = None,
+        dedupe_ratio: float | None = None,
+        index_cast: str | None = None,
+        search_settings: Dict[str, Any] | None = None,
+    ):
+        # 연결은 조회할 때 pg_pool에서 빌린다 (인스턴스 생성 시 연결하지 않음)
         self.conn_str = conn_str
-        self.conn = psycopg2.connect(self.conn_str)
         self.embedding_fn = embedding_fn
+        self.schema = schema or self.DEFAULT_SCHEMA
+        self.overfetch = overfetch or self.DEFAULT_OVERFETCH
+        self.dedupe_ratio = dedupe_ratio if dedupe_ratio is not None else self.DEFAULT_DEDUPE_RATIO
+        self.index_cast = (
+            index_cast if index_cast is not None
+            else os.getenv("VECTOR_INDEX_CAST", "")
+        )
+        self.search_settings = dict(search_settings or {})
     
     @classmethod
     def from_texts(
@@ -52,7 +86,74 @@ class InterviewPGVector(VectorStore):
         4. 최후 수단 → 필터 없이 검색
         """
         query_emb = self.embedding_fn.embed_query(query)
+        unique_rows = self._collect_unique_rows(query_emb, k, filter)
+        
+        # Document 변환
+        documents = []
+        for row in unique_rows:
+            *doc_fields, distance = row
+            doc = self._hydrate_row(tuple(doc_fields))
+            documents.append(doc)
+        return documents
+    
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[Document, float]]:
+        """면접 데이터 유사도 검색 (점수 포함, 필터링 지원, doc_id 중복 제거)
+        
+        필터링된 결과가 부족하면 자동으로 필터를 완화합니다:
+        1. occupation + question_intent 둘 다 필터링
+        2. 결과 부족시 → occupation만 필터링 (같은 직군 내 다른 유형)
+        3. 여전히 부족시 → question_intent만 필터링 (다른 직군 + 같은 유형)
+        4. 최후 수단 → 필터 없이 검색
+        """
+        query_emb = self.embedding_fn.embed_query(query)
+        return self.similarity_search_with_score_by_vector(query_emb, k=k, filter=filter)
+    
+    async def asimilarity_search_with_score(
+        self,
+        query: str,
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[Document, float]]:
+        """similarity_search_with_score의 비동기 버전
         
+        임베딩은 aembed_query로 요청하고, psycopg2 조회는 스레드에서 풀 연결로 실행해
+        이벤트 루프를 막지 않습니다 (동시 요청은 PG_POOL_MAX개까지 병렬).
+        """
+        query_emb = await self.embedding_fn.aembed_query(query)
+        return await asyncio.to_thread(
+            self.similarity_search_with_score_by_vector, query_emb, k, filter
+        )
+    
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[Document, float]]:
+        """이미 계산된 질의 임베딩으로 검색 (필터 완화 전략은 similarity_search_with_score와 동일)"""
+        unique_rows = self._collect_unique_rows(embedding, k, filter)
+        
+        # Document 변환 (점수 포함)
+        documents = []
+        for row in unique_rows:
+            *doc_fields, distance = row
+            doc = self._hydrate_row(tuple(doc_fields))
+            documents.append((doc, float(distance)))
+        
+        return documents
+    
+    def _collect_unique_rows(
+        self,
+        query_emb: List[float],
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """필터 완화 전략을 순서대로 적용하며 중복 없는 행을 k개까지 모음"""
         # Fallback 전략: 필터 우선순위
         # 사용자가 지정한 occupation을 최대한 유지하면서 intent를 확장
         filter_strategies = []
@@ -98,11 +199,11 @@ class InterviewPGVector(VectorStore):
                     # print(f"[DEBUG] Skipping doc_id {doc_id} - already seen")
                     continue
                 
-                # 질문 텍스트 유사도 체크 (0.55 이상이면 중복으로 간주)
+                # 질문 텍스트 유사도 체크 (dedupe_ratio 초과면 중복으로 간주)
                 is_duplicate = False
                 for seen_q in seen_questions:
                     similarity = SequenceMatcher(None, question_text, seen_q).ratio()
-                    if similarity > 0.55:  # 의미적 중복 포착 (0.57 정도면 거의 같은 질문)
+                    if similarity > self.dedupe_ratio:  # 의미적 중복 포착 (0.57 정도면 거의 같은 질문)
                         # print(f"[DEBUG] Duplicate found! Similarity {similarity:.2f}")
                         # print(f"[DEBUG]   Current: {question_text[:50]}...")
                         # print(f"[DEBUG]   Seen: {seen_q[:50]}...")
@@ -110,20 +211,14 @@ class InterviewPGVector(VectorStore):
                         break
                 
                 if not is_duplicate:
-                    print(f"[DEBUG] Adding question: {question_text[:50]}...")
+                    # print(f"[DEBUG] Adding question: {question_text[:50]}...")
                     seen_doc_ids.add(doc_id)
                     seen_questions.append(question_text)
                     unique_rows.append(row)
                     if len(unique_rows) >= k:
                         break
         
-        # Document 변환
-        documents = []
-        for row in unique_rows:
-            *doc_fields, distance = row
-            doc = self._hydrate_row(tuple(doc_fields))
-            documents.append(doc)
-        return documents
+        return unique_rows
     
     def _search_with_filter(
         self,
@@ -141,7 +236,7 @@ class InterviewPGVector(VectorStore):
         if exclude_doc_ids is None:
             exclude_doc_ids = set()
         
-        sql_query = """
+        sql_query = f"""
             SELECT 
                 m.doc_id,
                 m.occupation,
@@ -156,9 +251,9 @@ class InterviewPGVector(VectorStore):
                 m.content_combined,
                 v.chunk_id,
                 v.chunk_seq,
-                (v.embedding <-> %s::vector) AS distance
-            FROM interview.vector v
-            INNER JOIN interview.meta_df m ON v.doc_id = m.doc_id
+                {vector_distance_sql("v.embedding", self.index_cast)} AS distance
+            FROM {self.schema}.vector v
+            INNER JOIN {self.schema}.meta_df m ON v.doc_id = m.doc_id
         """
         
         # 필터 조건 추가
@@ -186,104 +281,16 @@ class InterviewPGVector(VectorStore):
             LIMIT %s
         """
         params.insert(0, query_emb)
-        params.append(k * 5)  # 중복 제거를 고려하여 5배 가져오기 (유사 질문 많음)
+        params.append(k * self.overfetch)  # 중복 제거를 고려하여 overfetch배 가져오기 (유사 질문 많음)
         
-        with self.conn.cursor() as cur:
+        operation = "filtered_search" if filter else "search"
+        with observe_vector_query("interview", operation), pooled_cursor(self.conn_str, self.search_settings) as cur:
             cur.execute(sql_query, tuple(params))
             rows = cur.fetchall()
         
         # doc_id 중복 제거 제거 (외부에서 처리)
         return rows
     
-    def similarity_search_with_score(
-        self,
-        query: str,
-        k: int = 5,
-        filter: Optional[Dict[str, Any]] = None,
-    ) -> List[Tuple[Document, float]]:
-        """면접 데이터 유사도 검색 (점수 포함, 필터링 지원, doc_id 중복 제거)
-        
-        필터링된 결과가 부족하면 자동으로 필터를 완화합니다:
-        1. occupation + question_intent 둘 다 필터링
-        2. 결과 부족시 → occupation만 필터링 (같은 직군 내 다른 유형)
-        3. 여전히 부족시 → question_intent만 필터링 (다른 직군 + 같은 유형)
-        4. 최후 수단 → 필터 없이 검색
-        """
-        query_emb = self.embedding_fn.embed_query(query)
-        
-        # Fallback 전략: 필터 우선순위
-        # 사용자가 지정한 occupation을 최대한 유지하면서 intent를 확장
-        filter_strategies = []
-        if filter:
-            # 전략 1: 모든 필터 적용 (occupation + question_intent)
-            if "occupation" in filter and "question_intent" in filter:
-                filter_strategies.append(filter.copy())
-                # 전략 2: 같은 occupation + intent 제거 (같은 직군 내 다른 유형)
-                filter_strategies.append({"occupation": filter["occupation"]})
-                # 전략 3: question_intent만 (다른 직군 + 같은 유형)
-                filter_strategies.append({"question_intent": filter["question_intent"]})
-            elif "question_intent" in filter:
-                # question_intent만 있으면 그것만 먼저
-                filter_strategies.append(filter.copy())
-            elif "occupation" in filter:
-                # occupation만 있으면 그것만
-                filter_strategies.append(filter.copy())
-            # 전략 4: 필터 없이 (최후 수단)
-            filter_strategies.append({})
-        else:
-            filter_strategies.append({})
-        
-        # 각 전략별로 시도 (기존 결과를 유지하면서 추가)
-        seen_doc_ids = set()
-        seen_questions = []  # 이미 추가된 질문 텍스트
-        unique_rows = []
-        
-        for strategy_filter in filter_strategies:
-            # 부족한 개수만큼만 추가로 검색
-            needed = k - len(unique_rows)
-            if needed <= 0:
-                break
-                
-            new_rows = self._search_with_filter(query_emb, needed, strategy_filter, exclude_doc_ids=seen_doc_ids)
-            # print(f"[DEBUG-SCORE] Strategy {strategy_filter}: Found {len(new_rows)} rows")
-            
-            for row in new_rows:
-                doc_id = row[0]
-                question_text = row[8]  # question_text는 9번째 컨럼
-                
-                # doc_id 중복 체크
-                if doc_id in seen_doc_ids:
-                    # print(f"[DEBUG-SCORE] Skipping doc_id {doc_id} - already seen")
-                    continue
-                
-                # 질문 텍스트 유사도 체크 (0.55 이상이면 중복으로 간주)
-                is_duplicate = False
-                for seen_q in seen_questions:
-                    similarity = SequenceMatcher(None, question_text, seen_q).ratio()
-                    if similarity > 0.55:  # 의미적 중복 포착 (0.57 정도면 거의 같은 질문)
-                        # print(f"[DEBUG-SCORE] Duplicate found! Similarity {similarity:.2f}")
-                        # print(f"[DEBUG-SCORE]   Current: {question_text[:50]}...")
-                        # print(f"[DEBUG-SCORE]   Seen: {seen_q[:50]}...")
-                        is_duplicate = True
-                        break
-                
-                if not is_duplicate:
-                    # print(f"[DEBUG-SCORE] Adding question: {question_text[:50]}...")
-                    seen_doc_ids.add(doc_id)
-                    seen_questions.append(question_text)
-                    unique_rows.append(row)
-                    if len(unique_rows) >= k:
-                        break
-        
-        # Document 변환 (점수 포함)
-        documents = []
-        for row in unique_rows:
-            *doc_fields, distance = row
-            doc = self._hydrate_row(tuple(doc_fields))
-            documents.append((doc, float(distance)))
-        
-        return documents
-    
     def _hydrate_documents(self, rows: List[Tuple[Any, ...]]) -> List[Document]:
         """데이터베이스 행을 Document 객체로 변환"""
         documents: List[Document] = []
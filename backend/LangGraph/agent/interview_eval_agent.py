@@ -12,28 +12,16 @@ sys.path.append(str(Path(__file__).resolve().parents[2]))
 from models import load_openai_model
 
 
-def evaluate_interview_chunk_relevance(question: str, chunk_content: str) -> dict:
-    """면접 질문과 chunk 간의 맥락상 유사도를 평가하는 agent
-    
-    .env에서 설정을 읽어옵니다:
-    - OPENAI_API_KEY: OpenAI API Key (자동 로드)
-    - EVAL_MODEL: 평가용 OpenAI 모델명 (기본값: gpt-4o-mini)
-    - EVAL_TEMPERATURE: 생성 온도 (기본값: 0.1)
-    
-    Args:
-        question: 사용자의 면접 관련 질문
-        chunk_content: 평가할 chunk의 내용
-    
-    Returns:
-        dict: {"score": float, "reason": str} 형태의 평가 결과
-    """
+def _load_eval_llm():
     # .env에서 모델 설정 읽기
     model_name = os.getenv("EVAL_MODEL", "gpt-4o-mini")
     temperature = float(os.getenv("EVAL_TEMPERATURE", "0.1"))
     
     params = {"model": model_name, "temperature": temperature}
-    llm = load_openai_model(params_key=tuple(sorted(params.items())))
-    
+    return load_openai_model(params_key=tuple(sorted(params.items())))
+
+
+def _build_messages(question: str, chunk_content: str) -> list:
     message = [
         SystemMessage(
             content=(
@@ -56,9 +44,11 @@ def evaluate_interview_chunk_relevance(question: str, chunk_content: str) -> dic
             )
         ),
     ]
-    
-    raw = llm.invoke(message).content
-    
+    return message
+
+
+def _parse_result(raw: str) -> dict:
+    """평가 모델의 출력을 {"score", "reason"} 형태로 파싱"""
     # JSON 파싱 (마크다운 코드 블록 제거)
     try:
         # ```json ... ``` 형식이면 제거
@@ -88,3 +78,30 @@ def evaluate_interview_chunk_relevance(question: str, chunk_content: str) -> dic
         "score": max(0.0, min(1.0, score)),  # 0~1 범위 보장
         "reason": reason
     }
+
+
+def evaluate_interview_chunk_relevance(question: str, chunk_content: str) -> dict:
+    """면접 질문과 chunk 간의 맥락상 유사도를 평가하는 agent
+    
+    .env에서 설정을 읽어옵니다:
+    - OPENAI_API_KEY: OpenAI API Key (자동 로드)
+    - EVAL_MODEL: 평가용 OpenAI 모델명 (기본값: gpt-4o-mini)
+    - EVAL_TEMPERATURE: 생성 온도 (기본값: 0.1)
+    
+    Args:
+        question: 사용자의 면접 관련 질문
+        chunk_content: 평가할 chunk의 내용
+    
+    Returns:
+        dict: {"score": float, "reason": str} 형태의 평가 결과
+    """
+    llm = _load_eval_llm()
+    raw = llm.invoke(_build_messages(question, chunk_content)).content
+    return _parse_result(raw)
+
+
+async def aevaluate_interview_chunk_relevance(question: str, chunk_content: str) -> dict:
+    """evaluate_interview_chunk_relevance의 비동기 버전 (ainvoke 사용)"""
+    llm = _load_eval_llm()
+    raw = (await llm.ainvoke(_build_messages(question, chunk_content))).content
+    return _parse_result(raw)
@@ -0,0 +1,128 @@
+# 생성 노드(generate_answer, interview_generation)에 넣을 참고 자료 문맥을 만드는 모듈
+# - tiktoken으로 노드별 토큰 예산을 지킨다 (예산을 넘는 청크는 잘라내거나 제외)
+# - 프롬프트에 필요한 메타데이터만 남긴다 (page_content 중복, universities 등 제외)
+# - 청크 간 겹치는 문장(chunk_overlap으로 생긴 중복)을 한 번만 넣는다
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import tiktoken
+
+DEFAULT_ENCODING = "o200k_base"
+
+# 청크 내용을 문장/필드 단위로 나누는 구분자 (" | " 필드 구분, 문장 끝, 줄바꿈)
+_SEGMENT_SPLIT = re.compile(r"\s*\|\s*|(?<=[.!?。])\s+|\n+")
+# 이 길이 이상인 조각만 "이미 나온 텍스트의 일부"인지 검사한다
+_MIN_OVERLAP_CHARS = 15
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: Optional[str]):
+    try:
+        return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding(DEFAULT_ENCODING)
+    except KeyError:
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception:
+        # 인코딩 파일을 받을 수 없는 환경 → 근사치 사용
+        return None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """model 기준 토큰 수 (tiktoken을 쓸 수 없으면 글자 수 기반 근사치)"""
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(text) // 2 + 1
+    return len(encoding.encode(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    encoding = _encoding(model)
+    if encoding is None:
+        return text[: max(0, max_tokens * 2)]
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens]).rstrip() + "…"
+
+
+def _dedupe_content(content: str, emitted: List[str]) -> str:
+    """이미 문맥에 들어간 조각과 같거나 그 일부인 조각을 제거한다."""
+    emitted_text = "\n".join(emitted)
+    kept: List[str] = []
+    for segment in _SEGMENT_SPLIT.split(content or ""):
+        segment = re.sub(r"\s+", " ", segment).strip()
+        if not segment:
+            continue
+        if segment in emitted or (len(segment) >= _MIN_OVERLAP_CHARS and segment in emitted_text):
+            continue
+        kept.append(segment)
+        emitted.append(segment)
+        emitted_text += "\n" + segment
+    return " ".join(kept)
+
+
+def _format_metadata(metadata: Dict[str, Any], fields: Sequence[Tuple[str, str]]) -> str:
+    parts = []
+    for key, display in fields:
+        value = metadata.get(key)
+        if value in (None, ""):
+            continue
+        parts.append(f"{display}: {value}")
+    return ", ".join(parts)
+
+
+def build_context(
+    chunks: List[Dict[str, Any]],
+    *,
+    budget_tokens: int,
+    metadata_fields: Sequence[Tuple[str, str]] = (),
+    label: str = "자료",
+    model: Optional[str] = None,
+    limit: Optional[int] = None,
+    dedupe_metadata: bool = True,
+) -> str:
+    """청크 리스트를 토큰 예산 안의 문맥 문자열로 변환한다.
+
+    Args:
+        chunks: {"content", "metadata"} 형태의 청크 (중요도 순으로 정렬되어 있어야 함)
+        budget_tokens: 문맥 전체에 허용할 최대 토큰 수
+        metadata_fields: (메타데이터 키, 표시 이름) 목록. 여기 없는 키는 넣지 않는다
+        label: 블록 머리말 ("[자료 1]", "[청크 1]" 등)
+        dedupe_metadata: 앞 블록과 같은 메타데이터(같은 학과 등)는 다시 쓰지 않음
+    """
+    blocks: List[str] = []
+    emitted: List[str] = []
+    seen_headers = set()
+    used_tokens = 0
+
+    for chunk in chunks[:limit] if limit else chunks:
+        metadata = chunk.get("metadata") or {}
+        content = _dedupe_content(chunk.get("content", ""), emitted)
+        # 앞 청크들과 완전히 겹치는 청크는 건너뛴다
+        if not content:
+            continue
+        header_meta = _format_metadata(metadata, metadata_fields)
+        # 같은 메타데이터(같은 학과 등)가 반복되면 두 번째부터는 생략
+        if dedupe_metadata and header_meta in seen_headers:
+            header_meta = ""
+        seen_headers.add(header_meta)
+
+        header = f"[{label} {len(blocks) + 1}] {header_meta}".strip()
+        block = f"{header}\n{content}".strip()
+        separator_tokens = count_tokens("\n\n", model) if blocks else 0
+        block_tokens = count_tokens(block, model) + separator_tokens
+
+        remaining = budget_tokens - used_tokens
+        if block_tokens > remaining:
+            header_tokens = count_tokens(header, model) + separator_tokens + 1
+            # 헤더만 겨우 들어가는 정도라면 더 넣지 않는다
+            if remaining - header_tokens < 32:
+                break
+            block = f"{header}\n{truncate_to_tokens(content, remaining - header_tokens, model)}"
+            blocks.append(block)
+            break
+
+        blocks.append(block)
+        used_tokens += block_tokens
+
+    return "\n\n".join(blocks)
@@ -1,39 +1,82 @@
-from langgraph.graph import StateGraph, END
+import os
+import sys
+from pathlib import Path
+
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import StateGraph, START, END
 
 from .initstate import GraphState
-from .nodes.classify import classify_category, route_after_classify
-from .nodes.classify_rag_finetune import classify_rag_finetune, route_rag_finetune
-from .nodes.retrieve_chunks import retrieve_chunks_node
-from .nodes.eval_chunks import node_evaluate_chunks
-from .nodes.generate_questions import generate_user_question_node
-from .nodes.generate_answer import generate_answer
+from .nodes.classify import classify_category, classify_category_async, route_after_classify
+from .nodes.classify_rag_finetune import classify_rag_finetune, classify_rag_finetune_async, route_rag_finetune
+from .nodes.retrieve_chunks import retrieve_chunks_node, retrieve_chunks_node_async
+from .nodes.eval_chunks import node_evaluate_chunks, node_evaluate_chunks_async
+from .nodes.generate_questions import generate_user_question_node, generate_user_question_node_async
+from .nodes.generate_answer import generate_answer, generate_answer_async
 
 # 면접 관련 노드 import
 from .nodes.interview_query_classify import interview_query_classify_node
-from .nodes.interview_vector_search import interview_vector_search_node, route_after_interview_vector_search
-from .nodes.interview_eval import interview_eval_node
-from .nodes.interview_generation import interview_generation_node
+from .nodes.interview_vector_search import (
+    interview_vector_search_node,
+    interview_vector_search_node_async,
+    route_after_interview_vector_search,
+)
+from .nodes.interview_eval import interview_eval_node, interview_eval_node_async
+from .nodes.interview_generation import interview_generation_node, interview_generation_node_async
+from .nodes.speculative_retrieve import speculative_retrieve_node, speculative_retrieve_node_async
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from metrics import instrument_node
+
+
+def _node(name, func, afunc=None):
+    """동기/비동기 구현을 함께 등록해 graph.invoke와 graph.ainvoke 모두 지원한다.
+
+    두 구현 모두 instrument_node로 감싸 노드 이름별 실행 시간/호출 수를 기록한다.
+    """
+    if afunc is None:
+        return instrument_node(name, func)
+    return RunnableLambda(
+        instrument_node(name, func),
+        afunc=instrument_node(name, afunc),
+        name=func.__name__,
+    )
+
+
+def create_graph_flow(speculative_retrieval: bool | None = None):
+    """그래프를 구성한다.
+
+    speculative_retrieval이 켜지면(기본값: SPECULATIVE_RETRIEVAL 환경변수) 분류와 동시에
+    대학/면접 후보 검색을 백그라운드로 시작하고(분류 단계들은 검색을 기다리지 않음),
+    라우터가 선택한 검색 노드가 그 결과를 기다려 재사용한다.
+    """
+    if speculative_retrieval is None:
+        speculative_retrieval = os.getenv("SPECULATIVE_RETRIEVAL", "false").lower() == "true"
 
-def create_graph_flow():
     graph = StateGraph(GraphState)
 
     # 기존 대학진로 관련 노드
-    graph.add_node('classify', classify_category)
-    graph.add_node('classify_rag_finetune', classify_rag_finetune)
-    graph.add_node('retrieve', retrieve_chunks_node)
-    graph.add_node('evaluate_chunks', node_evaluate_chunks)
-    graph.add_node('generate_answer', generate_answer)
+    graph.add_node('classify', _node('classify', classify_category, classify_category_async))
+    graph.add_node('classify_rag_finetune', _node('classify_rag_finetune', classify_rag_finetune, classify_rag_finetune_async))
+    graph.add_node('retrieve', _node('retrieve', retrieve_chunks_node, retrieve_chunks_node_async))
+    graph.add_node('evaluate_chunks', _node('evaluate_chunks', node_evaluate_chunks, node_evaluate_chunks_async))
+    graph.add_node('generate_answer', _node('generate_answer', generate_answer, generate_answer_async))
     
     # 면접 관련 노드 추가
-    graph.add_node('interview_query_classify', interview_query_classify_node)
-    graph.add_node('remake_question', generate_user_question_node)
-    graph.add_node('interview_vector_search', interview_vector_search_node)
-    graph.add_node('interview_eval', interview_eval_node)
-    graph.add_node('interview_generation', interview_generation_node)
+    graph.add_node('interview_query_classify', _node('interview_query_classify', interview_query_classify_node))
+    graph.add_node('remake_question', _node('remake_question', generate_user_question_node, generate_user_question_node_async))
+    graph.add_node('interview_vector_search', _node('interview_vector_search', interview_vector_search_node, interview_vector_search_node_async))
+    graph.add_node('interview_eval', _node('interview_eval', interview_eval_node, interview_eval_node_async))
+    graph.add_node('interview_generation', _node('interview_generation', interview_generation_node, interview_generation_node_async))
 
     # # 시작점
     graph.set_entry_point('classify')
 
+    # 투기적 검색: 검색을 백그라운드로 시작만 하고 바로 종료 (classify_rag_finetune 등은 기다리지 않음)
+    if speculative_retrieval:
+        graph.add_node('speculative_retrieve', _node('speculative_retrieve', speculative_retrieve_node, speculative_retrieve_node_async))
+        graph.add_edge(START, 'speculative_retrieve')
+        graph.add_edge('speculative_retrieve', END)
+
     graph.add_conditional_edges(
         'classify',
         route_after_classify,
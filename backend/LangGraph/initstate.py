@@ -32,6 +32,9 @@ class GraphState(TypedDict):
     eval_score: float  # chunk 평가 점수
     eval_reason: str  # chunk 평가 이유
 
+    # 투기적 검색 핸들 (SPECULATIVE_RETRIEVAL=true 일 때 분류와 겹쳐 진행 중인 검색, 결과는 speculation.py)
+    speculative_chunks: Dict[str, Any]  # {"question", "token"}
+
 
     
     
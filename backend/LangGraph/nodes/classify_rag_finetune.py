@@ -3,9 +3,7 @@ from initstate import GraphState
 
 from langchain_core.messages import HumanMessage, SystemMessage
 
-def classify_rag_finetune(state: GraphState) -> GraphState:
-    """카테고리 분류 노드""" 
-    llm = load_ollama_model()
+def _build_messages(state: GraphState) -> list:
     message = [
         SystemMessage(
             content=(
@@ -29,7 +27,21 @@ def classify_rag_finetune(state: GraphState) -> GraphState:
             content=f"질문: 유저의 질문을 분석하여 {state['question']}에 해당하는 카테고리를 분류하세요."
         ),
     ]
-    raw = llm.invoke(message).content
+    return message
+
+
+def classify_rag_finetune(state: GraphState) -> GraphState:
+    """카테고리 분류 노드""" 
+    llm = load_ollama_model()
+    raw = llm.invoke(_build_messages(state)).content
+    state["category_rag_finetune"] = raw
+    return state
+
+
+async def classify_rag_finetune_async(state: GraphState) -> GraphState:
+    """카테고리 분류 노드 (비동기)"""
+    llm = load_ollama_model()
+    raw = (await llm.ainvoke(_build_messages(state))).content
     state["category_rag_finetune"] = raw
     return state
 
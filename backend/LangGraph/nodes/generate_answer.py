@@ -4,22 +4,34 @@ from langchain_core.messages import HumanMessage, SystemMessage
 
 from models import load_finetune_ollama_model, load_openai_model
 from initstate import GraphState
+from context_builder import build_context
 
 import os
 
 
+# 프롬프트에 넣을 학과 메타데이터 (universities는 허용 목록으로 따로 전달, page_content 등은 본문과 중복)
+_CONTEXT_METADATA_FIELDS = (
+    ("major", "major"),
+    ("salary", "salary"),
+    ("employment", "employment"),
+    ("job", "job"),
+    ("qualifications", "qualifications"),
+)
+
+
 def _chunks_to_context(chunks: List[Dict[str, Any]], limit: int = 5) -> str:
-    """선택된 chunk 들을 사람이 읽기 쉬운 문맥 문자열로 변환한다."""
+    """선택된 chunk 들을 토큰 예산(ANSWER_CONTEXT_TOKENS) 안의 문맥 문자열로 변환한다."""
     if not chunks:
         return ""
 
-    formatted = []
-    for idx, chunk in enumerate(chunks[:limit], start=1):
-        metadata = chunk.get("metadata") or {}
-        source = ", ".join(f"{k}: {v}" for k, v in metadata.items() if v)
-        snippet = chunk.get("content", "").strip()
-        formatted.append(f"[자료 {idx}] {source}\n{snippet}".strip())
-    return "\n\n".join(formatted)
+    return build_context(
+        chunks,
+        budget_tokens=int(os.getenv("ANSWER_CONTEXT_TOKENS", "1500")),
+        metadata_fields=_CONTEXT_METADATA_FIELDS,
+        label="자료",
+        model=os.getenv("EVAL_MODEL"),
+        limit=limit,
+    )
 
 
 def _extract_university_list(chunks: List[Dict[str, Any]]) -> List[str]:
@@ -42,8 +54,8 @@ def _extract_university_list(chunks: List[Dict[str, Any]]) -> List[str]:
     return universities
 
 
-def generate_answer(state: GraphState) -> GraphState:
-    """평가된 chunk를 활용해 구조화된 답변을 생성한다."""
+def _build_request(state: GraphState):
+    """답변 생성에 사용할 LLM과 메시지를 구성한다."""
     base_question = (state.get("generate_question") or state.get("question") or "").strip()
     user_profile = (state.get("user") or "").strip()
     category = (state.get("category") or "일반").strip()
@@ -107,6 +119,12 @@ def generate_answer(state: GraphState) -> GraphState:
         SystemMessage(content=system_prompt),
         HumanMessage(content=human_prompt),
     ]
+    return llm, messages
+
+
+def generate_answer(state: GraphState) -> GraphState:
+    """평가된 chunk를 활용해 구조화된 답변을 생성한다."""
+    llm, messages = _build_request(state)
 
     try:
         answer_text = llm.invoke(messages).content.strip()
@@ -115,3 +133,16 @@ def generate_answer(state: GraphState) -> GraphState:
 
     state["answer"] = answer_text or "답변을 생성하지 못했습니다. 다시 시도해 주세요."
     return state
+
+
+async def generate_answer_async(state: GraphState) -> GraphState:
+    """generate_answer의 비동기 버전"""
+    llm, messages = _build_request(state)
+
+    try:
+        answer_text = (await llm.ainvoke(messages)).content.strip()
+    except Exception:
+        answer_text = ""
+
+    state["answer"] = answer_text or "답변을 생성하지 못했습니다. 다시 시도해 주세요."
+    return state
@@ -5,18 +5,7 @@ from models import load_ollama_model
 from initstate import GraphState
 
 
-def generate_user_question_node(state: GraphState) -> GraphState:
-    """사용자 질문을 RAG 검색에 적합한 형태로 재작성"""
-    llm = load_ollama_model()
-    raw_question = (state.get("question") or "").strip()  # 사용자의 질문
-    user_profile = (state.get("user") or "").strip()  # 사용자의 프로필
-    category = (state.get("category") or "일반").strip()  # 사용자의 카테고리
-
-    # 질문이 없다면
-    if not raw_question:
-        state["generate_question"] = ""
-        return state
-
+def _build_messages(raw_question: str, user_profile: str, category: str) -> list:
     # 프롬프트 설정
     system_prompt = (
         "너는 진로/취업 상담 챗봇의 질문 정제기다. "
@@ -35,9 +24,45 @@ def generate_user_question_node(state: GraphState) -> GraphState:
         SystemMessage(content=system_prompt),
         HumanMessage(content=human_prompt),
     ]
+    return messages
+
+
+def generate_user_question_node(state: GraphState) -> GraphState:
+    """사용자 질문을 RAG 검색에 적합한 형태로 재작성"""
+    llm = load_ollama_model()
+    raw_question = (state.get("question") or "").strip()  # 사용자의 질문
+    user_profile = (state.get("user") or "").strip()  # 사용자의 프로필
+    category = (state.get("category") or "일반").strip()  # 사용자의 카테고리
+
+    # 질문이 없다면
+    if not raw_question:
+        state["generate_question"] = ""
+        return state
+
+    try:
+        refined_question = llm.invoke(_build_messages(raw_question, user_profile, category)).content.strip()
+    except Exception:
+        refined_question = ""
+
+    state["generate_question"] = refined_question or raw_question
+    state["interview_rewrite_count"] = state.get("interview_rewrite_count", 0) + 1
+    return state
+
+
+async def generate_user_question_node_async(state: GraphState) -> GraphState:
+    """generate_user_question_node의 비동기 버전"""
+    llm = load_ollama_model()
+    raw_question = (state.get("question") or "").strip()
+    user_profile = (state.get("user") or "").strip()
+    category = (state.get("category") or "일반").strip()
+
+    if not raw_question:
+        state["generate_question"] = ""
+        return state
 
     try:
-        refined_question = llm.invoke(messages).content.strip()
+        response = await llm.ainvoke(_build_messages(raw_question, user_profile, category))
+        refined_question = response.content.strip()
     except Exception:
         refined_question = ""
 
@@ -1,10 +1,13 @@
 # 1. LLM 기반 질문과, 추출된 chunk의 맥락상 유사도를 평가하는 interview_eval_agent를 불어오는 노드
-import sys
+import sys, asyncio
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from initstate import GraphState
-from agent.interview_eval_agent import evaluate_interview_chunk_relevance
+from agent.interview_eval_agent import (
+    evaluate_interview_chunk_relevance,
+    aevaluate_interview_chunk_relevance,
+)
 
 
 def interview_eval_node(state: GraphState) -> GraphState:
@@ -31,6 +34,31 @@ def interview_eval_node(state: GraphState) -> GraphState:
         }
         evaluated_chunks.append(chunk_with_eval)
     
+    return _select_final_chunks(state, evaluated_chunks)
+
+
+async def interview_eval_node_async(state: GraphState) -> GraphState:
+    """interview_eval_node의 비동기 버전 (청크 평가를 동시에 요청)"""
+    chunks = state.get("chunks", [])
+    question = state.get("question", "")
+    
+    eval_results = await asyncio.gather(*[
+        aevaluate_interview_chunk_relevance(question, chunk.get("content", ""))
+        for chunk in chunks
+    ])
+    evaluated_chunks = [
+        {
+            **chunk,
+            "eval_score": eval_result["score"],
+            "eval_reason": eval_result["reason"],
+        }
+        for chunk, eval_result in zip(chunks, eval_results)
+    ]
+    return _select_final_chunks(state, evaluated_chunks)
+
+
+def _select_final_chunks(state: GraphState, evaluated_chunks: list) -> GraphState:
+    """eval_score 기준으로 정렬/필터링하여 상위 3개를 final_chunks에 저장"""
     # eval_score 기준으로 내림차순 정렬
     sorted_chunks = sorted(
         evaluated_chunks, 
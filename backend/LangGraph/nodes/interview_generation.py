@@ -15,10 +15,11 @@ load_dotenv()
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from initstate import GraphState
 from models import load_openai_model
+from context_builder import build_context
 
 
-def interview_generation_node(state: GraphState) -> GraphState:
-    """면접 관련 최종 답변을 생성하는 노드
+def _build_request(state: GraphState):
+    """면접 관련 최종 답변을 생성하기 위한 LLM과 메시지를 구성
     
     질문 유형에 따라 다른 응답 생성:
     1. question_recommendation (질문 추천):
@@ -58,15 +59,18 @@ def interview_generation_node(state: GraphState) -> GraphState:
     else:
         most_common_intent = None
     
-    # chunk 내용을 문자열로 결합 (메타데이터 포함)
-    chunks_text = "\n\n".join([
-        f"[청크 {i+1}]\n"
-        f"- 직군: {chunk.get('metadata', {}).get('occupation', 'N/A')}\n"
-        f"- 질문 유형: {chunk.get('metadata', {}).get('question_intent', 'N/A')}\n"
-        f"{chunk.get('content', '')}" 
-        for i, chunk in enumerate(final_chunks)
-    ])
+    # chunk 내용을 토큰 예산 안에서 결합 (직군/질문 유형 메타데이터만 포함, 겹치는 문장 제거)
+    chunks_text = build_context(
+        final_chunks,
+        budget_tokens=int(os.getenv("INTERVIEW_CONTEXT_TOKENS", "1500")),
+        metadata_fields=(("occupation", "직군"), ("question_intent", "질문 유형")),
+        label="청크",
+        model=model_name,
+        dedupe_metadata=False,
+    )
     
+    # 시스템 프롬프트는 요청과 무관한 고정 문자열로 두어 provider 측 prompt caching이 적중하도록 하고,
+    # 질문 유형 안내처럼 요청마다 달라지는 내용은 HumanMessage에 넣는다.
     if query_type == "question_recommendation":
         # 질문 추천 모드
         intent_instruction = ""
@@ -87,13 +91,13 @@ def interview_generation_node(state: GraphState) -> GraphState:
                     "1. 총 3개의 면접 질문을 번호와 함께 나열\n"
                     "2. 마지막에 선정 이유를 2문장으로 요약 설명"
                     "3. 답변수정 또는 다른 유형 면접추천 질문을 유도해라"
-                    f"{intent_instruction}"
                 )
             ),
             HumanMessage(
                 content=(
                     f"사용자 요청: {question}\n\n"
-                    f"참고 자료:{intent_analysis}\n{chunks_text}\n\n"
+                    f"참고 자료:{intent_analysis}\n{chunks_text}\n"
+                    f"{intent_instruction}\n"
                     "청크의 [질문]을 3개 선택하여 추천하고, 선정 이유를 간략히 설명해주세요."
                 )
             ),
@@ -124,20 +128,35 @@ def interview_generation_node(state: GraphState) -> GraphState:
                     "   - 차이점: [각 청크의 다른 접근 방식이나 강조점]\n"
                     "   - 개선 포인트: [청크를 기반으로 한 개선 제안]\n"
                     "4. 추가 연습 질문: [청크의 직군/유형과 유사한 질문 2개과 직군 동일/다른 유형의 연습 질문]"
-                    f"{intent_guidance}"
                 )
             ),
             HumanMessage(
                 content=(
                     f"면접 질문: {question}\n\n"
-                    f"참고 자료:{intent_analysis}\n{chunks_text}\n\n"
+                    f"참고 자료:{intent_analysis}\n{chunks_text}\n"
+                    f"{intent_guidance}\n\n"
                     "위 청크의 [답변] 내용을 분석하여 추천 답변을 작성해주세요. "
                     "청크가 비어있거나 관련성이 낮다면 '관련 데이터가 부족합니다'라고 명시하세요."
                 )
             ),
         ]
     
+    return llm, message
+
+
+def interview_generation_node(state: GraphState) -> GraphState:
+    """면접 관련 최종 답변을 생성하는 노드 (질문 유형별 응답 구성은 _build_request 참고)"""
+    llm, message = _build_request(state)
     raw_answer = llm.invoke(message).content
     state["final_answer"] = raw_answer
     
     return state
+
+
+async def interview_generation_node_async(state: GraphState) -> GraphState:
+    """interview_generation_node의 비동기 버전"""
+    llm, message = _build_request(state)
+    raw_answer = (await llm.ainvoke(message)).content
+    state["final_answer"] = raw_answer
+    
+    return state
@@ -1,15 +1,15 @@
 # interview_vector_search node이름 다음에 오는 노드로
 # vectorDB에서 코사인 유사도가 높은 chunck 추출 -> top_K =5
 # retrieve_chunk.py를 그대로 사용해도 될거 같은지 판단 필요
-import sys
+import sys, asyncio
 from typing import List
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from models import get_embedding_model
 from initstate import GraphState
-from InterviewPGVector import InterviewPGVector
-from utils import make_conn_str
+from vectorstores import get_interview_vectorstore
+import speculation
 
 def _build_metadata_filter(keywords: list) -> dict:
     """키워드를 occupation과 question_intent 메타데이터에 매핑하여 SQL 필터 생성
@@ -187,37 +187,19 @@ def _build_metadata_filter(keywords: list) -> dict:
     return filter_dict
 
 
-def interview_vector_search_node(state: GraphState) -> GraphState:
-    """면접 관련 질문과 유사한 chunk를 VectorDB에서 검색하는 노드
-    
-    코사인 유사도가 높은 chunk를 top_k=5개 추출하여 state에 저장
+def _collect_chunks(search, query_type: str, keywords: list):
+    """query_type에 따라 필터 검색/일반 검색을 수행하고 (chunk 리스트, 필터 사용 여부)를 반환
     
-    query_type에 따라 다른 검색 방식 사용:
-    - question_recommendation: SQL 필터링 + VectorDB 검색
-    - answer_feedback: VectorDB 검색만 사용
+    Args:
+        search: filter dict(또는 None)를 받아 (Document, score) 리스트를 반환하는 함수
     """
-    embed = get_embedding_model()
-    # 면접 데이터용 InterviewPGVector 사용
-    vectorstore = InterviewPGVector(
-        conn_str=make_conn_str(), 
-        embedding_fn=embed
-    )
-    
-    # 새 검색 시작 시 이전 청크는 초기화
     chunk_lst: List[dict] = []
-    question = state.get("question", "")
-    query_type = state.get("interview_query_type", "answer_feedback")
-    keywords = state.get("interview_keywords", [])
     used_metadata_filter = False
 
     def _search_with_filter(filter_meta: dict):
         if not filter_meta:
             return []
-        return vectorstore.similarity_search_with_score(
-            query=question,
-            k=5,
-            filter=filter_meta
-        )
+        return search(filter_meta)
 
     # query_type에 따라 분기 처리
     if query_type == "question_recommendation" and keywords:
@@ -237,33 +219,103 @@ def interview_vector_search_node(state: GraphState) -> GraphState:
             # 그래도 없으면 일반 검색으로 폴백
             if not results:
                 used_metadata_filter = False
-                results = vectorstore.similarity_search_with_score(question, k=5)
-            for doc, score in results:
-                chunk_lst.append({
-                    "content": doc.page_content,
-                    "score": float(score),
-                    "metadata": {**(doc.metadata or {})}
-                })
+                results = search(None)
         else:
             # 키워드가 있지만 필터 생성 실패 시 기본 검색
-            results = vectorstore.similarity_search_with_score(question, k=5)
-            for doc, score in results:
-                chunk_lst.append({
-                    "content": doc.page_content,
-                    "score": float(score),
-                    "metadata": {**(doc.metadata or {})}
-                })
+            results = search(None)
     else:
         # 답변 피드백: 일반 VectorDB 검색
-        results = vectorstore.similarity_search_with_score(question, k=5)
-        
-        for doc, score in results:
-            chunk_lst.append({
-                "content": doc.page_content,
-                "score": float(score),
-                "metadata": {**(doc.metadata or {})}
-            })
+        results = search(None)
     
+    for doc, score in results:
+        chunk_lst.append({
+            "content": doc.page_content,
+            "score": float(score),
+            "metadata": {**(doc.metadata or {})}
+        })
+    return chunk_lst, used_metadata_filter
+
+
+def _match_speculative(speculative, query_type: str, keywords: list):
+    interview = (speculative or {}).get("interview")
+    if not interview:
+        return None
+    if interview["query_type"] != query_type or interview["keywords"] != keywords:
+        return None
+    return interview["chunks"], interview["used_metadata_filter"]
+
+
+def _take_speculative(state: GraphState, question: str, query_type: str, keywords: list):
+    """speculative_retrieve 노드가 같은 조건으로 미리 시작한 검색 결과가 있으면 기다려 꺼냄 (state에서는 비움)"""
+    return _match_speculative(speculation.take(state, question), query_type, keywords)
+
+
+async def _atake_speculative(state: GraphState, question: str, query_type: str, keywords: list):
+    """_take_speculative의 비동기 버전"""
+    return _match_speculative(await speculation.atake(state, question), query_type, keywords)
+
+
+def interview_vector_search_node(state: GraphState) -> GraphState:
+    """면접 관련 질문과 유사한 chunk를 VectorDB에서 검색하는 노드
+    
+    코사인 유사도가 높은 chunk를 top_k=5개 추출하여 state에 저장
+    
+    query_type에 따라 다른 검색 방식 사용:
+    - question_recommendation: SQL 필터링 + VectorDB 검색
+    - answer_feedback: VectorDB 검색만 사용
+    """
+    embed = get_embedding_model()
+    # 면접 데이터용 벡터 스토어 (기본: InterviewPGVector)
+    vectorstore = get_interview_vectorstore(embed)
+    
+    # 새 검색 시작 시 이전 청크는 초기화
+    question = state.get("question", "")
+    query_type = state.get("interview_query_type", "answer_feedback")
+    keywords = state.get("interview_keywords", [])
+
+    speculative = _take_speculative(state, question, query_type, keywords)
+    if speculative is not None:
+        state["chunks"], state["used_metadata_filter"] = speculative
+        return state
+
+    # 필터 완화로 여러 번 검색하더라도 질문 임베딩은 한 번만 계산
+    query_emb = embed.embed_query(question)
+
+    def _search(filter_meta):
+        return vectorstore.similarity_search_with_score_by_vector(query_emb, k=5, filter=filter_meta)
+
+    chunk_lst, used_metadata_filter = _collect_chunks(_search, query_type, keywords)
+    state["chunks"] = chunk_lst
+    state["used_metadata_filter"] = used_metadata_filter
+    
+    return state
+
+
+async def interview_vector_search_node_async(state: GraphState) -> GraphState:
+    """interview_vector_search_node의 비동기 버전
+    
+    임베딩은 aembed_query로 요청하고, DB 검색(psycopg2)은 스레드에서 실행
+    """
+    embed = get_embedding_model()
+    vectorstore = get_interview_vectorstore(embed)
+    
+    question = state.get("question", "")
+    query_type = state.get("interview_query_type", "answer_feedback")
+    keywords = state.get("interview_keywords", [])
+
+    speculative = await _atake_speculative(state, question, query_type, keywords)
+    if speculative is not None:
+        state["chunks"], state["used_metadata_filter"] = speculative
+        return state
+
+    query_emb = await embed.aembed_query(question)
+
+    def _search(filter_meta):
+        return vectorstore.similarity_search_with_score_by_vector(query_emb, k=5, filter=filter_meta)
+
+    chunk_lst, used_metadata_filter = await asyncio.to_thread(
+        _collect_chunks, _search, query_type, keywords
+    )
     state["chunks"] = chunk_lst
     state["used_metadata_filter"] = used_metadata_filter
     
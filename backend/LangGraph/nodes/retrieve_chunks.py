@@ -1,17 +1,51 @@
 from models import get_embedding_model
 from initstate import GraphState
-from CustomPGvector import CustomPGVector
-from utils import make_conn_str
+from vectorstores import get_college_vectorstore
+import speculation
+
+
+def _to_chunks(results) -> list:
+    return [
+        {"content": doc.page_content, "score": float(score), "metadata": {**(doc.metadata or {})}}
+        for doc, score in results
+    ]
+
+
+def _take_speculative(state: GraphState, question: str):
+    """speculative_retrieve 노드가 미리 시작한 대학 검색 결과가 있으면 기다려 꺼낸다 (state에서는 비움)"""
+    speculative = speculation.take(state, question)
+    return speculative.get("college") if speculative else None
+
+
+async def _atake_speculative(state: GraphState, question: str):
+    """_take_speculative의 비동기 버전"""
+    speculative = await speculation.atake(state, question)
+    return speculative.get("college") if speculative else None
 
 
 def retrieve_chunks_node(state: GraphState) -> GraphState:
     """질문과 유사한 chunk 가져오는 노드"""
-    embed = get_embedding_model()
-    vectorstore = CustomPGVector(conn_str=make_conn_str(), embedding_fn=embed)
-    chunk_lst = list()
+    speculative = _take_speculative(state, state["question"])
+    if speculative is not None:
+        state["chunks"] = speculative
+        return state
+
+    vectorstore = get_college_vectorstore(get_embedding_model())
     question = state["question"]
     results = vectorstore.similarity_search_with_score(question, k=5)
-    for doc, score in results:
-        chunk_lst.append({"content": doc.page_content, "score": float(score), "metadata": {**(doc.metadata or {})}})
-    state["chunks"] = chunk_lst
-    return state
\ No newline at end of file
+    state["chunks"] = _to_chunks(results)
+    return state
+
+
+async def retrieve_chunks_node_async(state: GraphState) -> GraphState:
+    """retrieve_chunks_node의 비동기 버전"""
+    speculative = await _atake_speculative(state, state["question"])
+    if speculative is not None:
+        state["chunks"] = speculative
+        return state
+
+    vectorstore = get_college_vectorstore(get_embedding_model())
+    question = state["question"]
+    results = await vectorstore.asimilarity_search_with_score(question, k=5)
+    state["chunks"] = _to_chunks(results)
+    return state
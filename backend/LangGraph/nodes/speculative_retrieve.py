@@ -0,0 +1,105 @@
+# 분류(classify -> classify_rag_finetune / interview_query_classify)와 겹쳐 실행되는 투기적(speculative) 검색 노드
+# 질문 텍스트는 처음부터 알고 있으므로, 라우팅 결과를 기다리지 않고
+# 질문 임베딩 1회 + 대학/면접 후보 검색을 백그라운드로 시작해 두고 노드는 바로 끝난다
+# (검색이 느려도 분류/라우팅이 늦어지지 않음, 결과 보관은 speculation.py).
+# 이후 라우터가 선택한 쪽의 검색 노드(retrieve / interview_vector_search)만 결과를 기다려 꺼내 쓰고,
+# 나머지 브랜치 결과는 버려진다.
+import sys, asyncio, logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from models import get_embedding_model
+from initstate import GraphState
+import speculation
+from vectorstores import get_college_vectorstore, get_interview_vectorstore
+from agent.interview_query_classify_agent import classify_interview_query_type
+
+from .retrieve_chunks import _to_chunks
+from .interview_vector_search import _collect_chunks
+
+logger = logging.getLogger(__name__)
+
+
+def _result_or_none(future):
+    """투기적 검색 실패는 요청을 깨뜨리지 않는다 (실제 검색 노드가 다시 수행)."""
+    try:
+        return future.result()
+    except Exception:
+        logger.exception("Speculative retrieval failed")
+        return None
+
+
+def _search_college(query_emb) -> list:
+    vectorstore = get_college_vectorstore(get_embedding_model())
+    return _to_chunks(vectorstore.similarity_search_with_score_by_vector(query_emb, k=5))
+
+
+def _search_interview(question: str, query_emb) -> dict:
+    """interview_query_classify + interview_vector_search를 미리 수행
+
+    interview_query_classify는 패턴 기반(LLM 미사용)이라 결과가 결정적이므로
+    실제 노드가 만들 필터와 동일한 조건으로 검색할 수 있다.
+    """
+    vectorstore = get_interview_vectorstore(get_embedding_model())
+    classification = classify_interview_query_type(question)
+
+    def _search(filter_meta):
+        return vectorstore.similarity_search_with_score_by_vector(query_emb, k=5, filter=filter_meta)
+
+    chunks, used_metadata_filter = _collect_chunks(
+        _search, classification["query_type"], classification["keywords"]
+    )
+    return {
+        "query_type": classification["query_type"],
+        "keywords": classification["keywords"],
+        "chunks": chunks,
+        "used_metadata_filter": used_metadata_filter,
+    }
+
+
+def _speculate(question: str) -> dict:
+    """질문 임베딩 1회로 대학/면접 검색을 동시에 수행 (백그라운드 스레드에서 실행)"""
+    query_emb = get_embedding_model().embed_query(question)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        college = pool.submit(_search_college, query_emb)
+        interview = pool.submit(_search_interview, question, query_emb)
+        return {
+            "college": _result_or_none(college),
+            "interview": _result_or_none(interview),
+        }
+
+
+async def _aspeculate(question: str) -> dict:
+    """_speculate의 비동기 버전"""
+    query_emb = await get_embedding_model().aembed_query(question)
+
+    results = await asyncio.gather(
+        asyncio.to_thread(_search_college, query_emb),
+        asyncio.to_thread(_search_interview, question, query_emb),
+        return_exceptions=True,
+    )
+    college, interview = [
+        None if isinstance(result, Exception) else result for result in results
+    ]
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error("Speculative retrieval failed: %s", result)
+    return {"college": college, "interview": interview}
+
+
+def speculative_retrieve_node(state: GraphState) -> dict:
+    """대학/면접 검색을 백그라운드로 시작만 하는 노드
+
+    classify와 같은 superstep에서 실행되므로 state 전체가 아니라
+    speculative_chunks 키(결과 핸들)만 반환한다 (동일 키 동시 갱신 충돌 방지).
+    """
+    question = state.get("question", "")
+    return {"speculative_chunks": speculation.submit(question, _speculate)}
+
+
+async def speculative_retrieve_node_async(state: GraphState) -> dict:
+    """speculative_retrieve_node의 비동기 버전 (현재 이벤트 루프의 Task로 시작)"""
+    question = state.get("question", "")
+    return {"speculative_chunks": speculation.submit_async(question, _aspeculate(question))}
@@ -0,0 +1,84 @@
+# 투기적 검색(speculative_retrieve)의 진행 중 결과 보관소
+# - speculative_retrieve 노드는 검색을 백그라운드(스레드 Future / asyncio Task)로 시작만 하고 바로 끝난다.
+#   그래서 classify 뒤의 classify_rag_finetune / interview_query_classify가 검색을 기다리지 않고 진행되고,
+#   검색은 두 분류 단계 모두와 겹친다.
+# - state에는 직렬화 가능한 핸들({"question", "token"})만 넣고 Future/Task는 여기 둔다.
+# - 라우터가 고른 검색 노드(retrieve / interview_vector_search)가 take/atake로 결과를 꺼내 기다린다.
+# - 아무도 꺼내지 않은 결과(etc 분기, 검색 없이 답변하는 분기)는 SPECULATIVE_TTL초 뒤 정리된다.
+import asyncio
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TTL = float(os.getenv("SPECULATIVE_TTL", "60"))
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SPECULATIVE_WORKERS", "8")),
+    thread_name_prefix="speculative",
+)
+_pending: Dict[str, Tuple[float, Any]] = {}
+_lock = Lock()
+
+
+def _register(question: str, handle) -> Dict[str, str]:
+    now = time.monotonic()
+    token = uuid.uuid4().hex
+    with _lock:
+        for key, (created, _) in list(_pending.items()):
+            if now - created > _TTL:
+                del _pending[key]
+        _pending[token] = (now, handle)
+    return {"question": question, "token": token}
+
+
+def submit(question: str, fn: Callable[[str], dict]) -> Dict[str, str]:
+    """fn(question)을 스레드에서 시작하고 state에 넣을 핸들을 돌려준다 (graph.invoke용)"""
+    return _register(question, _executor.submit(fn, question))
+
+
+def submit_async(question: str, coro: Awaitable[dict]) -> Dict[str, str]:
+    """coroutine을 현재 이벤트 루프의 Task로 시작하고 핸들을 돌려준다 (graph.ainvoke용)"""
+    return _register(question, asyncio.get_running_loop().create_task(coro))
+
+
+def _pop(state, question: str):
+    handle = state.get("speculative_chunks") or {}
+    if not handle.get("token"):
+        return None
+    state["speculative_chunks"] = {}
+    with _lock:
+        entry = _pending.pop(handle["token"], None)
+    if entry is None or handle.get("question") != question:
+        return None
+    return entry[1]
+
+
+def take(state, question: str) -> Optional[dict]:
+    """state의 핸들로 투기적 검색 결과를 기다려 꺼낸다 (실패/불일치면 None -> 호출한 노드가 직접 검색)"""
+    pending = _pop(state, question)
+    if not isinstance(pending, Future):  # 다른 이벤트 루프의 Task는 동기 노드에서 기다릴 수 없다
+        return None
+    try:
+        return pending.result()
+    except Exception:
+        logger.exception("Speculative retrieval failed")
+        return None
+
+
+async def atake(state, question: str) -> Optional[dict]:
+    """take의 비동기 버전 (Task와 스레드 Future 모두 기다릴 수 있다)"""
+    pending = _pop(state, question)
+    if pending is None:
+        return None
+    try:
+        if isinstance(pending, Future):
+            return await asyncio.wrap_future(pending)
+        return await pending
+    except Exception:
+        logger.exception("Speculative retrieval failed")
+        return None
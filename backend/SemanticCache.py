@@ -0,0 +1,222 @@
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import os
+import time
+from threading import Lock
+
+from psycopg2.extras import Json
+
+from metrics import observe_vector_query, record_cache
+from pg_pool import pooled_cursor
+
+
+# 캐시에 저장할 그래프 결과 필드 (chunk 등 큰 값은 제외)
+CACHED_RESULT_KEYS: Tuple[str, ...] = (
+    "final_answer",
+    "answer",
+    "category",
+    "interview_query_type",
+    "classification_reason",
+    "answer_eval",
+)
+
+
+def invalidate_cache(conn, domain: Optional[str] = None, table: Optional[str] = None) -> int:
+    """재적재 후 캐시를 비운다. domain('college'/'interview')이 주어지면 해당 도메인과 만료된 행만 삭제.
+
+    캐시 테이블이 아직 없으면 아무 것도 하지 않는다.
+    """
+    table = table or SemanticAnswerCache.DEFAULT_TABLE
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass(%s)", (table,))
+        if cur.fetchone()[0] is None:
+            return 0
+        if domain:
+            cur.execute(f"DELETE FROM {table} WHERE domain = %s OR expires_at <= NOW()", (domain,))
+        else:
+            cur.execute(f"DELETE FROM {table}")
+        deleted = cur.rowcount
+    conn.commit()
+    return deleted
+
+
+class SemanticAnswerCache:
+    """질문 임베딩 + 프로필 버킷 기준의 pgvector 의미 캐시
+
+    같은 프로필 버킷에서 코사인 유사도가 threshold 이상인 질문이 TTL 안에 있으면
+    저장된 final_answer/answer를 그대로 돌려준다. 버킷의 모든 사용자에게 재사용되므로
+    저장하는 답변은 버킷 필드만으로 만든 프로필로 생성한 것이어야 한다 (backend_client._resolve_profile).
+
+    조회/저장은 pg_pool의 autocommit 연결을 빌려 쓰므로 동시 요청이 한 연결 뒤에 줄 서지 않는다.
+    만료된 행은 조회에서 제외만 하고, 저장 시 sweep_interval초에 한 번만 지운다.
+    """
+
+    DEFAULT_TABLE = "cache.semantic_answer_cache"
+
+    def __init__(
+        self,
+        conn_str: str,
+        embedding_fn,
+        table: str | None = None,
+        threshold: float | None = None,
+        ttl_seconds: int | None = None,
+        sweep_interval: float | None = None,
+    ):
+        self.conn_str = conn_str
+        self.embedding_fn = embedding_fn
+        self.table = table or self.DEFAULT_TABLE
+        self.threshold = (
+            threshold if threshold is not None
+            else float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+        )
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None
+            else int(os.getenv("SEMANTIC_CACHE_TTL", "86400"))
+        )
+        self.sweep_interval = (
+            sweep_interval if sweep_interval is not None
+            else float(os.getenv("SEMANTIC_CACHE_SWEEP_INTERVAL", "600"))
+        )
+        self._next_sweep = time.monotonic() + self.sweep_interval
+        self._stats_lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self._ensure_table()
+
+    def _ensure_table(self) -> None:
+        """docker/cache.sql과 같은 스키마를 (없을 때만) 생성한다."""
+        schema = self.table.split(".")[0] if "." in self.table else "public"
+        with pooled_cursor(self.conn_str) as cur:
+            cur.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+            cur.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    id BIGSERIAL PRIMARY KEY,
+                    profile_bucket TEXT NOT NULL,
+                    domain TEXT,
+                    question TEXT NOT NULL,
+                    embedding VECTOR NOT NULL,
+                    result JSONB NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0,
+                    created_at TIMESTAMPTZ DEFAULT NOW(),
+                    expires_at TIMESTAMPTZ NOT NULL
+                )
+                """
+            )
+
+    # --- 조회 ---
+    def lookup(self, question: str, profile_bucket: str) -> Tuple[Optional[Dict[str, Any]], List[float]]:
+        """(캐시된 결과 또는 None, 질문 임베딩)을 반환한다. 임베딩은 store에서 재사용."""
+        embedding = self.embedding_fn.embed_query(question)
+        return self.lookup_by_vector(embedding, profile_bucket), embedding
+
+    async def alookup(self, question: str, profile_bucket: str) -> Tuple[Optional[Dict[str, Any]], List[float]]:
+        embedding = await self.embedding_fn.aembed_query(question)
+        result = await asyncio.to_thread(self.lookup_by_vector, embedding, profile_bucket)
+        return result, embedding
+
+    def lookup_by_vector(self, embedding: List[float], profile_bucket: str) -> Optional[Dict[str, Any]]:
+        with observe_vector_query("semantic_cache", "lookup"), pooled_cursor(self.conn_str) as cur:
+            cur.execute(
+                f"""
+                SELECT id, result, 1 - (embedding <=> %s::vector) AS similarity
+                FROM {self.table}
+                WHERE profile_bucket = %s AND expires_at > NOW()
+                ORDER BY embedding <=> %s::vector
+                LIMIT 1
+                """,
+                (embedding, profile_bucket, embedding),
+            )
+            row = cur.fetchone()
+            if row is None or float(row[2]) < self.threshold:
+                self._record(hit=False)
+                return None
+            cur.execute(
+                f"UPDATE {self.table} SET hit_count = hit_count + 1 WHERE id = %s",
+                (row[0],),
+            )
+        self._record(hit=True)
+        return dict(row[1])
+
+    # --- 저장 ---
+    def store(
+        self,
+        question: str,
+        profile_bucket: str,
+        result: Dict[str, Any],
+        embedding: Optional[List[float]] = None,
+    ) -> bool:
+        """답변이 생성된 결과만 저장한다. 저장했으면 True."""
+        payload = {key: result.get(key) for key in CACHED_RESULT_KEYS if result.get(key)}
+        if not (payload.get("final_answer") or payload.get("answer")):
+            return False
+        if embedding is None:
+            embedding = self.embedding_fn.embed_query(question)
+
+        with pooled_cursor(self.conn_str) as cur:
+            cur.execute(
+                f"""
+                INSERT INTO {self.table}
+                    (profile_bucket, domain, question, embedding, result, expires_at)
+                VALUES (%s, %s, %s, %s::vector, %s, NOW() + %s * INTERVAL '1 second')
+                """,
+                (
+                    profile_bucket,
+                    (payload.get("category") or "").strip() or None,
+                    question,
+                    embedding,
+                    Json(payload),
+                    self.ttl_seconds,
+                ),
+            )
+        if self._sweep_due():
+            self.purge_expired()
+        return True
+
+    async def astore(
+        self,
+        question: str,
+        profile_bucket: str,
+        result: Dict[str, Any],
+        embedding: Optional[List[float]] = None,
+    ) -> bool:
+        if embedding is None:
+            embedding = await self.embedding_fn.aembed_query(question)
+        return await asyncio.to_thread(self.store, question, profile_bucket, result, embedding)
+
+    # --- 관리 ---
+    def invalidate(self, domain: Optional[str] = None) -> int:
+        with pooled_cursor(self.conn_str) as cur:
+            return invalidate_cache(cur.connection, domain=domain, table=self.table)
+
+    def purge_expired(self) -> int:
+        """만료된 행을 지운다 (저장 시 sweep_interval마다 한 번 호출)."""
+        with pooled_cursor(self.conn_str) as cur:
+            cur.execute(f"DELETE FROM {self.table} WHERE expires_at <= NOW()")
+            return cur.rowcount
+
+    def _sweep_due(self) -> bool:
+        now = time.monotonic()
+        with self._stats_lock:
+            if now < self._next_sweep:
+                return False
+            self._next_sweep = now + self.sweep_interval
+            return True
+
+    def _record(self, hit: bool) -> None:
+        record_cache("semantic_answer", hit)
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """프로세스 내 hit/miss 집계"""
+        with self._stats_lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
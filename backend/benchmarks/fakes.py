@@ -0,0 +1,330 @@
+# 네트워크/DB 없이 그래프를 돌리기 위한 결정적(deterministic) 가짜 구성요소
+# - FakeChatModel: 프롬프트 종류(분류/평가/질문 재작성/답변 생성)를 보고 파싱 가능한 응답을 돌려준다
+# - FakeEmbeddings: 글자 bigram feature hashing 임베딩 (비슷한 문장은 가까운 벡터)
+# - InMemoryCollegeStore / InMemoryInterviewStore: 합성 데이터로 채운 벡터 스토어
+#
+# models.py(LLM_BACKEND=fake, EMBEDDING_BACKEND=fake)와
+# vectorstores.py(VECTOR_BACKEND=memory)에서 사용한다.
+import asyncio
+import json
+import os
+import time
+import zlib
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from InterviewPGVector import InterviewPGVector
+
+# 분류 노드(classify)에서 면접으로 보낼 질문 단서
+_INTERVIEW_HINTS = ("면접", "인터뷰", "자기소개", "지원동기", "취업")
+# classify_rag_finetune에서 파인튜닝 모델로 보낼 질문 단서
+_FINETUNE_HINTS = ("공부법", "공부 방법", "멘탈", "동기 부여", "걱정", "불안")
+
+_ANSWER_TEXT = (
+    "학과 설명: 제공된 자료를 바탕으로 학과의 특징과 적성을 정리했습니다. "
+    "실행 전략 1) 관련 과목의 기초를 다지고 활동 기록을 남기세요. "
+    "실행 전략 2) 관심 분야의 프로젝트나 동아리에 참여해 경험을 쌓으세요. "
+    "참고/주의 사항: 세부 입시 요강은 각 대학 공지를 확인하세요. "
+)
+
+
+def _approx_tokens(text: str) -> int:
+    return max(1, len(text) // 2)
+
+
+class FakeChatModel(BaseChatModel):
+    """프롬프트 종류에 맞는 고정 응답을 latency만큼 지연 후 반환하는 채팅 모델"""
+
+    model_name: str = "fake-chat"
+    latency: float = 0.0
+    answer_chars: int = 600
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "latency": self.latency}
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        system = "\n".join(str(m.content) for m in messages if m.type == "system")
+        human = "\n".join(str(m.content) for m in messages if m.type == "human")
+
+        # classify: 'interview' / 'college' / 'etc'
+        # (system 프롬프트의 판단 기준에도 '면접'이 들어 있으므로 사용자 프로필/질문이 담긴 human만 본다)
+        if "'interview', 'college', 'etc'" in system:
+            return "interview" if any(hint in human for hint in _INTERVIEW_HINTS) else "college"
+        # classify_rag_finetune: 'rag' / 'finetune'
+        if "'rag' 또는 'finetune'" in system:
+            return "finetune" if any(hint in human for hint in _FINETUNE_HINTS) else "rag"
+        # eval_chunks / interview_eval: {"score", "reason"} JSON
+        if '"score"' in system:
+            score = 0.3 + (zlib.crc32(human.encode("utf-8")) % 70) / 100
+            return json.dumps({"score": round(score, 2), "reason": "fake evaluation"}, ensure_ascii=False)
+        # generate_questions: 원본 질문을 그대로 다듬은 것처럼 반환
+        if "질문 정제기" in system:
+            marker = "원본 질문:\n"
+            original = human.split(marker, 1)[1].split("\n\n", 1)[0] if marker in human else human
+            return f"{original.strip()} (구체적인 상황과 기대하는 답변 범위를 포함)"
+        # 답변 생성 (generate_answer / interview_generation)
+        repeat = self.answer_chars // len(_ANSWER_TEXT) + 1
+        return (_ANSWER_TEXT * repeat)[: self.answer_chars]
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        content = self._respond(messages)
+        prompt_tokens = sum(_approx_tokens(str(m.content)) for m in messages)
+        completion_tokens = _approx_tokens(content)
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._result(messages)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._result(messages)
+
+
+class FakeEmbeddings(Embeddings):
+    """글자 bigram을 dim 차원에 hashing한 정규화 벡터 (같은 텍스트 → 같은 벡터)"""
+
+    def __init__(self, dim: int = 3072, latency: float = 0.0):
+        self.dim = dim
+        self.latency = latency
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        normalized = " ".join((text or "").split())
+        for i in range(max(1, len(normalized) - 1)):
+            h = zlib.crc32(normalized[i:i + 2].encode("utf-8"))
+            vector[h % self.dim] += 1.0 if (h >> 16) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            vector[0] = 1.0
+            norm = 1.0
+        return (vector / norm).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._embed(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return [self._embed(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._embed(text)
+
+
+# --- 합성 데이터 ---
+_MAJORS = [
+    ("컴퓨터공학과", "소프트웨어와 컴퓨터 시스템의 원리를 배운다", "프로그래밍, 수학", "소프트웨어 개발자, 데이터 엔지니어"),
+    ("경영학과", "기업 경영과 조직 운영을 배운다", "리더십, 분석", "경영 컨설턴트, 마케터"),
+    ("간호학과", "환자 간호와 보건 지식을 배운다", "봉사, 생명과학", "간호사, 보건교사"),
+    ("기계공학과", "기계 설계와 역학을 배운다", "물리, 설계", "기계 설계 엔지니어, 생산 관리자"),
+    ("심리학과", "인간의 마음과 행동을 연구한다", "상담, 사람에 대한 관심", "상담사, 인사 담당자"),
+    ("시각디자인학과", "시각 커뮤니케이션과 디자인을 배운다", "미술, 창의성", "그래픽 디자이너, UX 디자이너"),
+    ("회계학과", "재무 정보와 회계 원리를 배운다", "수리, 꼼꼼함", "공인회계사, 세무사"),
+    ("화학공학과", "화학 공정과 소재를 배운다", "화학, 실험", "공정 엔지니어, 연구원"),
+    ("국어국문학과", "한국어와 한국 문학을 연구한다", "글쓰기, 독서", "작가, 기자, 국어 교사"),
+    ("통계학과", "데이터 분석과 확률 이론을 배운다", "수학, 데이터", "데이터 분석가, 통계 연구원"),
+]
+_UNIVERSITIES = ["서울대학교", "연세대학교", "고려대학교", "부산대학교", "경북대학교", "전남대학교"]
+
+_OCCUPATIONS = ["ARD", "BM", "ICT", "MM", "PS", "RND", "SM"]
+_INTENTS = [
+    ("motivation_fit", "우리 회사에 지원한 동기는 무엇인가요?"),
+    ("self_reflection", "본인의 강점과 약점을 말씀해 주세요."),
+    ("criteria_evaluation", "업무에서 가장 중요하게 생각하는 기준은 무엇인가요?"),
+    ("stakeholder_comm", "팀원과 갈등이 생겼을 때 어떻게 소통했나요?"),
+    ("behavioral_star", "어려운 문제를 해결했던 경험을 말씀해 주세요."),
+    ("procedure_method", "새 프로젝트를 시작할 때 어떤 절차로 진행하나요?"),
+    ("mechanism_reason", "그 기술을 선택한 이유는 무엇인가요?"),
+    ("compare_tradeoff", "두 가지 방법의 장단점을 비교해 주세요."),
+    ("evidence_metric", "성과를 어떤 지표로 검증했나요?"),
+    ("leadership_ownership", "리더십을 발휘해 주도했던 경험이 있나요?"),
+    ("creativity_ideation", "기존 방식을 개선한 아이디어가 있나요?"),
+    ("root_cause", "장애의 근본 원인을 어떻게 분석했나요?"),
+    ("ethics_compliance", "개인정보 보호 규정을 지키기 위해 무엇을 했나요?"),
+    ("application_transfer", "배운 내용을 실무에 어떻게 적용했나요?"),
+    ("estimation_planning", "일정을 어떻게 추정하고 계획했나요?"),
+    ("cost_resource", "비용 대비 효율을 높인 경험이 있나요?"),
+]
+
+
+def _college_rows(n_docs: int) -> List[Dict[str, Any]]:
+    rows = []
+    for i in range(n_docs):
+        major, summary, interest, job = _MAJORS[i % len(_MAJORS)]
+        universities = " | ".join(
+            f"{_UNIVERSITIES[(i + j) % len(_UNIVERSITIES)]} {major}" for j in range(2)
+        )
+        content = f"summary: {summary} ({i}) | interest: {interest} | job: {job}"
+        rows.append({
+            "major_seq": i // len(_MAJORS),
+            "major": major,
+            "salary": f"{250 + (i % 7) * 20}만원",
+            "employment": f"{60 + (i % 30)}%",
+            "job": job,
+            "qualifications": "관련 자격증",
+            "universities": universities,
+            "page_content": content,
+        })
+    return rows
+
+
+def _interview_rows(n_docs: int) -> List[Tuple[Any, ...]]:
+    """InterviewPGVector._search_with_filter 결과와 같은 컬럼 순서의 행 (distance 제외)"""
+    rows = []
+    for i in range(n_docs):
+        occupation = _OCCUPATIONS[i % len(_OCCUPATIONS)]
+        intent, question = _INTENTS[(i // len(_OCCUPATIONS)) % len(_INTENTS)]
+        question_text = f"[{occupation}] {question} (사례 {i})"
+        answer_text = f"{occupation} 직무에서 겪은 구체적인 상황과 행동, 결과를 중심으로 답변합니다. ({i})"
+        rows.append((
+            i,                      # doc_id
+            occupation,
+            "F" if i % 2 else "M",  # gender
+            "-34",                  # age_range
+            "NEW" if i % 3 else "EXP",
+            intent,
+            "experience",           # answer_intent_category
+            "neutral",              # answer_emotion_category
+            question_text,
+            answer_text,
+            f"{question_text} {answer_text}",
+            i,                      # chunk_id
+            0,                      # chunk_seq
+        ))
+    return rows
+
+
+class _SharedStore:
+    """임베딩 비용이 큰 합성 코퍼스를 클래스별로 한 번만 만든다."""
+
+    _instances: Dict[type, Any] = {}
+    _lock = Lock()
+
+    @classmethod
+    def shared(cls, embedding_fn):
+        with _SharedStore._lock:
+            if cls not in _SharedStore._instances:
+                _SharedStore._instances[cls] = cls(embedding_fn)
+            return _SharedStore._instances[cls]
+
+
+def _l2_distances(matrix: np.ndarray, embedding: List[float]) -> np.ndarray:
+    return np.linalg.norm(matrix - np.asarray(embedding, dtype=np.float32), axis=1)
+
+
+class InMemoryCollegeStore(_SharedStore):
+    """CustomPGVector와 같은 검색 인터페이스를 가진 인메모리 스토어 (L2 거리)"""
+
+    def __init__(self, embedding_fn, n_docs: int | None = None):
+        self.embedding_fn = embedding_fn
+        n_docs = n_docs or int(os.getenv("FAKE_COLLEGE_DOCS", "200"))
+        self.rows = _college_rows(n_docs)
+        vectors = embedding_fn.embed_documents([row["page_content"] for row in self.rows])
+        self.matrix = np.asarray(vectors, dtype=np.float32)
+
+    def similarity_search_with_score(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self.embedding_fn.embed_query(query), k=k)
+
+    async def asimilarity_search_with_score(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        query_emb = await self.embedding_fn.aembed_query(query)
+        return await asyncio.to_thread(self.similarity_search_with_score_by_vector, query_emb, k)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k)]
+
+    def similarity_search_with_score_by_vector(
+        self, embedding: List[float], k: int = 4
+    ) -> List[Tuple[Document, float]]:
+        distances = _l2_distances(self.matrix, embedding)
+        results = []
+        for idx in np.argsort(distances)[:k]:
+            row = self.rows[int(idx)]
+            metadata = {key: value for key, value in row.items()}
+            results.append((Document(page_content=row["page_content"], metadata=metadata), float(distances[idx])))
+        return results
+
+
+class InMemoryInterviewStore(_SharedStore, InterviewPGVector):
+    """InterviewPGVector의 필터 완화/중복 제거 로직을 그대로 쓰고 SQL 조회만 메모리에서 수행"""
+
+    def __init__(self, embedding_fn, n_docs: int | None = None):
+        # InterviewPGVector.__init__은 DB에 연결하므로 호출하지 않는다
+        self.conn_str = None
+        self.conn = None
+        self.embedding_fn = embedding_fn
+        self.schema = self.DEFAULT_SCHEMA
+        self.overfetch = self.DEFAULT_OVERFETCH
+        self.dedupe_ratio = self.DEFAULT_DEDUPE_RATIO
+        self.index_cast = ""
+        n_docs = n_docs or int(os.getenv("FAKE_INTERVIEW_DOCS", "500"))
+        self.rows = _interview_rows(n_docs)
+        vectors = embedding_fn.embed_documents([row[10] for row in self.rows])
+        self.matrix = np.asarray(vectors, dtype=np.float32)
+
+    def _search_with_filter(
+        self,
+        query_emb: List[float],
+        k: int,
+        filter: Dict[str, Any],
+        exclude_doc_ids: set = None,
+    ) -> List[Tuple[Any, ...]]:
+        exclude_doc_ids = exclude_doc_ids or set()
+        distances = _l2_distances(self.matrix, query_emb)
+        rows = []
+        for idx in np.argsort(distances):
+            row = self.rows[int(idx)]
+            if row[0] in exclude_doc_ids:
+                continue
+            if filter and filter.get("occupation") not in (None, row[1]):
+                continue
+            if filter and filter.get("question_intent") not in (None, row[5]):
+                continue
+            rows.append((*row, float(distances[idx])))
+            if len(rows) >= k * self.overfetch:
+                break
+        return rows
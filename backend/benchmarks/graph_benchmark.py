@@ -0,0 +1,265 @@
+# create_graph_flow 전체를 가짜 LLM/임베딩으로 실행해 노드별/전체 지연시간과 처리량을 측정한다.
+# 네트워크 없이 실행 가능 (기본: 인메모리 벡터 스토어)
+#
+# 사용 예 (backend 디렉터리에서):
+#   python -m benchmarks.graph_benchmark --concurrency 1,4,16 --requests 64
+#   python -m benchmarks.graph_benchmark --mode async --llm-latency-ms 200 --speculative
+#   python -m benchmarks.graph_benchmark --vector-backend pgvector   # 로컬 Postgres 사용
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Sequence
+
+from dotenv import load_dotenv
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.stats import percentile
+
+# (사용자 프로필, 질문) - 대학 RAG / 파인튜닝 / 면접 질문 추천 / 답변 피드백 경로를 고르게 포함
+SAMPLE_REQUESTS: Sequence[tuple] = (
+    ("이름: 학생 | 단계: 고2 (고등학생) | 전공 계열: 미정 | 관심: 코딩", "컴퓨터공학과에서는 무엇을 배우고 어떤 직업을 가질 수 있나요?"),
+    ("이름: 학생 | 단계: 고3 (고등학생) | 전공 계열: 인문 | 관심: 심리", "심리학과와 경영학과 중 어디가 저에게 맞을까요?"),
+    ("이름: 학생 | 단계: 고1 (고등학생) | 전공 계열: 미정 | 관심: 선택 없음", "성적이 떨어져서 멘탈이 흔들리는데 공부 방법을 어떻게 바꿔야 할까요?"),
+    ("이름: 학생 | 단계: 고3 (고등학생) | 전공 계열: 자연 | 관심: 의료", "간호학과 졸업 후 취업률과 연봉이 궁금해요."),
+    ("이름: 지원자 | 단계: 신입 (취업/면접 준비생) | 전공 계열: 공학 | 관심: 개발", "개발자 면접에서 리더십 관련 예상 질문 알려줘."),
+    ("이름: 지원자 | 단계: 신입 (취업/면접 준비생) | 전공 계열: 경영 | 관심: 마케팅", "마케팅 직무 면접에서 지원동기를 어떻게 대답하면 좋을까요?"),
+    ("이름: 지원자 | 단계: 경력 (취업/면접 준비생) | 전공 계열: 공학 | 관심: 데이터", "데이터 분석 면접에서 성과 지표 관련 질문 추천해줘."),
+    ("이름: 지원자 | 단계: 신입 (취업/면접 준비생) | 전공 계열: 디자인 | 관심: UX", "디자인 면접에서 갈등 해결 경험은 어떻게 말하면 좋을까요?"),
+)
+
+
+@dataclass
+class BenchmarkConfig:
+    """그래프 벤치마크 설정"""
+
+    concurrency: List[int]
+    requests: int
+    warmup: int
+    mode: str
+    llm_latency_ms: float
+    embedding_latency_ms: float
+    vector_backend: str
+    speculative: bool
+    output: str | None
+
+
+def configure_environment(config: BenchmarkConfig) -> None:
+    """models.py / vectorstores.py가 가짜 구성요소를 쓰도록 환경변수를 설정한다.
+
+    models.py는 lru_cache로 모델을 캐시하므로 그래프를 import 하기 전에 호출해야 한다.
+    """
+    os.environ["LLM_BACKEND"] = "fake"
+    os.environ["EMBEDDING_BACKEND"] = "fake"
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(config.llm_latency_ms)
+    os.environ["FAKE_EMBEDDING_LATENCY_MS"] = str(config.embedding_latency_ms)
+    os.environ["VECTOR_BACKEND"] = config.vector_backend
+    os.environ.setdefault("LOCAL_EMBEDDING_DIM", "3072")
+
+
+def _summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "mean_ms": statistics.fmean(values) * 1000 if values else 0.0,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+    }
+
+
+class NodeTimings:
+    """metrics.add_node_observer로 노드별 실행 시간을 모은다."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def __call__(self, name: str, elapsed: float, status: str) -> None:
+        with self._lock:
+            self.samples[name].append(elapsed)
+            if status != "ok":
+                self.errors[name] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.samples.clear()
+            self.errors.clear()
+
+
+def _request_at(i: int) -> dict:
+    user, question = SAMPLE_REQUESTS[i % len(SAMPLE_REQUESTS)]
+    return {"user": user, "question": question}
+
+
+def _run_sync(app, n_requests: int, concurrency: int) -> List[float]:
+    def _one(i: int) -> float:
+        start = time.perf_counter()
+        app.invoke(_request_at(i))
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(_one, range(n_requests)))
+
+
+def _run_async(app, n_requests: int, concurrency: int) -> List[float]:
+    async def _main() -> List[float]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _one(i: int) -> float:
+            async with semaphore:
+                start = time.perf_counter()
+                await app.ainvoke(_request_at(i))
+                return time.perf_counter() - start
+
+        return await asyncio.gather(*[_one(i) for i in range(n_requests)])
+
+    return asyncio.run(_main())
+
+
+def run_benchmark(config: BenchmarkConfig) -> List[dict]:
+    configure_environment(config)
+
+    from LangGraph.graph import create_graph_flow
+    from metrics import add_node_observer, remove_node_observer
+
+    app = create_graph_flow(speculative_retrieval=config.speculative)
+    runner = _run_async if config.mode == "async" else _run_sync
+    timings = NodeTimings()
+    add_node_observer(timings)
+
+    results = []
+    try:
+        # 워밍업: 인메모리 코퍼스 임베딩, 모델 캐시 등 1회성 비용 제외
+        runner(app, config.warmup, 1)
+        for concurrency in config.concurrency:
+            timings.reset()
+            start = time.perf_counter()
+            latencies = runner(app, config.requests, concurrency)
+            wall = time.perf_counter() - start
+            results.append({
+                "mode": config.mode,
+                "concurrency": concurrency,
+                "requests": config.requests,
+                "wall_s": wall,
+                "throughput_rps": config.requests / wall if wall else 0.0,
+                "end_to_end": _summarize(latencies),
+                "nodes": {
+                    name: {**_summarize(samples), "errors": timings.errors.get(name, 0)}
+                    for name, samples in sorted(timings.samples.items())
+                },
+            })
+    finally:
+        remove_node_observer(timings)
+    return results
+
+
+def print_report(results: List[dict]) -> None:
+    for result in results:
+        e2e = result["end_to_end"]
+        print(
+            f"\n=== mode={result['mode']} concurrency={result['concurrency']} "
+            f"requests={result['requests']} ==="
+        )
+        print(
+            f"end-to-end  p50={e2e['p50_ms']:.1f}ms  p95={e2e['p95_ms']:.1f}ms  "
+            f"p99={e2e['p99_ms']:.1f}ms  throughput={result['throughput_rps']:.2f} req/s"
+        )
+        print(f"{'node':<28}{'calls':>7}{'mean(ms)':>11}{'p50(ms)':>10}{'p95(ms)':>10}{'errors':>8}")
+        for name, stats in result["nodes"].items():
+            print(
+                f"{name:<28}{stats['count']:>7}{stats['mean_ms']:>11.1f}"
+                f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['errors']:>8}"
+            )
+
+
+def parse_args() -> BenchmarkConfig:
+    parser = argparse.ArgumentParser(
+        description="가짜 LLM/임베딩으로 LangGraph 흐름의 노드별 지연시간과 처리량을 측정합니다."
+    )
+    parser.add_argument(
+        "--concurrency",
+        default="1,4,16",
+        help="동시 요청 수 목록 (쉼표 구분)",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=64,
+        help="동시성 단계별 요청 수",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=len(SAMPLE_REQUESTS),
+        help="측정 전 워밍업 요청 수",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=("sync", "async"),
+        default="sync",
+        help="sync: 스레드풀 + graph.invoke, async: asyncio + graph.ainvoke",
+    )
+    parser.add_argument(
+        "--llm-latency-ms",
+        type=float,
+        default=50.0,
+        help="가짜 LLM 호출당 지연시간",
+    )
+    parser.add_argument(
+        "--embedding-latency-ms",
+        type=float,
+        default=10.0,
+        help="가짜 임베딩 호출당 지연시간",
+    )
+    parser.add_argument(
+        "--vector-backend",
+        choices=("memory", "pgvector"),
+        default="memory",
+        help="memory: 합성 데이터 인메모리 스토어, pgvector: 로컬 Postgres (LOCAL_EMBEDDING_DIM과 테이블 차원이 같아야 함)",
+    )
+    parser.add_argument(
+        "--speculative",
+        action="store_true",
+        help="투기적 검색(SPECULATIVE_RETRIEVAL)을 켠 그래프로 측정",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="결과를 JSON으로 저장할 경로",
+    )
+    args = parser.parse_args()
+    return BenchmarkConfig(
+        concurrency=[int(value) for value in args.concurrency.split(",") if value.strip()],
+        requests=args.requests,
+        warmup=args.warmup,
+        mode=args.mode,
+        llm_latency_ms=args.llm_latency_ms,
+        embedding_latency_ms=args.embedding_latency_ms,
+        vector_backend=args.vector_backend,
+        speculative=args.speculative,
+        output=args.output,
+    )
+
+
+def main() -> None:
+    load_dotenv()
+    config = parse_args()
+    results = run_benchmark(config)
+    print_report(results)
+    if config.output:
+        Path(config.output).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n📄 Saved results to {config.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+# Django /api/ask/ (chatbot_ask) 부하 테스트
+# - 면접/대학 질문을 지정한 비율로 섞어 보내며 동시 사용자 수를 단계적으로 올린다 (closed-loop)
+# - 단계별 p50/p95/p99 지연시간, 에러율, 처리량, 캐시 hit 비율을 출력한다
+# - --spawn 을 주면 가짜 LLM/임베딩/인메모리 스토어로 서버를 직접 띄워서 측정한다
+#   (서빙 구성만 비교할 때: LLM_BACKEND=fake, EMBEDDING_BACKEND=fake, VECTOR_BACKEND=memory)
+#
+# 사용 예 (backend 디렉터리에서):
+#   python -m benchmarks.http_load_test --url http://localhost:8000 --stages 1,4,16,32
+#   python -m benchmarks.http_load_test --spawn asgi --workers 2 --mix interview=0.7,college=0.3
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.cookies import SimpleCookie
+from pathlib import Path
+from threading import Event, Lock
+from typing import Dict, List, Optional
+
+from benchmarks.stats import percentile
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DJANGO_ROOT = REPO_ROOT / "django"
+
+# 카테고리별 기본 질문/프로필 (--questions 로 JSONL 파일을 주면 대체)
+DEFAULT_QUESTIONS: Dict[str, List[dict]] = {
+    "interview": [
+        {"question": "개발자 면접에서 리더십 관련 예상 질문 알려줘.",
+         "profile": {"stageType": "jobseeker", "careerStage": "신입", "major": "공학", "interests": ["개발"]}},
+        {"question": "마케팅 직무 면접에서 지원동기를 어떻게 대답하면 좋을까요?",
+         "profile": {"stageType": "jobseeker", "careerStage": "신입", "major": "경영", "interests": ["마케팅"]}},
+        {"question": "데이터 분석 면접에서 성과 지표 관련 질문 추천해줘.",
+         "profile": {"stageType": "jobseeker", "careerStage": "경력", "major": "공학", "interests": ["데이터"]}},
+        {"question": "면접에서 갈등 해결 경험은 어떻게 말하면 좋을까요?",
+         "profile": {"stageType": "jobseeker", "careerStage": "신입", "major": "디자인", "interests": ["UX"]}},
+    ],
+    "college": [
+        {"question": "컴퓨터공학과에서는 무엇을 배우고 어떤 직업을 가질 수 있나요?",
+         "profile": {"stageType": "student", "careerStage": "고2", "major": "미정", "interests": ["코딩"]}},
+        {"question": "심리학과와 경영학과 중 어디가 저에게 맞을까요?",
+         "profile": {"stageType": "student", "careerStage": "고3", "major": "인문", "interests": ["심리"]}},
+        {"question": "간호학과 졸업 후 취업률과 연봉이 궁금해요.",
+         "profile": {"stageType": "student", "careerStage": "고3", "major": "자연", "interests": ["의료"]}},
+        {"question": "성적이 떨어져서 멘탈이 흔들리는데 공부 방법을 어떻게 바꿔야 할까요?",
+         "profile": {"stageType": "student", "careerStage": "고1", "major": "미정", "interests": []}},
+    ],
+}
+
+
+@dataclass
+class LoadTestConfig:
+    """부하 테스트 설정"""
+
+    url: str
+    stages: List[int]
+    stage_duration: float
+    mix: Dict[str, float]
+    questions_path: Optional[str]
+    timeout: float
+    think_time: float
+    stop_error_rate: float
+    seed: int
+    spawn: Optional[str]
+    workers: int
+    port: int
+    llm_latency_ms: float
+    output: Optional[str]
+
+
+@dataclass
+class StageResult:
+    concurrency: int
+    latencies: List[float] = field(default_factory=list)
+    errors: Dict[str, int] = field(default_factory=dict)
+    cached: int = 0
+    started: float = 0.0
+    finished: float = 0.0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies) + sum(self.errors.values())
+
+    def summary(self) -> dict:
+        elapsed = max(self.finished - self.started, 1e-9)
+        total = self.requests
+        error_count = sum(self.errors.values())
+        return {
+            "concurrency": self.concurrency,
+            "requests": total,
+            "ok": len(self.latencies),
+            "errors": dict(self.errors),
+            "error_rate": error_count / total if total else 0.0,
+            "throughput_rps": len(self.latencies) / elapsed,
+            "cache_hit_rate": self.cached / len(self.latencies) if self.latencies else 0.0,
+            "mean_ms": statistics.fmean(self.latencies) * 1000 if self.latencies else 0.0,
+            "p50_ms": percentile(self.latencies, 50) * 1000,
+            "p95_ms": percentile(self.latencies, 95) * 1000,
+            "p99_ms": percentile(self.latencies, 99) * 1000,
+        }
+
+
+def load_questions(path: Optional[str]) -> Dict[str, List[dict]]:
+    """JSONL: {"category": "interview"|"college", "question": "...", "profile": {...}}"""
+    if not path:
+        return DEFAULT_QUESTIONS
+    questions: Dict[str, List[dict]] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                questions.setdefault(item["category"], []).append(
+                    {"question": item["question"], "profile": item.get("profile") or {}}
+                )
+    return questions
+
+
+class AskClient:
+    """CSRF 토큰을 받아 /api/ask/ 에 POST 하는 최소 HTTP 클라이언트 (표준 라이브러리만 사용)"""
+
+    def __init__(self, base_url: str, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.csrf_token = self._fetch_csrf_token()
+
+    def _fetch_csrf_token(self) -> str:
+        # chat_v3 화면(ensure_csrf_cookie)에서 csrftoken 쿠키를 받는다
+        with urllib.request.urlopen(f"{self.base_url}/chat/conversation/", timeout=self.timeout) as response:
+            cookie = SimpleCookie()
+            for header in response.headers.get_all("Set-Cookie") or []:
+                cookie.load(header)
+        if "csrftoken" not in cookie:
+            raise RuntimeError("csrftoken 쿠키를 받지 못했습니다. /chat/conversation/ 응답을 확인하세요.")
+        return cookie["csrftoken"].value
+
+    def ask(self, question: str, profile: dict) -> dict:
+        request = urllib.request.Request(
+            f"{self.base_url}/api/ask/",
+            data=json.dumps({"question": question, "profile": profile}).encode("utf-8"),
+            headers={
+                "Content-Type": "application/json",
+                "X-CSRFToken": self.csrf_token,
+                "Cookie": f"csrftoken={self.csrf_token}",
+                "Referer": f"{self.base_url}/chat/conversation/",
+            },
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+
+def _pick(rng: random.Random, questions: Dict[str, List[dict]], mix: Dict[str, float]) -> dict:
+    categories = [c for c in mix if questions.get(c)]
+    category = rng.choices(categories, weights=[mix[c] for c in categories])[0]
+    return rng.choice(questions[category])
+
+
+def run_stage(
+    client: AskClient,
+    concurrency: int,
+    config: LoadTestConfig,
+    questions: Dict[str, List[dict]],
+) -> StageResult:
+    """concurrency명의 가상 사용자가 stage_duration 동안 요청을 반복한다."""
+    result = StageResult(concurrency=concurrency)
+    lock = Lock()
+    stop = Event()
+
+    def _user(user_id: int) -> None:
+        rng = random.Random(config.seed * 1000 + user_id)
+        while not stop.is_set():
+            item = _pick(rng, questions, config.mix)
+            start = time.perf_counter()
+            error = None
+            cached = False
+            try:
+                body = client.ask(item["question"], item["profile"])
+                cached = bool((body.get("metadata") or {}).get("cached"))
+            except urllib.error.HTTPError as exc:
+                error = f"http_{exc.code}"
+            except (urllib.error.URLError, TimeoutError, ConnectionError) as exc:
+                error = type(getattr(exc, "reason", exc)).__name__
+            except Exception as exc:  # 응답 파싱 실패 등도 에러로 집계
+                error = type(exc).__name__
+            elapsed = time.perf_counter() - start
+            with lock:
+                if error:
+                    result.errors[error] = result.errors.get(error, 0) + 1
+                else:
+                    result.latencies.append(elapsed)
+                    result.cached += int(cached)
+            if config.think_time:
+                stop.wait(rng.expovariate(1 / config.think_time))
+
+    result.started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for user_id in range(concurrency):
+            pool.submit(_user, user_id)
+        time.sleep(config.stage_duration)
+        stop.set()
+    result.finished = time.perf_counter()
+    return result
+
+
+# --- 서버 실행 (--spawn) ---
+def spawn_server(config: LoadTestConfig) -> subprocess.Popen:
+    """가짜 백엔드로 Django 서버를 띄운다 (runserver 또는 gunicorn + uvicorn 워커)."""
+    env = {
+        **os.environ,
+        "LLM_BACKEND": "fake",
+        "EMBEDDING_BACKEND": "fake",
+        "VECTOR_BACKEND": "memory",
+        "FAKE_LLM_LATENCY_MS": str(config.llm_latency_ms),
+        "SEMANTIC_CACHE_ENABLED": os.getenv("SEMANTIC_CACHE_ENABLED", "false"),
+    }
+    if config.spawn == "asgi":
+        command = [
+            "gunicorn", "config.asgi:application",
+            "-k", "uvicorn.workers.UvicornWorker",
+            "-b", f"127.0.0.1:{config.port}",
+            "--workers", str(config.workers),
+            "--timeout", str(int(config.timeout)),
+        ]
+    else:
+        command = [sys.executable, "manage.py", "runserver", f"127.0.0.1:{config.port}", "--noreload"]
+
+    process = subprocess.Popen(command, cwd=DJANGO_ROOT, env=env)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"서버가 종료되었습니다 (exit code {process.returncode}).")
+        try:
+            urllib.request.urlopen(f"{config.url}/chat/conversation/", timeout=2).close()
+            return process
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("서버가 60초 안에 응답하지 않았습니다.")
+
+
+def print_stage(summary: dict) -> None:
+    errors = ", ".join(f"{k}={v}" for k, v in summary["errors"].items()) or "-"
+    print(
+        f"{summary['concurrency']:>6}{summary['requests']:>9}{summary['throughput_rps']:>9.2f}"
+        f"{summary['p50_ms']:>10.0f}{summary['p95_ms']:>10.0f}{summary['p99_ms']:>10.0f}"
+        f"{summary['error_rate'] * 100:>8.1f}%{summary['cache_hit_rate'] * 100:>8.1f}%  {errors}"
+    )
+
+
+def run_load_test(config: LoadTestConfig) -> List[dict]:
+    questions = load_questions(config.questions_path)
+    client = AskClient(config.url, config.timeout)
+
+    print(
+        f"{'users':>6}{'requests':>9}{'req/s':>9}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}"
+        f"{'errors':>9}{'cached':>9}"
+    )
+    summaries = []
+    for concurrency in config.stages:
+        summary = run_stage(client, concurrency, config, questions).summary()
+        summaries.append(summary)
+        print_stage(summary)
+        if summary["error_rate"] > config.stop_error_rate:
+            print(f"⚠️  error rate {summary['error_rate']:.1%} > {config.stop_error_rate:.1%}, stopping ramp.")
+            break
+    return summaries
+
+
+def _parse_mix(value: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for part in value.split(","):
+        if part.strip():
+            name, weight = part.split("=")
+            mix[name.strip()] = float(weight)
+    return mix
+
+
+def parse_args() -> LoadTestConfig:
+    parser = argparse.ArgumentParser(
+        description="chatbot_ask(/api/ask/)에 동시 사용자 수를 올려가며 부하를 주고 지연시간/에러율/처리량을 측정합니다."
+    )
+    parser.add_argument("--url", default=None, help="서버 주소 (기본: --spawn 시 http://127.0.0.1:<port>, 아니면 http://localhost:8000)")
+    parser.add_argument("--stages", default="1,2,4,8,16", help="단계별 동시 사용자 수 (쉼표 구분)")
+    parser.add_argument("--stage-duration", type=float, default=30.0, help="단계별 측정 시간(초)")
+    parser.add_argument("--mix", default="interview=0.5,college=0.5", help="질문 카테고리 비율")
+    parser.add_argument("--questions", default=None, help="질문 JSONL ({category, question, profile})")
+    parser.add_argument("--timeout", type=float, default=120.0, help="요청 타임아웃(초)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="사용자별 요청 간 평균 대기(초, 지수분포)")
+    parser.add_argument("--stop-error-rate", type=float, default=0.2, help="이 에러율을 넘으면 이후 단계 중단")
+    parser.add_argument("--seed", type=int, default=42, help="질문 선택 시드")
+    parser.add_argument(
+        "--spawn",
+        choices=("runserver", "asgi"),
+        default=None,
+        help="가짜 LLM/임베딩/인메모리 스토어로 서버를 직접 띄워서 측정",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="--spawn asgi 일 때 gunicorn 워커 수")
+    parser.add_argument("--port", type=int, default=8765, help="--spawn 시 사용할 포트")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0, help="--spawn 시 가짜 LLM 지연시간")
+    parser.add_argument("--output", default=None, help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args()
+
+    url = args.url or (f"http://127.0.0.1:{args.port}" if args.spawn else "http://localhost:8000")
+    return LoadTestConfig(
+        url=url.rstrip("/"),
+        stages=[int(v) for v in args.stages.split(",") if v.strip()],
+        stage_duration=args.stage_duration,
+        mix=_parse_mix(args.mix),
+        questions_path=args.questions,
+        timeout=args.timeout,
+        think_time=args.think_time,
+        stop_error_rate=args.stop_error_rate,
+        seed=args.seed,
+        spawn=args.spawn,
+        workers=args.workers,
+        port=args.port,
+        llm_latency_ms=args.llm_latency_ms,
+        output=args.output,
+    )
+
+
+def main() -> None:
+    config = parse_args()
+    server = spawn_server(config) if config.spawn else None
+    try:
+        summaries = run_load_test(config)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+    if config.output:
+        Path(config.output).write_text(json.dumps(summaries, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n📄 Saved results to {config.output}")
+
+
+if __name__ == "__main__":
+    main()
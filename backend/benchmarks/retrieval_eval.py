@@ -0,0 +1,407 @@
+# 검색 품질(recall@k, MRR) 대비 지연시간(p50/p95)을 설정별로 비교하는 평가 도구
+#
+# 비교 축
+# - 청크 설정: 청크 크기/overlap별로 따로 적재한 테이블(대학) / 스키마(면접)
+#     python ingest_data.py --table college.cv_300_100 --chunk-size 300 --chunk-overlap 100
+#     python embed_interview_data.py --input ... --schema interview_c200 --chunk 200 --overlap 50
+# - 인덱스: exact(인덱스 없음) / ivfflat(lists, probes) / hnsw(m, ef_construction, ef_search)
+#   3072차원처럼 2000차원을 넘는 임베딩은 halfvec 표현식 인덱스를 만들고
+#   스토어의 index_cast(VECTOR_INDEX_CAST)로 같은 식을 써서 검색한다.
+# - 면접 스토어: overfetch 배수, 질문 중복 제거 비율(dedupe_ratio), 메타데이터 필터
+#
+# 골든셋 (JSONL, 한 줄에 하나)
+#   {"store": "college", "question": "...", "relevant": ["12", "57"]}                  # major_seq
+#   {"store": "interview", "question": "...", "relevant": [1032, 88],                  # doc_id
+#    "filter": {"occupation": "ICT"}}
+# relevant는 청크가 아니라 문서 단위 id이므로 청크 설정이 달라도 같은 골든셋을 쓸 수 있다.
+#
+# 사용 예 (backend 디렉터리에서, 로컬 Postgres 대상 - 평가용 인덱스를 만들고 지운다):
+#   python -m benchmarks.retrieval_eval --golden golden.jsonl \
+#       --college-tables college.college_vector_db,college.cv_300_100 \
+#       --interview-schemas interview,interview_c200 \
+#       --index-types exact,ivfflat,hnsw --probes 1,10,40 --ef-search 40,100,200 \
+#       --overfetch 3,5,8 --dedupe-ratio 0.45,0.55,0.7 --output retrieval_eval.csv
+import argparse
+import csv
+import itertools
+import json
+import statistics
+import sys
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import psycopg2
+from dotenv import load_dotenv
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from CustomPGvector import CustomPGVector
+from InterviewPGVector import InterviewPGVector
+from models import get_embedding_model
+from utils import make_conn_str
+from benchmarks.stats import percentile
+
+# pgvector ivfflat/hnsw가 vector 타입으로 지원하는 최대 차원
+ANN_MAX_VECTOR_DIM = 2000
+
+RESULT_FIELDS = (
+    "store", "target", "index", "search_param", "overfetch", "dedupe_ratio",
+    "queries", "recall_at_k", "mrr", "p50_ms", "p95_ms",
+)
+
+
+@dataclass
+class EvalConfig:
+    """검색 평가 설정"""
+
+    golden_path: str
+    k: int
+    college_tables: List[str]
+    interview_schemas: List[str]
+    index_types: List[str]
+    ivfflat_lists: int
+    probes: List[int]
+    hnsw_m: int
+    hnsw_ef_construction: int
+    ef_search: List[int]
+    overfetch: List[int]
+    dedupe_ratio: List[float]
+    repeat: int
+    keep_index: bool
+    output: Optional[str]
+
+
+@dataclass
+class GoldenQuery:
+    store: str
+    question: str
+    relevant: List[str]
+    filter: Optional[Dict[str, Any]] = None
+    embedding: Optional[List[float]] = None
+
+
+def load_golden(path: str) -> List[GoldenQuery]:
+    queries: List[GoldenQuery] = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if item.get("store") not in ("college", "interview"):
+                raise ValueError(f"{path}:{line_no} store는 'college' 또는 'interview'여야 합니다.")
+            queries.append(GoldenQuery(
+                store=item["store"],
+                question=item["question"],
+                relevant=[str(doc_id) for doc_id in item.get("relevant", [])],
+                filter=item.get("filter") or None,
+            ))
+    if not queries:
+        raise RuntimeError(f"골든셋이 비어 있습니다: {path}")
+    return queries
+
+
+def embed_queries(queries: List[GoldenQuery]) -> None:
+    """질문 임베딩은 설정과 무관하므로 한 번만 계산한다 (배치 호출)."""
+    embedding_model = get_embedding_model()
+    vectors = embedding_model.embed_documents([q.question for q in queries])
+    for query, vector in zip(queries, vectors):
+        query.embedding = vector
+
+
+# --- 지표 ---
+def _unique(ids: Iterable[str]) -> List[str]:
+    """청크 단위 결과를 문서 단위로 접는다 (첫 등장 순위 유지)"""
+    seen = set()
+    ordered = []
+    for doc_id in ids:
+        if doc_id not in seen:
+            seen.add(doc_id)
+            ordered.append(doc_id)
+    return ordered
+
+
+def recall_at_k(retrieved: Sequence[str], relevant: Sequence[str], k: int) -> float:
+    if not relevant:
+        return 0.0
+    return len(set(retrieved[:k]) & set(relevant)) / len(set(relevant))
+
+
+def reciprocal_rank(retrieved: Sequence[str], relevant: Sequence[str]) -> float:
+    relevant_set = set(relevant)
+    for rank, doc_id in enumerate(retrieved, 1):
+        if doc_id in relevant_set:
+            return 1.0 / rank
+    return 0.0
+
+
+# --- 인덱스 ---
+def _vector_dim(conn, table: str) -> int:
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT vector_dims(embedding) FROM {table} LIMIT 1")
+        row = cur.fetchone()
+    if row is None:
+        raise RuntimeError(f"{table}에 적재된 벡터가 없습니다.")
+    return int(row[0])
+
+
+def _eval_index_name(table: str) -> str:
+    return f"{table.split('.')[-1]}_eval_ann_idx"
+
+
+def drop_eval_index(conn, table: str) -> None:
+    schema = table.split(".")[0] if "." in table else "public"
+    with conn.cursor() as cur:
+        cur.execute(f"DROP INDEX IF EXISTS {schema}.{_eval_index_name(table)}")
+    conn.commit()
+
+
+def build_eval_index(conn, table: str, index_type: str, config: EvalConfig) -> str:
+    """평가용 ANN 인덱스를 만들고 스토어가 써야 할 index_cast를 반환한다.
+
+    스토어는 L2 거리(<->)로 검색하므로 l2_ops 연산자 클래스를 사용한다.
+    """
+    drop_eval_index(conn, table)
+    if index_type == "exact":
+        return ""
+
+    dim = _vector_dim(conn, table)
+    if dim > ANN_MAX_VECTOR_DIM:
+        index_cast = f"halfvec({dim})"
+        column_sql, opclass = f"(embedding::{index_cast})", "halfvec_l2_ops"
+    else:
+        index_cast = ""
+        column_sql, opclass = "embedding", "vector_l2_ops"
+
+    if index_type == "ivfflat":
+        with_sql = f"WITH (lists = {config.ivfflat_lists})"
+    elif index_type == "hnsw":
+        with_sql = f"WITH (m = {config.hnsw_m}, ef_construction = {config.hnsw_ef_construction})"
+    else:
+        raise ValueError(f"지원하지 않는 인덱스 유형: {index_type}")
+
+    start = time.perf_counter()
+    with conn.cursor() as cur:
+        cur.execute(
+            f"CREATE INDEX {_eval_index_name(table)} ON {table} "
+            f"USING {index_type} ({column_sql} {opclass}) {with_sql}"
+        )
+        cur.execute(f"ANALYZE {table}")
+    conn.commit()
+    print(f"  built {index_type} index on {table} in {time.perf_counter() - start:.1f}s")
+    return index_cast
+
+
+def _search_settings(index_type: str, config: EvalConfig) -> List[Optional[int]]:
+    if index_type == "ivfflat":
+        return list(config.probes)
+    if index_type == "hnsw":
+        return list(config.ef_search)
+    return [None]
+
+
+def search_setting(index_type: str, value: Optional[int]) -> Tuple[str, Dict[str, int]]:
+    """검색 파라미터 (ivfflat.probes / hnsw.ef_search)의 표시용 이름과 스토어의 search_settings.
+
+    검색은 pg_pool 연결에서 실행되므로 세션 SET이 아니라 스토어가 검색 트랜잭션마다 SET LOCAL로 적용한다.
+    """
+    if value is None:
+        return "-", {}
+    guc = "ivfflat.probes" if index_type == "ivfflat" else "hnsw.ef_search"
+    return f"{guc}={value}", {guc: int(value)}
+
+
+# --- 평가 ---
+def _evaluate(search, queries: List[GoldenQuery], k: int, repeat: int) -> Dict[str, float]:
+    """search(query) -> 문서 id 리스트. 지연시간은 DB 검색만 측정 (임베딩 제외)"""
+    latencies: List[float] = []
+    recalls: List[float] = []
+    reciprocal_ranks: List[float] = []
+    for query in queries:
+        retrieved: List[str] = []
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            retrieved = _unique(search(query))
+            latencies.append(time.perf_counter() - start)
+        recalls.append(recall_at_k(retrieved, query.relevant, k))
+        reciprocal_ranks.append(reciprocal_rank(retrieved[:k], query.relevant))
+    return {
+        "queries": len(queries),
+        "recall_at_k": statistics.fmean(recalls) if recalls else 0.0,
+        "mrr": statistics.fmean(reciprocal_ranks) if reciprocal_ranks else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+    }
+
+
+def evaluate_college(conn, config: EvalConfig, queries: List[GoldenQuery]) -> List[dict]:
+    """conn: 평가용 인덱스를 만들고 지울 하네스 전용 연결 (검색은 스토어가 pg_pool 연결로 실행)"""
+    rows: List[dict] = []
+    if not queries:
+        return rows
+    for table in config.college_tables:
+        store = CustomPGVector(conn_str=make_conn_str(), embedding_fn=get_embedding_model(), table=table)
+        # 한 문서가 여러 청크로 나뉘므로 문서 단위 k개를 채울 수 있도록 넉넉히 가져온다
+        fetch_k = config.k * 4
+
+        def _search(query: GoldenQuery) -> List[str]:
+            results = store.similarity_search_with_score_by_vector(query.embedding, k=fetch_k, filter=query.filter)
+            return [str(doc.metadata.get("major_seq")) for doc, _ in results]
+
+        for index_type in config.index_types:
+            store.index_cast = build_eval_index(conn, table, index_type, config)
+            for setting in _search_settings(index_type, config):
+                param, store.search_settings = search_setting(index_type, setting)
+                metrics = _evaluate(_search, queries, config.k, config.repeat)
+                rows.append({
+                    "store": "college", "target": table, "index": index_type, "search_param": param,
+                    "overfetch": "-", "dedupe_ratio": "-", **metrics,
+                })
+        if not config.keep_index:
+            drop_eval_index(conn, table)
+    return rows
+
+
+def evaluate_interview(conn, config: EvalConfig, queries: List[GoldenQuery]) -> List[dict]:
+    """conn: 평가용 인덱스를 만들고 지울 하네스 전용 연결 (검색은 스토어가 pg_pool 연결로 실행)"""
+    rows: List[dict] = []
+    if not queries:
+        return rows
+    for schema in config.interview_schemas:
+        store = InterviewPGVector(conn_str=make_conn_str(), embedding_fn=get_embedding_model(), schema=schema)
+        table = f"{schema}.vector"
+
+        def _search(query: GoldenQuery) -> List[str]:
+            results = store.similarity_search_with_score_by_vector(query.embedding, k=config.k, filter=query.filter)
+            return [str(doc.metadata.get("doc_id")) for doc, _ in results]
+
+        for index_type in config.index_types:
+            store.index_cast = build_eval_index(conn, table, index_type, config)
+            for setting, overfetch, dedupe_ratio in itertools.product(
+                _search_settings(index_type, config), config.overfetch, config.dedupe_ratio
+            ):
+                param, store.search_settings = search_setting(index_type, setting)
+                store.overfetch, store.dedupe_ratio = overfetch, dedupe_ratio
+                metrics = _evaluate(_search, queries, config.k, config.repeat)
+                rows.append({
+                    "store": "interview", "target": schema, "index": index_type, "search_param": param,
+                    "overfetch": overfetch, "dedupe_ratio": dedupe_ratio, **metrics,
+                })
+        if not config.keep_index:
+            drop_eval_index(conn, table)
+    return rows
+
+
+def print_table(rows: List[dict], k: int) -> None:
+    header = (
+        f"{'store':<10}{'target':<28}{'index':<9}{'param':<20}{'ovf':>4}{'dedupe':>8}"
+        f"{'n':>5}{f'R@{k}':>8}{'MRR':>8}{'p50(ms)':>10}{'p95(ms)':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['store']:<10}{row['target']:<28}{row['index']:<9}{row['search_param']:<20}"
+            f"{row['overfetch']!s:>4}{row['dedupe_ratio']!s:>8}{row['queries']:>5}"
+            f"{row['recall_at_k']:>8.3f}{row['mrr']:>8.3f}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+        )
+
+
+def save_rows(rows: List[dict], path: str) -> None:
+    if path.endswith(".json"):
+        Path(path).write_text(json.dumps(rows, ensure_ascii=False, indent=2), encoding="utf-8")
+        return
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _csv_list(value: str, cast=str) -> list:
+    return [cast(item.strip()) for item in value.split(",") if item.strip()]
+
+
+def parse_args() -> EvalConfig:
+    parser = argparse.ArgumentParser(
+        description="골든셋으로 벡터 검색 설정별 recall@k / MRR / 지연시간을 비교합니다."
+    )
+    parser.add_argument("--golden", required=True, help="골든셋 JSONL 경로")
+    parser.add_argument("--k", type=int, default=5, help="평가할 상위 k (노드 기본값 5)")
+    parser.add_argument(
+        "--college-tables",
+        default=CustomPGVector.DEFAULT_TABLE,
+        help="비교할 대학 테이블 목록 (쉼표 구분, 청크 설정별 적재)",
+    )
+    parser.add_argument(
+        "--interview-schemas",
+        default=InterviewPGVector.DEFAULT_SCHEMA,
+        help="비교할 면접 스키마 목록 (쉼표 구분, 청크 설정별 적재)",
+    )
+    parser.add_argument(
+        "--index-types",
+        default="exact,ivfflat,hnsw",
+        help="exact / ivfflat / hnsw 중 비교할 인덱스 (쉼표 구분)",
+    )
+    parser.add_argument("--ivfflat-lists", type=int, default=100, help="ivfflat lists")
+    parser.add_argument("--probes", default="1,10,40", help="ivfflat.probes 목록")
+    parser.add_argument("--hnsw-m", type=int, default=16, help="hnsw m")
+    parser.add_argument("--hnsw-ef-construction", type=int, default=64, help="hnsw ef_construction")
+    parser.add_argument("--ef-search", default="40,100,200", help="hnsw.ef_search 목록")
+    parser.add_argument(
+        "--overfetch",
+        default=str(InterviewPGVector.DEFAULT_OVERFETCH),
+        help="면접 검색 overfetch 배수 목록",
+    )
+    parser.add_argument(
+        "--dedupe-ratio",
+        default=str(InterviewPGVector.DEFAULT_DEDUPE_RATIO),
+        help="면접 질문 중복 제거 유사도 목록",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="질의당 반복 측정 횟수 (지연시간용)")
+    parser.add_argument(
+        "--keep-index",
+        action="store_true",
+        help="평가 후 마지막 평가용 인덱스를 지우지 않음",
+    )
+    parser.add_argument("--output", default=None, help="결과 저장 경로 (.csv 또는 .json)")
+    args = parser.parse_args()
+    return EvalConfig(
+        golden_path=args.golden,
+        k=args.k,
+        college_tables=_csv_list(args.college_tables),
+        interview_schemas=_csv_list(args.interview_schemas),
+        index_types=_csv_list(args.index_types),
+        ivfflat_lists=args.ivfflat_lists,
+        probes=_csv_list(args.probes, int),
+        hnsw_m=args.hnsw_m,
+        hnsw_ef_construction=args.hnsw_ef_construction,
+        ef_search=_csv_list(args.ef_search, int),
+        overfetch=_csv_list(args.overfetch, int),
+        dedupe_ratio=_csv_list(args.dedupe_ratio, float),
+        repeat=args.repeat,
+        keep_index=args.keep_index,
+        output=args.output,
+    )
+
+
+def main() -> None:
+    load_dotenv()
+    config = parse_args()
+    queries = load_golden(config.golden_path)
+    embed_queries(queries)
+
+    with closing(psycopg2.connect(make_conn_str())) as conn:
+        rows = evaluate_college(conn, config, [q for q in queries if q.store == "college"])
+        rows += evaluate_interview(conn, config, [q for q in queries if q.store == "interview"])
+
+    print_table(rows, config.k)
+    if config.output:
+        save_rows(rows, config.output)
+        print(f"\n📄 Saved {len(rows)} rows to {config.output}")
+
+
+if __name__ == "__main__":
+    main()
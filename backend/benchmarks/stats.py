@@ -0,0 +1,11 @@
+# 벤치마크 공통 통계 도우미 (graph_benchmark / http_load_test / retrieval_eval)
+from typing import List
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """nearest-rank 백분위수 (값이 없으면 0.0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
@@ -1,43 +1,86 @@
-import csv
 from pathlib import Path
 
+from table_io import RecordReader, RecordWriter
+
+# 제거할 컬럼 목록
+COLUMNS_TO_DROP = [
+    # version
+    'version',
+    
+    # info
+    'date',
+    'channel',
+    'place',
+
+    
+    # question 
+    'question-wordCount',
+    'question-emotion',
+    'question-intent',
+    
+    # answer
+    'answer-emotion',
+    'answer-emotion_text',
+    'answer-intent',
+    'answer-wordCount',
+    'answer-intent_expression',
+    'answer-intent_text',
+    'answer-summary_wordCount',
+    'answer-summary',
+
+    # question_audio
+    'question_audio-fileFormat',
+    'question_audio-fileSize',
+    'question_audio-duration',
+    'question_audio-samplingBit',
+    'question_audio-channelCount',
+    'question_audio-samplingRate',
+    'question_audio-audioPath',
+    
+    # answer_audio
+    'answer_audio-fileFormat',
+    'answer_audio-fileSize',
+    'answer_audio-duration',
+    'answer_audio-samplingBit',
+    'answer_audio-channelCount',
+    'answer_audio-samplingRate',
+    'answer_audio-audioPath'
+]
+
+
 def drop_columns(input_csv, output_csv, columns_to_drop):
     """
-    CSV 파일에서 특정 컬럼들을 제거
+    CSV(또는 Parquet) 파일에서 특정 컬럼들을 제거
+    행 단위로 읽으면서 바로 기록한다 (전체를 메모리에 올리지 않음)
     """
     print(f"\n처리 중: {input_csv}")
     
-    # CSV 파일 읽기
-    with open(input_csv, 'r', encoding='utf-8-sig', newline='') as f:
-        reader = csv.DictReader(f)
+    with RecordReader(input_csv) as reader:
         headers = reader.fieldnames
-        data = list(reader)
-    
-    print(f"  원본 컬럼 수: {len(headers)}개")
-    print(f"  원본 데이터 수: {len(data)}개")
-    
-    # 존재하는 컬럼만 필터링
-    existing_columns = [col for col in columns_to_drop if col in headers]
-    missing_columns = [col for col in columns_to_drop if col not in headers]
-    
-    if missing_columns:
-        print(f"  ⚠ 존재하지 않는 컬럼: {missing_columns}")
-    
-    # 남길 컬럼 결정
-    remaining_columns = [col for col in headers if col not in existing_columns]
-    
-    print(f"  제거된 컬럼 수: {len(existing_columns)}개")
-    print(f"  남은 컬럼 수: {len(remaining_columns)}개")
-    
-    # 새 CSV 파일로 저장
-    with open(output_csv, 'w', encoding='utf-8-sig', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=remaining_columns)
-        writer.writeheader()
+        print(f"  원본 컬럼 수: {len(headers)}개")
+        
+        # 존재하는 컬럼만 필터링
+        existing_columns = [col for col in columns_to_drop if col in headers]
+        missing_columns = [col for col in columns_to_drop if col not in headers]
+        
+        if missing_columns:
+            print(f"  ⚠ 존재하지 않는 컬럼: {missing_columns}")
         
-        for row in data:
-            # 제거할 컬럼을 제외한 데이터만 작성
-            filtered_row = {k: v for k, v in row.items() if k in remaining_columns}
-            writer.writerow(filtered_row)
+        # 남길 컬럼 결정
+        remaining_columns = [col for col in headers if col not in existing_columns]
+        
+        print(f"  제거된 컬럼 수: {len(existing_columns)}개")
+        print(f"  남은 컬럼 수: {len(remaining_columns)}개")
+        
+        # 새 파일로 저장
+        row_count = 0
+        with RecordWriter(output_csv, remaining_columns) as writer:
+            for row in reader:
+                # 제거할 컬럼을 제외한 데이터만 작성
+                writer.writerow({k: row[k] for k in remaining_columns})
+                row_count += 1
+    
+    print(f"  원본 데이터 수: {row_count}개")
     
     # 파일 크기 확인
     file_size = Path(output_csv).stat().st_size
@@ -49,50 +92,7 @@ def drop_columns(input_csv, output_csv, columns_to_drop):
     return len(existing_columns), len(remaining_columns)
 
 def main():
-    # 제거할 컬럼 목록
-    columns_to_drop = [
-        # version
-        'version',
-        
-        # info
-        'date',
-        'channel',
-        'place',
-    
-        
-        # question 
-        'question-wordCount',
-        'question-emotion',
-        'question-intent',
-        
-        # answer
-        'answer-emotion',
-        'answer-emotion_text',
-        'answer-intent',
-        'answer-wordCount',
-        'answer-intent_expression',
-        'answer-intent_text',
-        'answer-summary_wordCount',
-        'answer-summary',
-    
-        # question_audio
-        'question_audio-fileFormat',
-        'question_audio-fileSize',
-        'question_audio-duration',
-        'question_audio-samplingBit',
-        'question_audio-channelCount',
-        'question_audio-samplingRate',
-        'question_audio-audioPath',
-        
-        # answer_audio
-        'answer_audio-fileFormat',
-        'answer_audio-fileSize',
-        'answer_audio-duration',
-        'answer_audio-samplingBit',
-        'answer_audio-channelCount',
-        'answer_audio-samplingRate',
-        'answer_audio-audioPath'
-    ]
+    columns_to_drop = COLUMNS_TO_DROP
     
     
     print("=" * 70)
@@ -1,11 +1,14 @@
-import csv
 from pathlib import Path
 
+from table_io import RecordReader, RecordWriter
+
 def filter_experienced_and_add_sample_id(input_csv, output_csv):
     """
+    한 번의 스트리밍 패스로
     1. EXPERIENCED 행만 추출
     2. sample_id 부여
-    3. 컬럼별 결측치 조회
+    3. 컬럼별 결측치 집계
+    (출력 파일을 다시 읽거나 컬럼마다 전체를 훑지 않음)
     """
     print("=" * 70)
     print("EXPERIENCED 데이터 필터링 및 Sample ID 부여")
@@ -14,62 +17,51 @@ def filter_experienced_and_add_sample_id(input_csv, output_csv):
     print(f"출력 파일: {output_csv}")
     
     try:
-        # CSV 파일 읽기
-        print("\n[1단계] CSV 파일 로딩 중...")
-        with open(input_csv, 'r', encoding='utf-8-sig', newline='') as f:
-            reader = csv.DictReader(f)
+        print("\n[1단계] 필터링 + Sample ID 부여 + 결측치 집계 중 (단일 패스)...")
+        total_input = 0
+        total_rows = 0
+        with RecordReader(input_csv) as reader:
             headers = reader.fieldnames
-            all_rows = list(reader)
-        
-        print(f"  ✓ 총 {len(all_rows)}개 행 로드 완료")
+            # sample_id는 첫 번째 컬럼으로
+            new_headers = ['sample_id'] + list(headers)
+            missing_counts = [0] * len(headers)
+            
+            with RecordWriter(output_csv, new_headers) as writer:
+                for row in reader:
+                    total_input += 1
+                    if (row.get('experience') or '').upper() != 'EXPERIENCED':
+                        continue
+                    
+                    total_rows += 1
+                    row['sample_id'] = total_rows
+                    writer.writerow(row)
+                    
+                    for i, col in enumerate(headers):
+                        value = row.get(col)
+                        if not value or not value.strip():
+                            missing_counts[i] += 1
+        
+        print(f"  ✓ 총 {total_input}개 행 처리 완료")
         print(f"  ✓ 컬럼 수: {len(headers)}개")
+        print(f"  ✓ EXPERIENCED 행: {total_rows}개")
+        print(f"  ✓ 필터링 전: {total_input}개 → 필터링 후: {total_rows}개")
         
-        # EXPERIENCED 행만 필터링
-        print("\n[2단계] EXPERIENCED 데이터 필터링 중...")
-        experienced_rows = [row for row in all_rows if row.get('experience', '').upper() == 'EXPERIENCED']
-        
-        print(f"  ✓ EXPERIENCED 행: {len(experienced_rows)}개")
-        print(f"  ✓ 필터링 전: {len(all_rows)}개 → 필터링 후: {len(experienced_rows)}개")
-        
-        if len(experienced_rows) == 0:
+        if total_rows == 0:
+            Path(output_csv).unlink(missing_ok=True)
             print("\n⚠ EXPERIENCED 데이터가 없습니다.")
             return
         
-        # sample_id 추가 (첫 번째 컬럼으로)
-        print("\n[3단계] Sample ID 부여 중...")
-        new_headers = ['sample_id'] + list(headers)
-        
-        for idx, row in enumerate(experienced_rows, 1):
-            row['sample_id'] = idx
-        
-        print(f"  ✓ Sample ID 범위: 1 ~ {len(experienced_rows)}")
-        
-        # CSV 파일 저장
-        print("\n[4단계] 파일 저장 중...")
-        with open(output_csv, 'w', encoding='utf-8-sig', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=new_headers)
-            writer.writeheader()
-            writer.writerows(experienced_rows)
-        
+        print(f"  ✓ Sample ID 범위: 1 ~ {total_rows}")
         print(f"  ✓ 저장 완료: {output_csv}")
         
-        # 컬럼별 결측치 조회
-        print("\n[5단계] 컬럼별 결측치 조회 중...")
-        
-        # 저장된 파일을 다시 읽어서 결측치 확인
-        with open(output_csv, 'r', encoding='utf-8-sig', newline='') as f:
-            reader = csv.DictReader(f)
-            data_rows = list(reader)
-        
         print("\n" + "=" * 70)
         print("📊 컬럼별 결측치 통계")
         print("=" * 70)
         
         missing_stats = []
-        total_rows = len(data_rows)
         
-        for col in new_headers:
-            missing_count = sum(1 for row in data_rows if not row.get(col) or row.get(col).strip() == '')
+        # sample_id는 항상 채워지므로 결측치 0
+        for col, missing_count in zip(new_headers, [0] + missing_counts):
             missing_percent = (missing_count / total_rows) * 100 if total_rows > 0 else 0
             missing_stats.append({
                 '컬럼명': col,
@@ -111,7 +103,7 @@ def filter_experienced_and_add_sample_id(input_csv, output_csv):
         print(f"\n📁 출력 파일:")
         print(f"  - 경로: {output_csv}")
         print(f"  - 크기: {file_size_mb:.2f} MB ({file_size:,} bytes)")
-        print(f"  - 행 수: {len(experienced_rows)}개")
+        print(f"  - 행 수: {total_rows}개")
         print(f"  - 컬럼 수: {len(new_headers)}개")
         print("\n" + "=" * 70)
         
@@ -1,232 +1,358 @@
 import json
-import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 
-def flatten_json_to_csv(json_file, csv_file):
+from table_io import RecordWriter
+
+# CSV 헤더 정의 (상위-하위 형식)
+HEADERS = [
+    # version
+    'version',
+
+    # info
+    'date',
+    'occupation',
+    'channel',
+    'place',
+    'gender',
+    'ageRange',
+    'experience',
+
+    # question
+    'question',
+    'question-wordCount',
+    'question-emotion',
+    'question-intent',
+
+    # answer
+    'answer',
+    'answer-wordCount',
+    'answer-emotion',
+    'answer-emotion_text',
+    'answer-emotion_expression',
+    'answer-emotion_category',
+    'answer-intent',
+    'answer-intent_text',
+    'answer-intent_expression',
+    'answer-intent_category',
+    'answer-summary',
+    'answer-summary_wordCount',
+
+    # question_audio
+    'question_audio-fileFormat',
+    'question_audio-fileSize',
+    'question_audio-duration',
+    'question_audio-samplingBit',
+    'question_audio-channelCount',
+    'question_audio-samplingRate',
+    'question_audio-audioPath',
+
+    # answer_audio
+    'answer_audio-fileFormat',
+    'answer_audio-fileSize',
+    'answer_audio-duration',
+    'answer_audio-samplingBit',
+    'answer_audio-channelCount',
+    'answer_audio-samplingRate',
+    'answer_audio-audioPath'
+]
+
+# 워커 한 번에 넘기는 레코드 수 / 동시에 처리 중인 배치 수 (메모리 상한)
+BATCH_SIZE = 2000
+
+
+def flatten_record(item):
+    """
+    JSON 레코드 하나를 CSV 행(dict)으로 평면화
+    """
+    # 데이터 추출
+    version = item.get('version', '')
+    dataset = item.get('dataSet', {})
+    info = dataset.get('info', {})
+    question = dataset.get('question', {})
+    answer = dataset.get('answer', {})
+    raw_data_info = item.get('rawDataInfo', {})
+
+    # emotion과 intent를 JSON 문자열로 변환
+    question_emotion = json.dumps(question.get('emotion', []), ensure_ascii=False)
+    question_intent = json.dumps(question.get('intent', []), ensure_ascii=False)
+    answer_emotion_list = answer.get('emotion', [])
+    answer_emotion = json.dumps(answer_emotion_list, ensure_ascii=False)
+    answer_intent_list = answer.get('intent', [])
+    answer_intent = json.dumps(answer_intent_list, ensure_ascii=False)
+
+    # answer emotion의 첫 번째 항목 정보 추출
+    answer_emotion_0_text = ''
+    answer_emotion_0_expression = ''
+    answer_emotion_0_category = ''
+    if answer_emotion_list and len(answer_emotion_list) > 0:
+        first_emotion = answer_emotion_list[0]
+        answer_emotion_0_text = first_emotion.get('text', '')
+        answer_emotion_0_expression = first_emotion.get('expression', '')
+        answer_emotion_0_category = first_emotion.get('category', '')
+
+    # answer intent의 첫 번째 항목 정보 추출
+    answer_intent_0_text = ''
+    answer_intent_0_expression = ''
+    answer_intent_0_category = ''
+    if answer_intent_list and len(answer_intent_list) > 0:
+        first_intent = answer_intent_list[0]
+        answer_intent_0_text = first_intent.get('text', '')
+        answer_intent_0_expression = first_intent.get('expression', '')
+        answer_intent_0_category = first_intent.get('category', '')
+
+    # CSV 행 생성
+    return {
+        'version': version,
+
+        # info
+        'date': info.get('date', ''),
+        'occupation': info.get('occupation', ''),
+        'channel': info.get('channel', ''),
+        'place': info.get('place', ''),
+        'gender': info.get('gender', ''),
+        'ageRange': info.get('ageRange', ''),
+        'experience': info.get('experience', ''),
+
+        # question
+        'question': question.get('raw', {}).get('text', ''),
+        'question-wordCount': question.get('raw', {}).get('wordCount', ''),
+        'question-emotion': question_emotion,
+        'question-intent': question_intent,
+
+        # answer
+        'answer': answer.get('raw', {}).get('text', ''),
+        'answer-wordCount': answer.get('raw', {}).get('wordCount', ''),
+        'answer-emotion': answer_emotion,
+        'answer-emotion_text': answer_emotion_0_text,
+        'answer-emotion_expression': answer_emotion_0_expression,
+        'answer-emotion_category': answer_emotion_0_category,
+        'answer-intent': answer_intent,
+        'answer-intent_text': answer_intent_0_text,
+        'answer-intent_expression': answer_intent_0_expression,
+        'answer-intent_category': answer_intent_0_category,
+        'answer-summary': answer.get('summary', {}).get('text', ''),
+        'answer-summary_wordCount': answer.get('summary', {}).get('wordCount', ''),
+
+        # question_audio
+        'question_audio-fileFormat': raw_data_info.get('question', {}).get('fileFormat', ''),
+        'question_audio-fileSize': raw_data_info.get('question', {}).get('fileSize', ''),
+        'question_audio-duration': raw_data_info.get('question', {}).get('duration', ''),
+        'question_audio-samplingBit': raw_data_info.get('question', {}).get('samplingBit', ''),
+        'question_audio-channelCount': raw_data_info.get('question', {}).get('channelCount', ''),
+        'question_audio-samplingRate': raw_data_info.get('question', {}).get('samplingRate', ''),
+        'question_audio-audioPath': raw_data_info.get('question', {}).get('audioPath', ''),
+
+        # answer_audio
+        'answer_audio-fileFormat': raw_data_info.get('answer', {}).get('fileFormat', ''),
+        'answer_audio-fileSize': raw_data_info.get('answer', {}).get('fileSize', ''),
+        'answer_audio-duration': raw_data_info.get('answer', {}).get('duration', ''),
+        'answer_audio-samplingBit': raw_data_info.get('answer', {}).get('samplingBit', ''),
+        'answer_audio-channelCount': raw_data_info.get('answer', {}).get('channelCount', ''),
+        'answer_audio-samplingRate': raw_data_info.get('answer', {}).get('samplingRate', ''),
+        'answer_audio-audioPath': raw_data_info.get('answer', {}).get('audioPath', '')
+    }
+
+
+def _flatten_many(items):
+    """
+    (워커) 레코드 묶음을 평면화. 항목마다 CSV 행(dict) 또는 오류 메시지(str)를 돌려준다
+    """
+    results = []
+    for item in items:
+        try:
+            results.append(flatten_record(item))
+        except Exception as e:
+            results.append(str(e))
+    return results
+
+
+def _parse_and_flatten_lines(lines):
+    """
+    (워커) JSON Lines 묶음을 파싱 + 평면화
+    """
+    results = []
+    for line in lines:
+        try:
+            results.append(flatten_record(json.loads(line)))
+        except Exception as e:
+            results.append(str(e))
+    return results
+
+
+def _parse_and_flatten_files(paths):
+    """
+    (워커) 원본 JSON 파일 묶음을 파싱 + 평면화 (파일이 리스트면 항목 단위로)
+    """
+    results = []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            results.append(f"{Path(path).name}: {e}")
+            continue
+        results.extend(_flatten_many(data if isinstance(data, list) else [data]))
+    return results
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def parallel_flatten(worker, items, workers=None, batch_size=BATCH_SIZE):
     """
-    JSON 파일을 완전히 평면화하여 CSV로 변환
+    items를 batch_size씩 묶어 프로세스 풀에서 worker로 처리하고 결과를 입력 순서대로 돌려준다
+    진행 중인 배치는 workers * 2개까지만 유지 -> 입력 크기와 상관없이 메모리 일정
+    """
+    workers = workers or os.cpu_count() or 1
+    batches = _batched(items, batch_size)
+    if workers <= 1:
+        for batch in batches:
+            yield from worker(batch)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for batch in batches:
+            pending.append(pool.submit(worker, batch))
+            if len(pending) >= workers * 2:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
+
+
+def iter_jsonl_lines(jsonl_file):
+    with open(jsonl_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+def write_flat_csv(results, csv_file, total=None):
+    """
+    평면화 결과(행 dict 또는 오류 str)를 스트리밍으로 CSV(.parquet이면 Parquet)에 기록
+    (성공 수, 실패 수)를 돌려준다
+    """
+    success_count = 0
+    error_count = 0
+    with RecordWriter(csv_file, HEADERS) as writer:
+        for idx, result in enumerate(results, 1):
+            if isinstance(result, str):
+                error_count += 1
+                print(f"  ✗ 오류 (항목 {idx}): {result}")
+            else:
+                writer.writerow(result)
+                success_count += 1
+
+            # 진행 상황 표시 (매 10000개마다)
+            if idx % 10000 == 0:
+                progress = f" ({idx/total*100:.1f}%)" if total else ""
+                print(f"  처리 중: {idx}{f'/{total}' if total else ''}{progress}")
+    return success_count, error_count
+
+
+def print_flat_summary(csv_file, success_count, error_count):
+    # 파일 크기 확인
+    file_size = Path(csv_file).stat().st_size
+    file_size_mb = file_size / (1024 * 1024)
+
+    print("\n" + "=" * 70)
+    print("✅ 변환 완료!")
+    print("=" * 70)
+    print(f"\n📊 통계:")
+    print(f"  - 성공: {success_count}개")
+    print(f"  - 실패: {error_count}개")
+    print(f"  - 총 데이터: {success_count + error_count}개")
+    print(f"  - 총 컬럼: {len(HEADERS)}개")
+    print(f"\n📁 출력 파일:")
+    print(f"  - 경로: {csv_file}")
+    print(f"  - 크기: {file_size_mb:.2f} MB ({file_size:,} bytes)")
+    print("\n" + "=" * 70)
+
+
+def flatten_json_to_csv(json_file, csv_file, workers=None):
+    """
+    merge_json.py가 만든 JSON Lines 파일을 레코드 단위로 평면화하여 CSV로 변환
+    (이전 형식인 JSON 배열 파일도 읽을 수 있지만 이 경우 전체를 메모리에 올린다)
     """
     print("=" * 70)
     print("JSON to CSV 상세 변환 스크립트")
     print("=" * 70)
     print(f"\n입력 파일: {json_file}")
     print(f"출력 파일: {csv_file}")
-    
-    # JSON 파일 읽기
-    print("\n[1단계] JSON 파일 로딩 중...")
+
+    print("\n[1단계] 스트리밍 변환 중...")
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        print(f"  ✓ {len(data)}개의 데이터 로드 완료")
+        if Path(json_file).suffix == '.jsonl':
+            results = parallel_flatten(_parse_and_flatten_lines, iter_jsonl_lines(json_file), workers)
+        else:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            print(f"  ✓ {len(data)}개의 데이터 로드 완료 (JSON 배열)")
+            results = parallel_flatten(_flatten_many, data, workers)
+        success_count, error_count = write_flat_csv(results, csv_file)
     except Exception as e:
-        print(f"  ✗ JSON 파일 로드 실패: {e}")
+        print(f"\n❌ CSV 파일 생성 실패: {e}")
         return
-    
-    # CSV 헤더 정의 (상위-하위 형식)
-    print("\n[2단계] CSV 변환 중...")
-    
-    headers = [
-        # version
-        'version',
-        
-        # info
-        'date',
-        'occupation',
-        'channel',
-        'place',
-        'gender',
-        'ageRange',
-        'experience',
-        
-        # question
-        'question',
-        'question-wordCount',
-        'question-emotion',
-        'question-intent',
-        
-        # answer
-        'answer',
-        'answer-wordCount',
-        'answer-emotion',
-        'answer-emotion_text',
-        'answer-emotion_expression',
-        'answer-emotion_category',
-        'answer-intent',
-        'answer-intent_text',
-        'answer-intent_expression',
-        'answer-intent_category',
-        'answer-summary',
-        'answer-summary_wordCount',
-        
-        # question_audio
-        'question_audio-fileFormat',
-        'question_audio-fileSize',
-        'question_audio-duration',
-        'question_audio-samplingBit',
-        'question_audio-channelCount',
-        'question_audio-samplingRate',
-        'question_audio-audioPath',
-        
-        # answer_audio
-        'answer_audio-fileFormat',
-        'answer_audio-fileSize',
-        'answer_audio-duration',
-        'answer_audio-samplingBit',
-        'answer_audio-channelCount',
-        'answer_audio-samplingRate',
-        'answer_audio-audioPath'
-    ]
-    
+
+    print_flat_summary(csv_file, success_count, error_count)
+    return success_count
+
+
+def flatten_json_dir_to_csv(input_dir, csv_file, workers=None):
+    """
+    병합 단계 없이 디렉토리의 원본 JSON 파일들을 여러 프로세스에서 나눠 파싱하여 바로 CSV로 변환
+    """
+    json_files = sorted(Path(input_dir).glob("*.json"))
+    print("=" * 70)
+    print("JSON 디렉토리 to CSV 변환 (병렬 파싱)")
+    print("=" * 70)
+    print(f"\n입력 디렉토리: {input_dir} ({len(json_files)}개 파일)")
+    print(f"출력 파일: {csv_file}")
+
+    if not json_files:
+        print("\n⚠ JSON 파일을 찾을 수 없습니다.")
+        return
+
     try:
-        with open(csv_file, 'w', encoding='utf-8-sig', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
-            
-            success_count = 0
-            error_count = 0
-            
-            for idx, item in enumerate(data, 1):
-                try:
-                    # 데이터 추출
-                    version = item.get('version', '')
-                    dataset = item.get('dataSet', {})
-                    info = dataset.get('info', {})
-                    question = dataset.get('question', {})
-                    answer = dataset.get('answer', {})
-                    raw_data_info = item.get('rawDataInfo', {})
-                    
-                    # emotion과 intent를 JSON 문자열로 변환
-                    question_emotion = json.dumps(question.get('emotion', []), ensure_ascii=False)
-                    question_intent = json.dumps(question.get('intent', []), ensure_ascii=False)
-                    answer_emotion_list = answer.get('emotion', [])
-                    answer_emotion = json.dumps(answer_emotion_list, ensure_ascii=False)
-                    answer_intent_list = answer.get('intent', [])
-                    answer_intent = json.dumps(answer_intent_list, ensure_ascii=False)
-                    
-                    # answer emotion의 첫 번째 항목 정보 추출
-                    answer_emotion_0_text = ''
-                    answer_emotion_0_expression = ''
-                    answer_emotion_0_category = ''
-                    if answer_emotion_list and len(answer_emotion_list) > 0:
-                        first_emotion = answer_emotion_list[0]
-                        answer_emotion_0_text = first_emotion.get('text', '')
-                        answer_emotion_0_expression = first_emotion.get('expression', '')
-                        answer_emotion_0_category = first_emotion.get('category', '')
-                    
-                    # answer intent의 첫 번째 항목 정보 추출
-                    answer_intent_0_text = ''
-                    answer_intent_0_expression = ''
-                    answer_intent_0_category = ''
-                    if answer_intent_list and len(answer_intent_list) > 0:
-                        first_intent = answer_intent_list[0]
-                        answer_intent_0_text = first_intent.get('text', '')
-                        answer_intent_0_expression = first_intent.get('expression', '')
-                        answer_intent_0_category = first_intent.get('category', '')
-                    
-                    # CSV 행 생성
-                    row = {
-                        'version': version,
-                        
-                        # info
-                        'date': info.get('date', ''),
-                        'occupation': info.get('occupation', ''),
-                        'channel': info.get('channel', ''),
-                        'place': info.get('place', ''),
-                        'gender': info.get('gender', ''),
-                        'ageRange': info.get('ageRange', ''),
-                        'experience': info.get('experience', ''),
-                        
-                        # question
-                        'question': question.get('raw', {}).get('text', ''),
-                        'question-wordCount': question.get('raw', {}).get('wordCount', ''),
-                        'question-emotion': question_emotion,
-                        'question-intent': question_intent,
-                        
-                        # answer
-                        'answer': answer.get('raw', {}).get('text', ''),
-                        'answer-wordCount': answer.get('raw', {}).get('wordCount', ''),
-                        'answer-emotion': answer_emotion,
-                        'answer-emotion_text': answer_emotion_0_text,
-                        'answer-emotion_expression': answer_emotion_0_expression,
-                        'answer-emotion_category': answer_emotion_0_category,
-                        'answer-intent': answer_intent,
-                        'answer-intent_text': answer_intent_0_text,
-                        'answer-intent_expression': answer_intent_0_expression,
-                        'answer-intent_category': answer_intent_0_category,
-                        'answer-summary': answer.get('summary', {}).get('text', ''),
-                        'answer-summary_wordCount': answer.get('summary', {}).get('wordCount', ''),
-                        
-                        # question_audio
-                        'question_audio-fileFormat': raw_data_info.get('question', {}).get('fileFormat', ''),
-                        'question_audio-fileSize': raw_data_info.get('question', {}).get('fileSize', ''),
-                        'question_audio-duration': raw_data_info.get('question', {}).get('duration', ''),
-                        'question_audio-samplingBit': raw_data_info.get('question', {}).get('samplingBit', ''),
-                        'question_audio-channelCount': raw_data_info.get('question', {}).get('channelCount', ''),
-                        'question_audio-samplingRate': raw_data_info.get('question', {}).get('samplingRate', ''),
-                        'question_audio-audioPath': raw_data_info.get('question', {}).get('audioPath', ''),
-                        
-                        # answer_audio
-                        'answer_audio-fileFormat': raw_data_info.get('answer', {}).get('fileFormat', ''),
-                        'answer_audio-fileSize': raw_data_info.get('answer', {}).get('fileSize', ''),
-                        'answer_audio-duration': raw_data_info.get('answer', {}).get('duration', ''),
-                        'answer_audio-samplingBit': raw_data_info.get('answer', {}).get('samplingBit', ''),
-                        'answer_audio-channelCount': raw_data_info.get('answer', {}).get('channelCount', ''),
-                        'answer_audio-samplingRate': raw_data_info.get('answer', {}).get('samplingRate', ''),
-                        'answer_audio-audioPath': raw_data_info.get('answer', {}).get('audioPath', '')
-                    }
-                    
-                    writer.writerow(row)
-                    success_count += 1
-                    
-                    # 진행 상황 표시 (매 100개마다)
-                    if idx % 100 == 0:
-                        print(f"  처리 중: {idx}/{len(data)} ({idx/len(data)*100:.1f}%)")
-                    
-                except Exception as e:
-                    error_count += 1
-                    print(f"  ✗ 오류 (항목 {idx}): {e}")
-            
-            print(f"  처리 완료: {len(data)}/{len(data)} (100.0%)")
-        
-        # 파일 크기 확인
-        file_size = Path(csv_file).stat().st_size
-        file_size_mb = file_size / (1024 * 1024)
-        
-        print("\n" + "=" * 70)
-        print("✅ 변환 완료!")
-        print("=" * 70)
-        print(f"\n📊 통계:")
-        print(f"  - 성공: {success_count}개")
-        print(f"  - 실패: {error_count}개")
-        print(f"  - 총 데이터: {len(data)}개")
-        print(f"  - 총 컬럼: {len(headers)}개")
-        print(f"\n📁 출력 파일:")
-        print(f"  - 경로: {csv_file}")
-        print(f"  - 크기: {file_size_mb:.2f} MB ({file_size:,} bytes)")
-        print("\n" + "=" * 70)
-        
+        # 파일 하나가 레코드 하나이므로 배치를 작게 잡아 워커에 고르게 나눈다
+        results = parallel_flatten(_parse_and_flatten_files, json_files, workers, batch_size=200)
+        success_count, error_count = write_flat_csv(results, csv_file, total=len(json_files))
     except Exception as e:
         print(f"\n❌ CSV 파일 생성 실패: {e}")
+        return
+
+    print_flat_summary(csv_file, success_count, error_count)
+    return success_count
+
 
 def main():
     # Train 데이터 변환
-    train_json = Path(r"C:\dev\study\4th_mini_project\dataset\training\train_merged_all.json")
+    train_json = Path(r"C:\dev\study\4th_mini_project\dataset\training\train_merged_all.jsonl")
     train_csv = Path(r"C:\dev\study\4th_mini_project\dataset\train_detailed_all.csv")
-    
+
     if train_json.exists():
         flatten_json_to_csv(train_json, train_csv)
     else:
         print(f"❌ JSON 파일을 찾을 수 없습니다: {train_json}")
-    
+
     # Valid 데이터 변환
     print("\n\n")
-    valid_json = Path(r"C:\dev\study\4th_mini_project\dataset\valid\valid_merged_all.json")
+    valid_json = Path(r"C:\dev\study\4th_mini_project\dataset\valid\valid_merged_all.jsonl")
     valid_csv = Path(r"C:\dev\study\4th_mini_project\dataset\valid_detailed_all.csv")
-    
+
     if valid_json.exists():
         flatten_json_to_csv(valid_json, valid_csv)
     else:
         print(f"❌ JSON 파일을 찾을 수 없습니다: {valid_json}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -3,6 +3,8 @@ import json
 from pathlib import Path
 import pandas as pd
 
+from table_io import read_frame
+
 
 # 경로 설정: 현재 파일 기준 프로젝트 루트 추정
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -44,12 +46,16 @@ def build_chatml_record(question: str, answer: str, metadata: str = "", metadata
     return record
 
 
-def main():
-    print("Loading CSV:", INPUT_CSV)
-    if not INPUT_CSV.exists():
-        raise FileNotFoundError(f"입력 CSV를 찾을 수 없습니다: {INPUT_CSV}")
+def convert_csv_to_jsonl(input_csv, output_jsonl):
+    """
+    면접 CSV(question/answer + 메타데이터 컬럼)를 ChatML JSONL로 변환
+    """
+    input_csv, output_jsonl = Path(input_csv), Path(output_jsonl)
+    print("Loading CSV:", input_csv)
+    if not input_csv.exists():
+        raise FileNotFoundError(f"입력 CSV를 찾을 수 없습니다: {input_csv}")
     # 모든 값을 문자열로 읽어 손실 방지
-    df = pd.read_csv(INPUT_CSV, dtype=str)
+    df = read_frame(input_csv, dtype=str)
 
     required_cols = {"question", "answer"}
     if not required_cols.issubset(df.columns):
@@ -68,8 +74,8 @@ def main():
     print("Converting to ChatML JSONL...")
 
     count = 0
-    OUTPUT_JSONL.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_JSONL, "w", encoding="utf-8") as f:
+    output_jsonl.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_jsonl, "w", encoding="utf-8") as f:
         for _, row in df.iterrows():
             q = str(row["question"])
             a = str(row["answer"])
@@ -87,8 +93,13 @@ def main():
             count += 1
 
     print("Done!")
-    print("Output JSONL:", OUTPUT_JSONL)
+    print("Output JSONL:", output_jsonl)
     print("Total samples written:", count)
+    return count
+
+
+def main():
+    convert_csv_to_jsonl(INPUT_CSV, OUTPUT_JSONL)
 
 
 if __name__ == "__main__":
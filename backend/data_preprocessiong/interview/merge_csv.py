@@ -1,9 +1,10 @@
-import csv
 from pathlib import Path
 
+from table_io import RecordReader, RecordWriter
+
 def merge_csv_files(train_csv, valid_csv, output_csv):
     """
-    Train과 Valid CSV 파일을 하나로 병합
+    Train과 Valid CSV(또는 Parquet) 파일을 하나로 병합
     """
     print("=" * 70)
     print("CSV 파일 병합 스크립트")
@@ -14,28 +15,16 @@ def merge_csv_files(train_csv, valid_csv, output_csv):
     print(f"\n출력 파일: {output_csv}")
     
     try:
-        # Train 파일 읽기
-        print("\n[1단계] Train 파일 로딩 중...")
-        with open(train_csv, 'r', encoding='utf-8-sig', newline='') as f:
-            train_reader = csv.DictReader(f)
-            train_headers = train_reader.fieldnames
-            train_rows = list(train_reader)
+        # 헤더만 먼저 확인 (행은 저장하면서 스트리밍으로 읽는다)
+        print("\n[1단계] 헤더 확인 중...")
+        with RecordReader(train_csv) as reader:
+            train_headers = reader.fieldnames
+        with RecordReader(valid_csv) as reader:
+            valid_headers = reader.fieldnames
         
-        print(f"  ✓ Train 행 수: {len(train_rows)}개")
         print(f"  ✓ Train 컬럼 수: {len(train_headers)}개")
-        
-        # Valid 파일 읽기
-        print("\n[2단계] Valid 파일 로딩 중...")
-        with open(valid_csv, 'r', encoding='utf-8-sig', newline='') as f:
-            valid_reader = csv.DictReader(f)
-            valid_headers = valid_reader.fieldnames
-            valid_rows = list(valid_reader)
-        
-        print(f"  ✓ Valid 행 수: {len(valid_rows)}개")
         print(f"  ✓ Valid 컬럼 수: {len(valid_headers)}개")
         
-        # 헤더 확인 및 통합
-        print("\n[3단계] 헤더 확인 중...")
         if set(train_headers) != set(valid_headers):
             print("  ⚠ 경고: Train과 Valid의 컬럼이 일치하지 않습니다!")
             print(f"  Train 컬럼: {train_headers}")
@@ -49,30 +38,21 @@ def merge_csv_files(train_csv, valid_csv, output_csv):
             headers = train_headers
             print(f"  ✓ 컬럼 일치 확인: {len(headers)}개")
         
-        # 데이터 병합
-        print("\n[4단계] 데이터 병합 중...")
-        merged_rows = train_rows + valid_rows
-        
-        print(f"  ✓ 병합된 행 수: {len(merged_rows)}개")
-        print(f"    - Train: {len(train_rows)}개")
-        print(f"    - Valid: {len(valid_rows)}개")
-        
-        # CSV 파일 저장
-        print("\n[5단계] 파일 저장 중...")
-        with open(output_csv, 'w', encoding='utf-8-sig', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
-            
-            # Train 데이터 작성
-            for row in train_rows:
-                filtered_row = {k: v for k, v in row.items() if k in headers}
-                writer.writerow(filtered_row)
-            
-            # Valid 데이터 작성
-            for row in valid_rows:
-                filtered_row = {k: v for k, v in row.items() if k in headers}
-                writer.writerow(filtered_row)
+        # Train + Valid 순서로 행 결합하며 저장
+        print("\n[2단계] 데이터 병합 및 저장 중...")
+        counts = {}
+        with RecordWriter(output_csv, headers) as writer:
+            for label, path in (("Train", train_csv), ("Valid", valid_csv)):
+                counts[label] = 0
+                with RecordReader(path) as reader:
+                    for row in reader:
+                        writer.writerow({k: row[k] for k in headers})
+                        counts[label] += 1
+        train_count, valid_count = counts["Train"], counts["Valid"]
         
+        print(f"  ✓ 병합된 행 수: {train_count + valid_count}개")
+        print(f"    - Train: {train_count}개")
+        print(f"    - Valid: {valid_count}개")
         print(f"  ✓ 저장 완료: {output_csv}")
         
         # 파일 크기 확인
@@ -83,9 +63,9 @@ def merge_csv_files(train_csv, valid_csv, output_csv):
         print("✅ 병합 완료!")
         print("=" * 70)
         print(f"\n📊 통계:")
-        print(f"  - Train 행 수: {len(train_rows)}개")
-        print(f"  - Valid 행 수: {len(valid_rows)}개")
-        print(f"  - 총 행 수: {len(merged_rows)}개")
+        print(f"  - Train 행 수: {train_count}개")
+        print(f"  - Valid 행 수: {valid_count}개")
+        print(f"  - 총 행 수: {train_count + valid_count}개")
         print(f"  - 컬럼 수: {len(headers)}개")
         print(f"\n📁 출력 파일:")
         print(f"  - 경로: {output_csv}")
@@ -1,10 +1,38 @@
 import json
 from pathlib import Path
-from datetime import datetime
+
+def iter_json_records(json_files, stats=None):
+    """
+    JSON 파일을 하나씩 읽어 레코드를 순서대로 돌려준다 (한 번에 파일 하나만 메모리에 있음)
+    파일이 리스트면 항목 단위로 펼친다
+    """
+    stats = stats if stats is not None else {}
+    stats.setdefault('success', 0)
+    stats.setdefault('error', 0)
+    for idx, json_file in enumerate(json_files, 1):
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            stats['error'] += 1
+            print(f"  ✗ 오류 ({Path(json_file).name}): {e}")
+            continue
+
+        stats['success'] += 1
+        if isinstance(data, list):
+            yield from data
+        else:
+            yield data
+
+        # 진행 상황 표시 (매 100개마다)
+        if idx % 100 == 0:
+            print(f"  처리 중: {idx}/{len(json_files)} 파일...")
+
 
 def merge_json_files(input_dir, output_file):
     """
-    디렉토리 내의 모든 JSON 파일을 하나의 JSON 파일로 병합
+    디렉토리 내의 모든 JSON 파일을 하나의 JSON Lines 파일로 병합
+    (레코드 한 줄씩 바로 기록 -> 데이터 크기와 상관없이 메모리 사용량 일정)
     """
     input_path = Path(input_dir)
     
@@ -27,35 +55,18 @@ def merge_json_files(input_dir, output_file):
     
     print(f"\n📂 발견된 JSON 파일: {len(json_files)}개")
     
-    # JSON 데이터 수집
-    merged_data = []
-    success_count = 0
-    error_count = 0
-    
-    print("\n[처리 중...]")
-    for idx, json_file in enumerate(json_files, 1):
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                merged_data.append(data)
-                success_count += 1
-                
-            # 진행 상황 표시 (매 100개마다)
-            if idx % 100 == 0:
-                print(f"  처리 중: {idx}/{len(json_files)} 파일...")
-                
-        except Exception as e:
-            error_count += 1
-            print(f"  ✗ 오류 ({json_file.name}): {e}")
-    
-    print(f"  처리 완료: {len(json_files)}/{len(json_files)} 파일")
-    
-    # 병합된 데이터를 파일로 저장
     output_path = Path(output_file)
+    stats = {}
+    record_count = 0
     
+    print("\n[처리 중...]")
     try:
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(merged_data, f, ensure_ascii=False, indent=2)
+            for record in iter_json_records(json_files, stats):
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write("\n")
+                record_count += 1
+        print(f"  처리 완료: {len(json_files)}/{len(json_files)} 파일")
         
         # 파일 크기 확인
         file_size = output_path.stat().st_size
@@ -65,9 +76,9 @@ def merge_json_files(input_dir, output_file):
         print("✅ 병합 완료!")
         print("=" * 70)
         print(f"\n📊 통계:")
-        print(f"  - 성공: {success_count}개")
-        print(f"  - 실패: {error_count}개")
-        print(f"  - 총 데이터: {len(merged_data)}개")
+        print(f"  - 성공: {stats['success']}개")
+        print(f"  - 실패: {stats['error']}개")
+        print(f"  - 총 데이터: {record_count}개")
         print(f"\n📁 출력 파일:")
         print(f"  - 경로: {output_path}")
         print(f"  - 크기: {file_size_mb:.2f} MB ({file_size:,} bytes)")
@@ -75,20 +86,22 @@ def merge_json_files(input_dir, output_file):
         
     except Exception as e:
         print(f"\n❌ 파일 저장 실패: {e}")
+    
+    return record_count
 
 def main():
     # 기본 경로 설정
     
     # train_merged 폴더의 JSON 파일들을 병합
     train_merged_dir = Path(r"C:\dev\study\4th_mini_project\dataset\training\training_merged")
-    train_output = Path(r"C:\dev\study\4th_mini_project\dataset\training\train_merged_all.json")
+    train_output = Path(r"C:\dev\study\4th_mini_project\dataset\training\train_merged_all.jsonl")
     
     print("\n[ TRAIN 데이터 병합 ]")
     merge_json_files(train_merged_dir, train_output)
     
     # valid_merged 폴더의 JSON 파일들을 병합
     valid_merged_dir = Path(r"C:\dev\study\4th_mini_project\dataset\valid\valid_merged")
-    valid_output = Path(r"C:\dev\study\4th_mini_project\dataset\valid\valid_merged_all.json")
+    valid_output = Path(r"C:\dev\study\4th_mini_project\dataset\valid\valid_merged_all.jsonl")
     
     print("\n[ VALID 데이터 병합 ]")
     merge_json_files(valid_merged_dir, valid_output)
@@ -21,6 +21,7 @@ Intent tagger (v3) with updated priority:
 
 Usage:
   python run_intent_tagger_v3.py --input /path/to/merged_experienced_with_intent.csv --outdir /path/to/out
+  python run_intent_tagger_v3.py --input ... --verify   # check tag_series == tag_one on every row
 Creates:
   - intent_eval_report_v3.csv (full rows + pred)
   - intent_mismatches_v3.csv  (gold != pred)
@@ -30,8 +31,12 @@ import argparse
 import os
 import re
 import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 
+from table_io import read_frame, write_frame
+
 # ------------------ Regex library ------------------
 # Keep raw strings; compile with re.IGNORECASE
 P_SELF   = re.compile(r"(후회|강점|약점|장점|단점|자기\s*소개|스스로|자신\s*있는|수준|숙련|레벨|대표적(인)?\s*프로젝트)")
@@ -84,14 +89,60 @@ def tag_one(text: str) -> str:
             return label
     return FALLBACK
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--input", required=True, help="CSV with at least 'question' column")
-    ap.add_argument("--outdir", default=".", help="Directory to write reports")
-    args = ap.parse_args()
+# Rows per process when sharding large inputs
+SHARD_SIZE = 50_000
 
-    os.makedirs(args.outdir, exist_ok=True)
-    df = pd.read_csv(args.input, encoding="utf-8-sig")
+def tag_series(questions: pd.Series) -> pd.Series:
+    """Vectorized tag_one: same labels, evaluated column-wise.
+
+    Rules are tried in INTENT_RULES order; each rule only scans the rows that
+    no higher-priority rule has matched yet, so the first match wins exactly
+    like tag_one.
+    """
+    values = pd.Series(questions.to_numpy(dtype=object, copy=False))
+    labels = pd.Series(FALLBACK, index=values.index, dtype=object)
+    is_str = values.map(lambda v: isinstance(v, str)).astype(bool)
+    remaining = values[is_str].str.strip().str.lower()
+    for label, rx in INTENT_RULES:
+        if remaining.empty:
+            break
+        with warnings.catch_warnings():
+            # patterns use groups for alternation only; contains() warns about them
+            warnings.filterwarnings("ignore", "This pattern is interpreted as a regular expression")
+            hit = remaining.str.contains(rx, regex=True).to_numpy(dtype=bool)
+        labels.loc[remaining.index[hit]] = label
+        remaining = remaining[~hit]
+    labels.index = questions.index
+    return labels
+
+def _tag_values(values: list) -> list:
+    return tag_series(pd.Series(values, dtype=object)).tolist()
+
+def tag_series_parallel(questions: pd.Series, workers: int = None, shard_size: int = SHARD_SIZE) -> pd.Series:
+    """tag_series sharded across processes (falls back to one process for small inputs)."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(questions) <= shard_size:
+        return tag_series(questions)
+    values = questions.tolist()
+    shards = [values[i:i + shard_size] for i in range(0, len(values), shard_size)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+        labels = [label for part in pool.map(_tag_values, shards) for label in part]
+    return pd.Series(labels, index=questions.index, dtype=object)
+
+def verify(questions: pd.Series, workers: int = None) -> int:
+    """Compare tag_series_parallel against tag_one row by row; returns the mismatch count."""
+    fast = tag_series_parallel(questions, workers)
+    slow = questions.map(tag_one)
+    mismatched = fast != slow
+    n = int(mismatched.sum())
+    for idx in mismatched[mismatched].index[:20]:
+        print(f"  ✗ row {idx}: tag_one={slow[idx]!r} tag_series={fast[idx]!r} question={questions[idx]!r}")
+    print(f"Verified {len(questions)} rows: {n} mismatches")
+    return n
+
+def tag_csv(input_csv, output_csv, workers: int = None) -> pd.DataFrame:
+    """Read input_csv, add 'question_intent' and write output_csv (.csv or .parquet)."""
+    df = read_frame(input_csv)
 
     # Column normalization
     # Prefer 'question' if present; otherwise try fallbacks
@@ -103,20 +154,37 @@ def main():
             raise ValueError("No 'question' or 'question_norm' column found.")
 
     # Tag question intents
-    df["question_intent"] = df["question"].apply(tag_one)
+    df["question_intent"] = tag_series_parallel(df["question"], workers)
 
     # Save output
-    output_path = os.path.join(args.outdir, "merged_experienced_with_question_intent.csv")
-    df.to_csv(output_path, index=False, encoding="utf-8-sig")
+    write_frame(df, output_csv)
 
     print(f"Total rows processed: {len(df)}")
-    print(f"Output saved to: {output_path}")
+    print(f"Output saved to: {output_csv}")
     
     # Display intent distribution
     print("\nQuestion Intent Distribution:")
     intent_counts = df["question_intent"].value_counts()
     for intent, count in intent_counts.items():
         print(f"  {intent}: {count} ({count/len(df)*100:.1f}%)")
+    return df
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--input", required=True, help="CSV with at least 'question' column")
+    ap.add_argument("--outdir", default=".", help="Directory to write reports")
+    ap.add_argument("--workers", type=int, default=None, help="processes for large inputs (default: CPU count)")
+    ap.add_argument("--verify", action="store_true", help="only check that the vectorized tagger matches tag_one")
+    args = ap.parse_args()
+
+    if args.verify:
+        df = read_frame(args.input)
+        column = "question" if "question" in df.columns else "question_norm"
+        sys.exit(1 if verify(df[column], args.workers) else 0)
+
+    os.makedirs(args.outdir, exist_ok=True)
+    output_path = os.path.join(args.outdir, "merged_experienced_with_question_intent.csv")
+    tag_csv(args.input, output_path, args.workers)
 
 if __name__ == "__main__":
     main()
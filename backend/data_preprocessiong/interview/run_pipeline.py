@@ -0,0 +1,350 @@
+"""
+면접 데이터 전처리 파이프라인 (DAG 실행기)
+
+각 단계의 입력/출력 파일을 선언해 두면
+  - 출력 파일을 입력으로 쓰는 단계끼리 의존 관계를 자동으로 만들고
+  - 서로 독립인 단계(train/valid 변환 등)는 별도 프로세스에서 동시에 실행하며
+  - 입력 파일 내용 + 파라미터 + 단계 코드의 해시가 지난 실행과 같으면 그 단계를 건너뛴다
+  - 단계별 소요 시간과 최대 메모리(RSS, 단계 프로세스 시작 시점 대비 증가분)를 표로 출력한다
+
+사용법:
+  python run_pipeline.py --train-zips <train zip 폴더> --valid-zips <valid zip 폴더> --workdir <출력 폴더>
+  python run_pipeline.py ... --jobs 4          # 동시에 실행할 단계 수
+  python run_pipeline.py ... --force tag       # 특정 단계(와 하위 단계) 강제 재실행
+  python run_pipeline.py ... --format csv      # 중간 파일을 CSV로 (기본: Parquet)
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from drop_columns import COLUMNS_TO_DROP, drop_columns
+from filter_experienced import filter_experienced_and_add_sample_id
+from make_ft_jsonl import convert_csv_to_jsonl
+from merge_csv import merge_csv_files
+from run_intent_tagger_v3 import tag_csv
+from table_io import convert_table
+from unzip_and_merge import flatten_zips_to_csv
+
+STATE_FILE = ".pipeline_state.json"
+
+
+@dataclass
+class Stage:
+    """fn(*inputs, *outputs, **params) 로 호출되는 단계"""
+
+    name: str
+    fn: Callable[..., Any]
+    inputs: Sequence[Path]
+    outputs: Sequence[Path]
+    params: Dict[str, Any] = field(default_factory=dict)
+    # fn이 있는 모듈 외에 결과에 영향을 주는 코드 파일 (해시에 포함)
+    code: Sequence[str] = ()
+
+
+# ------------------ 해시 ------------------
+def _file_sha256(path: Path, cache: Dict[str, list]) -> str:
+    """파일 내용 해시. (크기, 수정시각)이 같으면 지난 실행의 값을 재사용한다"""
+    st = path.stat()
+    key = str(path.resolve())
+    cached = cache.get(key)
+    if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+        return cached[2]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    cache[key] = [st.st_size, st.st_mtime_ns, digest.hexdigest()]
+    return cache[key][2]
+
+
+def fingerprint(path: Path, cache: Dict[str, list]) -> str:
+    """파일은 내용 해시, 디렉토리(zip 폴더)는 안의 파일들 해시를 합친 값"""
+    path = Path(path)
+    if not path.exists():
+        return "missing"
+    if path.is_file():
+        return _file_sha256(path, cache)
+    digest = hashlib.sha256()
+    for child in sorted(p for p in path.rglob("*") if p.is_file()):
+        digest.update(str(child.relative_to(path)).encode("utf-8"))
+        digest.update(_file_sha256(child, cache).encode("ascii"))
+    return digest.hexdigest()
+
+
+def _code_hash(stage: Stage) -> str:
+    digest = hashlib.sha256(f"{stage.fn.__module__}.{stage.fn.__qualname__}".encode("utf-8"))
+    here = Path(__file__).resolve().parent
+    files = [inspect.getsourcefile(stage.fn)] + [str(here / name) for name in stage.code]
+    for name in files:
+        digest.update(Path(name).read_bytes())
+    return digest.hexdigest()
+
+
+def stage_key(stage: Stage, cache: Dict[str, list]) -> str:
+    digest = hashlib.sha256()
+    digest.update(_code_hash(stage).encode("ascii"))
+    digest.update(json.dumps(stage.params, sort_keys=True, default=str, ensure_ascii=False).encode("utf-8"))
+    for path in stage.inputs:
+        digest.update(str(path).encode("utf-8"))
+        digest.update(fingerprint(path, cache).encode("ascii"))
+    return digest.hexdigest()
+
+
+# ------------------ 실행 ------------------
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # 단계 프로세스 + 단계가 띄운 워커 프로세스 중 큰 값 (Linux: KB 단위, macOS: byte 단위)
+    scale = 1 if sys.platform == "darwin" else 1024
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak * scale / (1024 * 1024)
+
+
+def _stage_process(stage: Stage, results) -> None:
+    """단계 하나를 새 프로세스에서 실행 (최대 메모리를 단계별로 따로 잰다)"""
+    started = time.perf_counter()
+    # fork된 프로세스는 실행기가 이미 올린 pandas/pyarrow/단계 모듈만큼의 RSS로 시작하므로
+    # 시작 시점 값을 빼서 단계가 실제로 더 쓴 메모리만 보고한다
+    baseline = _peak_rss_mb()
+    error = None
+    try:
+        for path in stage.outputs:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        stage.fn(*stage.inputs, *stage.outputs, **stage.params)
+    except BaseException:
+        error = traceback.format_exc()
+    peak = _peak_rss_mb()
+    peak_mb = None if peak is None else max(0.0, peak - baseline)
+    results.put((stage.name, time.perf_counter() - started, peak_mb, error))
+
+
+class Pipeline:
+    def __init__(self, stages: Sequence[Stage], workdir: Path, jobs: int = 2):
+        self.stages = {stage.name: stage for stage in stages}
+        self.workdir = Path(workdir)
+        self.jobs = max(1, jobs)
+        self.state_path = self.workdir / STATE_FILE
+        self.deps = self._build_deps()
+
+    def _build_deps(self) -> Dict[str, List[str]]:
+        producer: Dict[str, str] = {}
+        for stage in self.stages.values():
+            for path in stage.outputs:
+                key = str(Path(path).resolve())
+                if key in producer:
+                    raise ValueError(f"{path} is produced by both {producer[key]} and {stage.name}")
+                producer[key] = stage.name
+        deps = {
+            stage.name: sorted({producer[str(Path(p).resolve())] for p in stage.inputs
+                                if str(Path(p).resolve()) in producer})
+            for stage in self.stages.values()
+        }
+        # 순환 검사
+        visiting, done = set(), set()
+
+        def _visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"cycle in pipeline at stage {name}")
+            visiting.add(name)
+            for dep in deps[name]:
+                _visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in deps:
+            _visit(name)
+        return deps
+
+    def _downstream(self, names: Sequence[str]) -> set:
+        selected = set(names)
+        changed = True
+        while changed:
+            changed = False
+            for name, deps in self.deps.items():
+                if name not in selected and selected.intersection(deps):
+                    selected.add(name)
+                    changed = True
+        return selected
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self.state_path.exists():
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        return {"stages": {}, "files": {}}
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+    def _is_cached(self, stage: Stage, key: str, state: Dict[str, Any]) -> bool:
+        record = state["stages"].get(stage.name)
+        if not record or record.get("key") != key:
+            return False
+        # 출력이 지워졌거나 손으로 고쳐졌으면 다시 실행
+        return all(fingerprint(Path(p), state["files"]) == record["outputs"].get(str(p))
+                   for p in stage.outputs)
+
+    @staticmethod
+    def _next_result(results, running):
+        """끝난 단계의 결과를 기다린다. 결과 없이 죽은 프로세스(OOM 등)는 실패로 처리"""
+        while True:
+            try:
+                return results.get(timeout=1.0)
+            except queue.Empty:
+                for name, (proc, _, started_at) in running.items():
+                    if not proc.is_alive() and proc.exitcode != 0:
+                        return name, time.time() - started_at, None, f"process exited with code {proc.exitcode}"
+
+    def run(self, force: Sequence[str] = ()) -> Dict[str, Dict[str, Any]]:
+        state = self._load_state()
+        forced = self._downstream(force)
+        report: Dict[str, Dict[str, Any]] = {}
+        pending = set(self.stages)
+        running: Dict[str, tuple] = {}
+        ctx = mp.get_context()
+        results = ctx.Queue()
+
+        while pending or running:
+            # 의존 단계가 모두 끝난 단계를 시작 (캐시된 단계는 바로 완료 처리)
+            for name in sorted(pending):
+                if len(running) >= self.jobs:
+                    break
+                deps = self.deps[name]
+                if any(d in pending or d in running for d in deps):
+                    continue
+                pending.discard(name)
+                if any(report[d]["status"] in ("failed", "blocked") for d in deps):
+                    report[name] = {"status": "blocked", "seconds": 0.0, "peak_mb": None}
+                    continue
+                stage = self.stages[name]
+                key = stage_key(stage, state["files"])
+                if name not in forced and self._is_cached(stage, key, state):
+                    report[name] = {"status": "cached", "seconds": 0.0, "peak_mb": None}
+                    print(f"⏭  [{name}] 변경 없음 - 건너뜀")
+                    continue
+                print(f"▶  [{name}] 시작")
+                proc = ctx.Process(target=_stage_process, args=(stage, results), name=f"stage-{name}")
+                proc.start()
+                running[name] = (proc, key, time.time())
+
+            if not running:
+                continue
+            name, seconds, peak_mb, error = self._next_result(results, running)
+            proc, key, started_at = running.pop(name)
+            proc.join()
+            stage = self.stages[name]
+            # 기존 스크립트들은 오류를 출력만 하고 삼키므로 출력이 이번 실행에서 쓰였는지도 확인
+            stale = [str(p) for p in stage.outputs
+                     if not Path(p).exists() or Path(p).stat().st_mtime < started_at - 1]
+            if error is None and stale:
+                error = f"outputs not written: {stale}"
+            if error is None:
+                state["stages"][name] = {
+                    "key": key,
+                    "outputs": {str(p): fingerprint(Path(p), state["files"]) for p in stage.outputs},
+                }
+                self._save_state(state)
+                report[name] = {"status": "ran", "seconds": seconds, "peak_mb": peak_mb}
+                print(f"✓  [{name}] 완료 ({seconds:.1f}s)")
+            else:
+                state["stages"].pop(name, None)
+                self._save_state(state)
+                report[name] = {"status": "failed", "seconds": seconds, "peak_mb": peak_mb}
+                print(f"✗  [{name}] 실패\n{error}")
+        return report
+
+
+def print_report(report: Dict[str, Dict[str, Any]], order: Sequence[str]) -> None:
+    print("\n" + "=" * 70)
+    print(f"{'단계':<20} {'상태':<10} {'시간(s)':>10} {'최대 메모리 증가(MB)':>18}")
+    print("-" * 70)
+    for name in order:
+        r = report[name]
+        peak = f"{r['peak_mb']:.0f}" if r["peak_mb"] is not None else "-"
+        print(f"{name:<20} {r['status']:<10} {r['seconds']:>10.1f} {peak:>18}")
+    print("=" * 70)
+
+
+def build_interview_stages(train_zips: Path, valid_zips: Path, workdir: Path, workers: Optional[int] = None,
+                           fmt: str = "parquet") -> List[Stage]:
+    """
+    zip -> 상세 테이블 (1~3단계, 압축 해제 없음) -> 컬럼 제거 -> train+valid 병합
+    -> EXPERIENCED 필터 + sample_id -> 의도 태깅 -> 파인튜닝 JSONL
+
+    fmt="parquet"이면 단계 사이 파일은 Parquet(table_io 스키마)이고,
+    사람이 보는 최종 태깅 결과만 CSV로 내보낸다.
+    """
+    w = Path(workdir)
+    ext = ".parquet" if fmt == "parquet" else ".csv"
+    io_code = ("table_io.py",)
+    flatten_code = ("json_to_csv_detailed.py",) + io_code
+    final_csv = w / "merged_experienced_with_question_intent.csv"
+    tagged = w / f"merged_experienced_with_question_intent{ext}"
+    stages = [
+        Stage("flatten_train", flatten_zips_to_csv, [train_zips], [w / f"train_detailed_all{ext}"],
+              {"workers": workers}, code=flatten_code),
+        Stage("flatten_valid", flatten_zips_to_csv, [valid_zips], [w / f"valid_detailed_all{ext}"],
+              {"workers": workers}, code=flatten_code),
+        Stage("drop_train", drop_columns, [w / f"train_detailed_all{ext}"], [w / f"train_cleaned_all{ext}"],
+              {"columns_to_drop": COLUMNS_TO_DROP}, code=io_code),
+        Stage("drop_valid", drop_columns, [w / f"valid_detailed_all{ext}"], [w / f"valid_cleaned_all{ext}"],
+              {"columns_to_drop": COLUMNS_TO_DROP}, code=io_code),
+        Stage("merge", merge_csv_files, [w / f"train_cleaned_all{ext}", w / f"valid_cleaned_all{ext}"],
+              [w / f"merged_all{ext}"], code=io_code),
+        Stage("filter", filter_experienced_and_add_sample_id, [w / f"merged_all{ext}"],
+              [w / f"merged_experienced{ext}"], code=io_code),
+        Stage("tag", tag_csv, [w / f"merged_experienced{ext}"], [tagged], code=io_code),
+        Stage("ft_jsonl", convert_csv_to_jsonl, [tagged], [w / "interview_ft.jsonl"], code=io_code),
+    ]
+    if tagged != final_csv:
+        stages.append(Stage("export_csv", convert_table, [tagged], [final_csv]))
+    return stages
+
+
+def main():
+    ap = argparse.ArgumentParser(description="면접 데이터 전처리 파이프라인")
+    ap.add_argument("--train-zips", required=True, type=Path, help="train zip 파일 폴더")
+    ap.add_argument("--valid-zips", required=True, type=Path, help="valid zip 파일 폴더")
+    ap.add_argument("--workdir", required=True, type=Path, help="중간/최종 산출물 폴더")
+    ap.add_argument("--jobs", type=int, default=2, help="동시에 실행할 단계 수 (기본 2)")
+    ap.add_argument("--workers", type=int, default=None, help="JSON 파싱 프로세스 수 (기본: CPU 수)")
+    ap.add_argument("--format", choices=["parquet", "csv"], default="parquet", help="단계 사이 파일 형식 (기본 parquet)")
+    ap.add_argument("--force", nargs="*", default=[], help="캐시와 상관없이 다시 실행할 단계 (하위 단계 포함)")
+    args = ap.parse_args()
+
+    stages = build_interview_stages(args.train_zips, args.valid_zips, args.workdir, args.workers, args.format)
+    unknown = set(args.force) - {s.name for s in stages}
+    if unknown:
+        ap.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+
+    started = time.perf_counter()
+    pipeline = Pipeline(stages, args.workdir, jobs=args.jobs)
+    report = pipeline.run(force=args.force)
+    print_report(report, [s.name for s in stages])
+    print(f"총 소요 시간: {time.perf_counter() - started:.1f}s")
+    if any(r["status"] in ("failed", "blocked") for r in report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+전처리 단계 사이의 중간 파일 입출력 (CSV / Parquet)
+
+경로의 확장자로 형식을 고른다.
+  - .csv     : 기존과 같은 utf-8-sig CSV (사람이 보는 최종 산출물용)
+  - .parquet : 명시적 스키마의 컬럼 형식 (문자열 재파싱/타입 추론 없음, 파일 크기 작음)
+               occupation/question_intent/experience 등은 dictionary(categorical), sample_id는 int64
+
+행 단위 스크립트(csv.DictReader/DictWriter 사용)는 RecordReader/RecordWriter를,
+pandas 스크립트는 read_frame/write_frame을 쓴다. pyarrow는 Parquet을 쓸 때만 필요하다.
+"""
+
+import csv
+from pathlib import Path
+
+# 값 종류가 적은 컬럼 -> Parquet dictionary / pandas category
+CATEGORY_COLUMNS = (
+    "occupation",
+    "question_intent",
+    "experience",
+    "gender",
+    "ageRange",
+    "answer-emotion_category",
+    "answer-intent_category",
+)
+INT_COLUMNS = ("sample_id",)
+BATCH_ROWS = 10_000
+
+
+def is_parquet(path) -> bool:
+    return Path(path).suffix.lower() == ".parquet"
+
+
+def arrow_schema(fieldnames):
+    import pyarrow as pa
+
+    fields = []
+    for name in fieldnames:
+        if name in INT_COLUMNS:
+            fields.append(pa.field(name, pa.int64()))
+        elif name in CATEGORY_COLUMNS:
+            fields.append(pa.field(name, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+
+class RecordReader:
+    """
+    csv.DictReader처럼 행(dict)을 하나씩 돌려준다. Parquet도 CSV와 같은 값(str, 결측은 '')으로 돌려준다
+        with RecordReader(path) as reader:
+            headers = reader.fieldnames
+            for row in reader: ...
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = None
+        self._reader = None
+        self.fieldnames = None
+
+    def __enter__(self):
+        if is_parquet(self.path):
+            import pyarrow.parquet as pq
+
+            self._reader = pq.ParquetFile(self.path)
+            self.fieldnames = list(self._reader.schema_arrow.names)
+        else:
+            self._file = open(self.path, 'r', encoding='utf-8-sig', newline='')
+            self._reader = csv.DictReader(self._file)
+            self.fieldnames = list(self._reader.fieldnames or [])
+        return self
+
+    def __exit__(self, *exc):
+        if self._file is not None:
+            self._file.close()
+
+    def __iter__(self):
+        if self._file is not None:
+            yield from self._reader
+            return
+        for batch in self._reader.iter_batches(batch_size=BATCH_ROWS):
+            columns = [
+                ['' if v is None else str(v) for v in batch.column(i).to_pylist()]
+                for i in range(batch.num_columns)
+            ]
+            for values in zip(*columns):
+                yield dict(zip(self.fieldnames, values))
+
+
+class RecordWriter:
+    """
+    csv.DictWriter처럼 행(dict)을 기록한다. Parquet은 BATCH_ROWS 행씩 모아 기록 (메모리 일정)
+    """
+
+    def __init__(self, path, fieldnames):
+        self.path = Path(path)
+        self.fieldnames = list(fieldnames)
+        self._file = None
+        self._writer = None
+        self._batch = []
+
+    def __enter__(self):
+        if is_parquet(self.path):
+            import pyarrow.parquet as pq
+
+            self._schema = arrow_schema(self.fieldnames)
+            self._writer = pq.ParquetWriter(self.path, self._schema, compression="zstd")
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8-sig', newline='')
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+            self._writer.writeheader()
+        return self
+
+    def writerow(self, row):
+        if self._file is not None:
+            self._writer.writerow(row)
+            return
+        self._batch.append(row)
+        if len(self._batch) >= BATCH_ROWS:
+            self._flush()
+
+    def writerows(self, rows):
+        for row in rows:
+            self.writerow(row)
+
+    def _flush(self):
+        import pyarrow as pa
+
+        if not self._batch:
+            return
+        arrays = []
+        for field in self._schema:
+            values = [row.get(field.name) for row in self._batch]
+            if field.name in INT_COLUMNS:
+                values = [None if v in (None, '') else int(v) for v in values]
+            else:
+                values = [None if v is None else str(v) for v in values]
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+        self._batch.clear()
+
+    def __exit__(self, exc_type, *exc):
+        if self._file is not None:
+            self._file.close()
+            return
+        if exc_type is None:
+            self._flush()
+        self._writer.close()
+
+
+def read_frame(path, dtype=None):
+    """
+    pandas DataFrame으로 읽기. dtype=str이면 CSV의 pd.read_csv(dtype=str)와 같이 결측은 NaN, 나머지는 str
+    """
+    import pandas as pd
+
+    if not is_parquet(path):
+        return pd.read_csv(path, encoding="utf-8-sig", dtype=dtype)
+    df = pd.read_parquet(path)
+    if dtype is str:
+        df = df.astype(str).mask(df.isna())
+    return df
+
+
+def write_frame(df, path):
+    """
+    DataFrame 저장. Parquet이면 CATEGORY_COLUMNS를 category로 바꿔 저장한다
+    """
+    if not is_parquet(path):
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+        return
+    typed = df.copy(deep=False)
+    for col in CATEGORY_COLUMNS:
+        if col in typed.columns:
+            typed[col] = typed[col].astype("category")
+    typed.to_parquet(path, index=False, compression="zstd")
+
+
+def convert_table(input_path, output_path):
+    """
+    형식 변환 (예: 최종 Parquet -> 사람이 볼 CSV)
+    """
+    write_frame(read_frame(input_path), output_path)
@@ -0,0 +1,112 @@
+"""
+tag_series / tag_series_parallel must return exactly what tag_one returns for every row.
+
+  python -m pytest backend/data_preprocessiong/interview
+"""
+
+import itertools
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from run_intent_tagger_v3 import FALLBACK, INTENT_RULES, tag_one, tag_series, tag_series_parallel
+
+# one keyword per rule (each matches its own rule, so every pair below is a real collision)
+KEYWORDS = {
+    "motivation_fit": "지원 동기",
+    "self_reflection": "강점",
+    "criteria_evaluation": "판단 기준",
+    "stakeholder_comm": "협업",
+    "behavioral_star": "어떻게 해결",
+    "procedure_method": "절차",
+    "mechanism_reason": "왜",
+    "compare_tradeoff": "trade-off",
+    "evidence_metric": "AUC",
+    "leadership_ownership": "리더십",
+    "creativity_ideation": "아이디어",
+    "root_cause": "디버그",
+    "ethics_compliance": "GDPR",
+    "application_transfer": "적용",
+    "estimation_planning": "스케줄",
+    "cost_resource": "ROI",
+}
+
+
+def assert_same_as_tag_one(questions: pd.Series, labels: pd.Series):
+    expected = pd.Series([tag_one(q) for q in questions], index=questions.index, dtype=object)
+    assert labels.index.equals(questions.index)
+    assert labels.tolist() == expected.tolist()
+
+
+def test_keywords_cover_every_rule():
+    assert set(KEYWORDS) == {label for label, _ in INTENT_RULES}
+    for label, keyword in KEYWORDS.items():
+        assert any(rx.search(keyword.lower()) for name, rx in INTENT_RULES if name == label)
+
+
+def test_rule_priority_collisions():
+    # every ordered pair of rules in one question -> the higher-priority rule must win in both taggers
+    questions = pd.Series([
+        f"{KEYWORDS[a]}에 대해 말하고 {KEYWORDS[b]}도 설명해 주세요"
+        for a, b in itertools.permutations(KEYWORDS, 2)
+    ])
+    assert_same_as_tag_one(questions, tag_series(questions))
+
+
+@pytest.mark.parametrize("question, label", [
+    ("지원 동기와 본인의 강점을 말해 주세요", "motivation_fit"),
+    ("협업 중 겪은 갈등 경험을 어떻게 해결했나요", "stakeholder_comm"),
+    ("리더십을 발휘해 비용을 줄인 사례", "behavioral_star"),
+    ("  배포 절차를 설명해 주세요  ", "procedure_method"),
+    ("AUC 지표 검증", "evidence_metric"),
+    ("두 대안을 비교해 주세요", "compare_tradeoff"),
+    ("원인 분석 경험", "behavioral_star"),
+    ("오늘 점심 메뉴", FALLBACK),
+])
+def test_known_labels(question, label):
+    assert tag_one(question) == label
+    assert tag_series(pd.Series([question])).tolist() == [label]
+
+
+def test_missing_and_non_string_values():
+    questions = pd.Series([None, np.nan, pd.NA, 3, 4.5, b"bytes", ["list"], "", "   ", "왜 지원했나요?"], dtype=object)
+    labels = tag_series(questions)
+    assert_same_as_tag_one(questions, labels)
+    assert labels.tolist()[:9] == [FALLBACK] * 9
+
+
+def test_duplicate_index():
+    questions = pd.Series(["협업 경험", "왜", None, "ROI 계산"], index=[7, 7, 3, 3])
+    assert_same_as_tag_one(questions, tag_series(questions))
+
+
+def test_empty_series():
+    questions = pd.Series([], dtype=object)
+    assert tag_series(questions).tolist() == []
+
+
+def _random_questions(n: int, seed: int = 0) -> pd.Series:
+    rng = random.Random(seed)
+    pieces = list(KEYWORDS.values()) + ["데이터", "프로젝트", "회사", "팀", "?", "  ", "VS", "중에 어느", "how it work"]
+    values = []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.05:
+            values.append(rng.choice([None, np.nan, 42]))
+        else:
+            values.append(" ".join(rng.choice(pieces) for _ in range(rng.randint(0, 4))))
+    return pd.Series(values, index=[rng.randint(0, n // 2) for _ in range(n)], dtype=object)
+
+
+def test_random_questions_match_tag_one():
+    questions = _random_questions(3000)
+    assert_same_as_tag_one(questions, tag_series(questions))
+
+
+def test_sharded_parallel_path():
+    # small shard_size forces the ProcessPoolExecutor path (several shards, uneven last shard)
+    questions = _random_questions(103, seed=1)
+    labels = tag_series_parallel(questions, workers=2, shard_size=10)
+    assert_same_as_tag_one(questions, labels)
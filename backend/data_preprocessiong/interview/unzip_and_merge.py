@@ -1,8 +1,12 @@
 import os
+import json
 import zipfile
 import shutil
+from contextlib import ExitStack
 from pathlib import Path
 
+from json_to_csv_detailed import flatten_record, parallel_flatten, print_flat_summary, write_flat_csv
+
 def extract_zip_files(directory, extract_to):
     """
     디렉토리 내의 모든 zip 파일 압축 해제
@@ -67,6 +71,72 @@ def merge_extracted_data(extracted_dir, output_dir):
     
     return copied_count, file_count
 
+def list_zip_members(directory):
+    """
+    압축을 풀지 않고 zip들의 JSON 멤버 목록을 만든다 [(zip 경로, 멤버 이름), ...]
+    여러 zip에 같은 경로의 파일이 있으면 merge_extracted_data와 같이 먼저 나온 것만 사용하고,
+    merge_json.py와 같은 순서(파일 이름순)로 정렬한다
+    """
+    members = {}
+    for zip_file in sorted(Path(directory).glob("*.zip")):
+        try:
+            with zipfile.ZipFile(zip_file, 'r') as zip_ref:
+                for info in zip_ref.infolist():
+                    if info.is_dir() or not info.filename.lower().endswith('.json'):
+                        continue
+                    members.setdefault(info.filename, str(zip_file))
+        except Exception as e:
+            print(f"  ✗ {zip_file.name} 읽기 실패: {e}")
+    return sorted(((zip_path, name) for name, zip_path in members.items()),
+                  key=lambda m: Path(m[1]).name)
+
+
+def _parse_and_flatten_zip_members(members):
+    """
+    (워커) [(zip 경로, 멤버 이름), ...]을 zip 안에서 바로 읽어 파싱 + 평면화
+    멤버는 파일 이름순이라 여러 zip이 번갈아 나오므로, 연 zip을 배치가 끝날 때까지 보관해
+    배치 안에서 zip마다 한 번만 연다 (중앙 디렉터리를 다시 읽지 않음)
+    """
+    results = []
+    with ExitStack() as stack:
+        archives = {}
+        for zip_path, name in members:
+            zip_ref = archives.get(zip_path)
+            if zip_ref is None:
+                zip_ref = archives[zip_path] = stack.enter_context(zipfile.ZipFile(zip_path, 'r'))
+            try:
+                data = json.loads(zip_ref.read(name))
+                for item in (data if isinstance(data, list) else [data]):
+                    results.append(flatten_record(item))
+            except Exception as e:
+                results.append(f"{Path(zip_path).name}:{name}: {e}")
+    return results
+
+
+def flatten_zips_to_csv(directory, csv_file, workers=None):
+    """
+    압축 해제/병합 없이 zip 멤버를 바로 읽어 JSON 평면화 단계(json_to_csv_detailed)로 넘긴다
+    멤버 묶음을 여러 프로세스에서 병렬로 파싱 (여러 zip에 걸쳐 분산)
+    """
+    print(f"\n[zip 직접 읽기] {Path(directory).name} → {Path(csv_file).name}")
+    members = list_zip_members(directory)
+    if not members:
+        print(f"  ⚠ zip 안에 JSON 파일이 없습니다.")
+        return 0
+
+    n_archives = len({zip_path for zip_path, _ in members})
+    print(f"  - {n_archives}개 zip, {len(members)}개 JSON 파일")
+    try:
+        results = parallel_flatten(_parse_and_flatten_zip_members, members, workers, batch_size=200)
+        success_count, error_count = write_flat_csv(results, csv_file, total=len(members))
+    except Exception as e:
+        print(f"\n❌ CSV 파일 생성 실패: {e}")
+        return
+
+    print_flat_summary(csv_file, success_count, error_count)
+    return success_count
+
+
 def main():
     # 기본 경로 설정 - ICT 폴더
     # base_dir = Path(r"C:\dev\study\4th_mini_project\dataset\ICT")
@@ -80,6 +150,9 @@ def main():
     # 병합된 데이터 경로 (train끼리, valid끼리 각각)
     #train_merged = base_dir / "train_merged"
     valid_merged = valid_dir / "training_merged"
+
+    # 압축 해제 없이 zip에서 바로 상세 CSV 생성 (1~3단계를 한 번에, 중간 파일 없음)
+    # flatten_zips_to_csv(valid_dir, valid_dir.parent / "train_detailed_all.csv")
     
     # print("=" * 70)
     # print("ICT 데이터셋 압축 해제 및 병합 스크립트")
@@ -7,16 +7,22 @@ Schema:
   - interview.vector(chunk_id PK, doc_id FK, chunk_seq, start_char, end_char, emb_model, emb_dim, embedding VECTOR(3072))
 """
 
-import os, sys, re, time, argparse
-from typing import List, Tuple
+import os, sys, re, json, time, queue, random, hashlib, argparse, threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 import pandas as pd
 import psycopg2
 from psycopg2.extras import execute_batch
-from openai import OpenAI
+from openai import OpenAI, RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
 from dotenv import load_dotenv
 import tiktoken
 
+from SemanticCache import invalidate_cache
+from pg_copy import drop_vector_indexes, restore_indexes, staged_upsert
+from shadow_table import ShadowTables
+
 # -------------------
 # Config
 # -------------------
@@ -42,11 +48,44 @@ SCHEMA = os.getenv("DB_SCHEMA", "interview")
 EMBED_MODEL = os.getenv("EMBED_MODEL", "text-embedding-3-large")
 EMBED_DIM = 3072
 BATCH_SIZE = 50
-RATE_LIMIT_DELAY = float(os.getenv("EMBED_RATE_DELAY", "0.2"))
+
+# Embedding requests: many chunks per request, several requests in flight.
+# OpenAI limits: 2048 inputs / 300k tokens per request, 8191 tokens per input.
+EMBED_BATCH_MAX_INPUTS = int(os.getenv("EMBED_BATCH_MAX_INPUTS", "256"))
+EMBED_BATCH_MAX_TOKENS = int(os.getenv("EMBED_BATCH_MAX_TOKENS", "100000"))
+EMBED_INPUT_MAX_TOKENS = 8191
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+EMBED_TPM_LIMIT = int(os.getenv("EMBED_TPM_LIMIT", "1000000"))   # tokens per minute
+EMBED_RPM_LIMIT = int(os.getenv("EMBED_RPM_LIMIT", "3000"))      # requests per minute
+EMBED_MAX_RETRIES = int(os.getenv("EMBED_MAX_RETRIES", "6"))
+ROW_WINDOW = int(os.getenv("EMBED_ROW_WINDOW", "500"))           # rows per pipeline work item / DB flush
+
+# Pipeline (prepare -> embed -> write); the writer is a single thread (one DB connection)
+PREPARE_WORKERS = int(os.getenv("EMBED_PREPARE_WORKERS", "2"))
+EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", "2"))
+QUEUE_SIZE = int(os.getenv("EMBED_QUEUE_SIZE", "4"))             # windows buffered between stages
+
+# Index rebuild after bulk loads (--rebuild-index)
+INDEX_MAINTENANCE_WORK_MEM = os.getenv("INDEX_MAINTENANCE_WORK_MEM", "1GB")
+INDEX_PARALLEL_WORKERS = int(os.getenv("INDEX_PARALLEL_WORKERS", "4"))
 
 CHUNK_SIZE = 300
 CHUNK_OVERLAP = 100
 
+# Column layout shared by the execute_batch path and the binary COPY (--bulk) path
+META_COLUMNS = [
+    "doc_id", "occupation", "gender", "age_range", "experience",
+    "answer_intent_category", "answer_emotion_expression", "answer_emotion_category",
+    "question_intent", "question_text", "answer_text", "content_combined",
+    "tokens_answer", "tokens_combined",
+]
+META_TYPES = ["int4"] + ["text"] * 11 + ["int4", "int4"]
+VECTOR_COLUMNS = [
+    "chunk_id", "doc_id", "chunk_seq", "start_char", "end_char",
+    "emb_model", "emb_dim", "content_hash", "embedding",
+]
+VECTOR_TYPES = ["text", "int4", "int2", "int4", "int4", "text", "int4", "text", "vector"]
+
 # -------------------
 # Helpers
 # -------------------
@@ -90,17 +129,225 @@ def make_combined(q: str, a: str) -> str:
     a = normalize_text(a)
     return f"Q: {q}\nA: {a}"
 
+def content_hash(combined: str) -> str:
+    """Hash of the embedded text and chunking params; a doc is re-embedded only when this changes."""
+    key = f"{CHUNK_SIZE}:{CHUNK_OVERLAP}:{combined}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
 def to_pgvector_literal(vec: List[float]) -> str:
     # pgvector accepts string literal like '[0.1, 0.2, ...]'
     return "[" + ",".join(f"{x:.7f}" for x in vec) + "]"
 
+def token_batches(items: List[Tuple[int, int]], max_inputs: int, max_tokens: int) -> List[List[int]]:
+    """
+    Group (index, token_count) items into request batches under both the input-count
+    and total-token limits. Returns lists of indices, order preserved.
+    """
+    batches, cur, cur_tokens = [], [], 0
+    for idx, n_tok in items:
+        if cur and (len(cur) >= max_inputs or cur_tokens + n_tok > max_tokens):
+            batches.append(cur)
+            cur, cur_tokens = [], 0
+        cur.append(idx)
+        cur_tokens += n_tok
+    if cur:
+        batches.append(cur)
+    return batches
+
+class AdaptiveTokenBucket:
+    """
+    Token-bucket limiter for both tokens/min and requests/min.
+    - acquire(n) blocks until n tokens and one request slot are available
+    - on_rate_limited() halves the current rate and pauses everyone (429 backoff)
+    - on_success() slowly raises the rate back toward the configured limit (AIMD)
+    """
+    def __init__(self, tpm: int, rpm: int, min_fraction: float = 0.05):
+        self.max_tpm, self.max_rpm = float(tpm), float(rpm)
+        self.tpm, self.rpm = float(tpm), float(rpm)
+        self.min_fraction = min_fraction
+        self.tokens, self.requests = self.tpm, self.rpm
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        self.updated = now
+        self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60.0)
+        self.requests = min(self.rpm, self.requests + elapsed * self.rpm / 60.0)
+
+    def acquire(self, n_tokens: int):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                need = min(n_tokens, self.tpm)  # a batch larger than the bucket waits for a full bucket
+                wait = self.paused_until - now
+                if wait <= 0:
+                    if self.tokens >= need and self.requests >= 1:
+                        self.tokens -= need
+                        self.requests -= 1
+                        return
+                    # time until both buckets have enough
+                    wait = max(
+                        (need - self.tokens) * 60.0 / self.tpm,
+                        (1 - self.requests) * 60.0 / self.rpm,
+                        0.01,
+                    )
+            time.sleep(min(wait, 5.0))
+
+    def on_rate_limited(self, retry_after: Optional[float] = None):
+        with self.lock:
+            self.tpm = max(self.max_tpm * self.min_fraction, self.tpm / 2)
+            self.rpm = max(self.max_rpm * self.min_fraction, self.rpm / 2)
+            self.tokens = min(self.tokens, self.tpm)
+            self.requests = min(self.requests, self.rpm)
+            pause = retry_after if retry_after is not None else 1.0
+            self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+    def on_success(self):
+        with self.lock:
+            self.tpm = min(self.max_tpm, self.tpm + self.max_tpm * 0.02)
+            self.rpm = min(self.max_rpm, self.rpm + self.max_rpm * 0.02)
+
+def _retry_after_seconds(err) -> Optional[float]:
+    response = getattr(err, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+# -------------------
+# Pipeline helpers
+# -------------------
+_DONE = object()  # end-of-stream marker passed between stages
+
+@dataclass
+class StageStats:
+    name: str
+    workers: int
+    items: int = 0
+    rows: int = 0
+    busy: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, rows: int, seconds: float):
+        with self.lock:
+            self.items += 1
+            self.rows += rows
+            self.busy += seconds
+
+    def report(self, wall: float) -> str:
+        wall = max(wall, 1e-6)
+        util = self.busy / (wall * self.workers) * 100
+        return (f"  {self.name:<8} workers={self.workers} windows={self.items} rows={self.rows} "
+                f"busy={self.busy:.1f}s util={util:.0f}% throughput={self.rows / max(self.busy, 1e-6) * self.workers:.1f} rows/s")
+
+@dataclass
+class WindowWork:
+    """One window of CSV rows as it moves through the pipeline."""
+    seq: int
+    next_row: Optional[int]           # checkpoint position once this window is written (None in retry mode)
+    rows: pd.DataFrame
+    metas: List[tuple] = field(default_factory=list)
+    chunks: List[Tuple[int, int, int, str]] = field(default_factory=list)
+    chunk_tokens: List[int] = field(default_factory=list)
+    hashes: Dict[int, str] = field(default_factory=dict)
+    doc_rows: Dict[int, int] = field(default_factory=dict)
+    failures: Dict[str, dict] = field(default_factory=dict)
+    skipped_rows: List[int] = field(default_factory=list)
+    embeddings: List[Optional[List[float]]] = field(default_factory=list)
+
+class Pipeline:
+    """
+    Bounded-queue stages run by worker threads. Every get/put polls a stop event so
+    an error or Ctrl+C anywhere shuts the whole pipeline down instead of deadlocking.
+    """
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.stop = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.threads: List[threading.Thread] = []
+
+    def queue(self) -> "queue.Queue":
+        return queue.Queue(maxsize=self.queue_size)
+
+    def put(self, q: "queue.Queue", item) -> bool:
+        while not self.stop.is_set():
+            try:
+                q.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(self, q: "queue.Queue"):
+        while not self.stop.is_set():
+            try:
+                return q.get(timeout=0.2)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def fail(self, exc: BaseException):
+        if self.error is None:
+            self.error = exc
+        self.stop.set()
+
+    def stage(self, stats: StageStats, fn: Callable[[WindowWork], WindowWork],
+              inbox: "queue.Queue", outbox: "queue.Queue"):
+        """Start stats.workers threads mapping fn over inbox; the last worker to finish forwards _DONE."""
+        remaining = [stats.workers]
+        lock = threading.Lock()
+
+        def _worker():
+            try:
+                while True:
+                    item = self.get(inbox)
+                    if item is _DONE:
+                        self.put(inbox, _DONE)  # let sibling workers see the end too
+                        break
+                    start = time.perf_counter()
+                    out = fn(item)
+                    stats.add(len(item.rows), time.perf_counter() - start)
+                    if not self.put(outbox, out):
+                        break
+            except BaseException as e:
+                self.fail(e)
+            finally:
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    self.put(outbox, _DONE)
+
+        for n in range(stats.workers):
+            t = threading.Thread(target=_worker, name=f"{stats.name}-{n}", daemon=True)
+            t.start()
+            self.threads.append(t)
+
+    def join(self):
+        for t in self.threads:
+            t.join()
+
 # -------------------
 # Main class
 # -------------------
 class PairEmbedder:
-    def __init__(self, csv_path: str):
+    def __init__(self, csv_path: str, checkpoint_path: Optional[str] = None, bulk: bool = False):
         self.csv_path = csv_path
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        self.bulk = bulk
+        self.checkpoint_path = Path(checkpoint_path or f"{csv_path}.checkpoint.json")
+        self.checkpoint: Dict = {}
+        self.existing: Dict[int, Optional[Tuple[str, int]]] = {}
+        # target tables (pointed at the shadow copies during --reindex)
+        self.meta_table = f"{SCHEMA}.meta_df"
+        self.vector_table = f"{SCHEMA}.vector"
+        # retries are handled here (with the shared limiter), not inside the SDK
+        self.client = OpenAI(api_key=OPENAI_API_KEY, max_retries=0)
+        self.limiter = AdaptiveTokenBucket(EMBED_TPM_LIMIT, EMBED_RPM_LIMIT)
+        self.embed_pool = ThreadPoolExecutor(max_workers=EMBED_CONCURRENCY, thread_name_prefix="embed-request")
         self.conn = None
         self.cur = None
         self.encoding = tiktoken.get_encoding("cl100k_base")
@@ -117,6 +364,62 @@ class PairEmbedder:
             self.conn.close()
             print("✓ Database connection closed")
 
+    def ensure_schema(self):
+        # older databases were created without the content_hash column
+        self.cur.execute(f"ALTER TABLE {self.vector_table} ADD COLUMN IF NOT EXISTS content_hash TEXT")
+        self.conn.commit()
+
+    def load_existing(self) -> Dict[int, Optional[Tuple[str, int]]]:
+        """doc_id -> (content_hash, chunk count) already stored for EMBED_MODEL (None if mixed hashes)."""
+        self.cur.execute(
+            f"""
+            SELECT doc_id, content_hash, COUNT(*)
+            FROM {self.vector_table}
+            WHERE emb_model = %s
+            GROUP BY doc_id, content_hash
+            """,
+            (EMBED_MODEL,),
+        )
+        existing: Dict[int, Optional[Tuple[str, int]]] = {}
+        for doc_id, chash, n in self.cur.fetchall():
+            existing[doc_id] = None if doc_id in existing else (chash, n)
+        return existing
+
+    def delete_vectors(self, doc_ids: List[int]):
+        """Drop previous chunks of re-embedded docs (the chunk count may have changed). Caller commits."""
+        if not doc_ids:
+            return
+        self.cur.execute(f"DELETE FROM {self.vector_table} WHERE doc_id = ANY(%s)", (doc_ids,))
+
+    # --- Checkpoint ---
+    def load_checkpoint(self, restart: bool = False) -> Dict:
+        fresh = {
+            "input": str(self.csv_path),
+            "emb_model": EMBED_MODEL,
+            "chunk_size": CHUNK_SIZE,
+            "chunk_overlap": CHUNK_OVERLAP,
+            "next_row": 0,
+            "done": 0,
+            "skipped": 0,
+            "failed": {},   # row index -> {"doc_id", "error"}
+        }
+        if restart or not self.checkpoint_path.exists():
+            return fresh
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            saved = json.load(f)
+        same_run = all(saved.get(k) == fresh[k] for k in ("input", "emb_model", "chunk_size", "chunk_overlap"))
+        if not same_run:
+            print("! Checkpoint was written with different settings; starting over")
+            return fresh
+        return {**fresh, **saved}
+
+    def save_checkpoint(self):
+        self.checkpoint["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        tmp = self.checkpoint_path.with_suffix(self.checkpoint_path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.checkpoint, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.checkpoint_path)  # atomic: never leave a half-written checkpoint
+
     # --- IO ---
     def load_df(self) -> pd.DataFrame:
         df = pd.read_csv(self.csv_path, encoding="utf-8-sig")
@@ -128,12 +431,54 @@ class PairEmbedder:
 
     # --- OpenAI ---
     def embed(self, text: str) -> List[float]:
-        resp = self.client.embeddings.create(
-            model=EMBED_MODEL,
-            input=text,
-            encoding_format="float"
-        )
-        return resp.data[0].embedding
+        return self.embed_batch([text], self.count_tokens(text))[0]
+
+    def embed_batch(self, texts: List[str], n_tokens: int) -> List[List[float]]:
+        """One embeddings.create call for many inputs, retried with backoff on 429/5xx/timeouts."""
+        for attempt in range(EMBED_MAX_RETRIES + 1):
+            self.limiter.acquire(n_tokens)
+            try:
+                resp = self.client.embeddings.create(
+                    model=EMBED_MODEL,
+                    input=texts,
+                    encoding_format="float"
+                )
+            except RateLimitError as e:
+                if attempt == EMBED_MAX_RETRIES:
+                    raise
+                self.limiter.on_rate_limited(_retry_after_seconds(e) or min(60.0, 2 ** attempt + random.random()))
+            except (APIConnectionError, APITimeoutError, InternalServerError):
+                if attempt == EMBED_MAX_RETRIES:
+                    raise
+                time.sleep(min(60.0, 2 ** attempt + random.random()))
+            else:
+                self.limiter.on_success()
+                return [d.embedding for d in sorted(resp.data, key=lambda d: d.index)]
+
+    def embed_many(self, texts: List[str], token_counts: Optional[List[int]] = None) -> List[Optional[List[float]]]:
+        """
+        Embed texts in token-aware batches, EMBED_CONCURRENCY requests at a time
+        (shared across all embed workers). A batch that still fails after retries yields None for its inputs.
+        """
+        if token_counts is None:
+            token_counts = [self.count_tokens(t) for t in texts]
+        token_counts = [min(max(1, n), EMBED_INPUT_MAX_TOKENS) for n in token_counts]
+        batches = token_batches(list(enumerate(token_counts)), EMBED_BATCH_MAX_INPUTS, EMBED_BATCH_MAX_TOKENS)
+        results: List[Optional[List[float]]] = [None] * len(texts)
+
+        def _run(batch: List[int]):
+            return batch, self.embed_batch([texts[i] for i in batch], sum(token_counts[i] for i in batch))
+
+        futures = [self.embed_pool.submit(_run, b) for b in batches]
+        for fut in futures:
+            try:
+                batch, embs = fut.result()
+            except Exception as e:
+                print(f"✗ Embedding batch failed: {e}")
+                continue
+            for i, emb in zip(batch, embs):
+                results[i] = emb
+        return results
 
     def count_tokens(self, text: str) -> int:
         try:
@@ -144,7 +489,7 @@ class PairEmbedder:
     # --- Inserts ---
     def upsert_meta_df(self, rows: List[tuple]):
         sql = f"""
-        INSERT INTO {SCHEMA}.meta_df (
+        INSERT INTO {self.meta_table} (
             doc_id, occupation, gender, age_range, experience,
             answer_intent_category, answer_emotion_expression, answer_emotion_category,
             question_intent, question_text, answer_text, content_combined,
@@ -171,16 +516,16 @@ class PairEmbedder:
             tokens_combined = EXCLUDED.tokens_combined
         """
         execute_batch(self.cur, sql, rows, page_size=100)
-        self.conn.commit()
 
     def insert_vector_rows(self, rows: List[tuple]):
         """
-        rows: (chunk_id, doc_id, chunk_seq, start_char, end_char, emb_model, emb_dim, embedding_literal)
+        rows: (chunk_id, doc_id, chunk_seq, start_char, end_char, emb_model, emb_dim, content_hash, embedding)
         """
+        rows = [r[:-1] + (to_pgvector_literal(r[-1]),) for r in rows]
         sql = f"""
-        INSERT INTO {SCHEMA}.vector
-        (chunk_id, doc_id, chunk_seq, start_char, end_char, emb_model, emb_dim, embedding)
-        VALUES (%s,%s,%s,%s,%s,%s,%s, %s)
+        INSERT INTO {self.vector_table}
+        (chunk_id, doc_id, chunk_seq, start_char, end_char, emb_model, emb_dim, content_hash, embedding)
+        VALUES (%s,%s,%s,%s,%s,%s,%s,%s, %s)
         ON CONFLICT (chunk_id) DO UPDATE SET
             doc_id = EXCLUDED.doc_id,
             chunk_seq = EXCLUDED.chunk_seq,
@@ -188,6 +533,7 @@ class PairEmbedder:
             end_char = EXCLUDED.end_char,
             emb_model = EXCLUDED.emb_model,
             emb_dim = EXCLUDED.emb_dim,
+            content_hash = EXCLUDED.content_hash,
             embedding = EXCLUDED.embedding
         """
         # IMPORTANT: tell psycopg2 that last param is typed as vector using explicit cast
@@ -195,100 +541,334 @@ class PairEmbedder:
         # Since execute_batch paramizes, we pass the vector literal as text and rely on cast in SQL.
         # So we slightly modify SQL to add ::vector
         sql = sql.replace("EXCLUDED.embedding", "EXCLUDED.embedding").replace(
-            "VALUES (%s,%s,%s,%s,%s,%s,%s, %s)",
-            "VALUES (%s,%s,%s,%s,%s,%s,%s, %s::vector)"
+            "VALUES (%s,%s,%s,%s,%s,%s,%s,%s, %s)",
+            "VALUES (%s,%s,%s,%s,%s,%s,%s,%s, %s::vector)"
         )
         execute_batch(self.cur, sql, rows, page_size=50)
-        self.conn.commit()
+
+    def bulk_write(self, meta_rows: List[tuple], vec_rows: List[tuple]):
+        """
+        Binary COPY into unlogged staging tables, then one INSERT ... ON CONFLICT per table.
+        Vectors go over the wire as float4 instead of ~30 KB text literals.
+        """
+        staged_upsert(self.conn, self.meta_table, META_COLUMNS, meta_rows, META_TYPES, ["doc_id"], commit=False)
+        staged_upsert(self.conn, self.vector_table, VECTOR_COLUMNS, vec_rows, VECTOR_TYPES, ["chunk_id"], commit=False)
+
+    def write_rows(self, meta_rows: List[tuple], vec_rows: List[tuple]):
+        """meta_df first, then vector (FK). Caller commits."""
+        if self.bulk:
+            self.bulk_write(meta_rows, vec_rows)
+            return
+        for start in range(0, len(meta_rows), BATCH_SIZE):
+            self.upsert_meta_df(meta_rows[start:start + BATCH_SIZE])
+        for start in range(0, len(vec_rows), BATCH_SIZE):
+            self.insert_vector_rows(vec_rows[start:start + BATCH_SIZE])
 
     # --- Process ---
-    def run(self):
+    def prepare_row(self, i: int, row) -> Tuple[tuple, List[Tuple[int, int, int, str]]]:
+        """Build the meta_df row and the (doc_id, seq, start, end, text) chunks for one CSV row."""
+        # doc_id = sample_id (fallback i+1)
+        sample_id = row.get("sample_id")
+        doc_id = int(sample_id) if pd.notna(sample_id) else (i + 1)
+
+        q = str(row.get("question", ""))
+        a = str(row.get("answer", ""))
+        occupation = str(row.get("occupation", "") or "")
+        gender = str(row.get("gender", "") or "")
+        age_range = str(row.get("ageRange", "") or row.get("age_range", "") or "")
+        experience = str(row.get("experience", "") or "")
+        ans_intent = str(row.get("answer-intent_category", "") or row.get("answer_intent_category", "") or "")
+        ans_em_exp = str(row.get("answer-emotion_expression", "") or "")
+        ans_em_cat = str(row.get("answer-emotion_category", "") or "")
+        q_intent   = str(row.get("question_intent", "") or "")
+
+        combined = make_combined(q, a)
+        tok_ans = self.count_tokens(a)
+        tok_comb = self.count_tokens(combined)
+
+        meta = (
+            doc_id, occupation, gender, age_range, experience,
+            ans_intent, ans_em_exp, ans_em_cat,
+            q_intent, q, a, combined,
+            tok_ans, tok_comb
+        )
+        chunks = [
+            (doc_id, seq, s, e, ch_text)
+            for seq, (s, e, ch_text) in enumerate(char_chunks(combined, CHUNK_SIZE, CHUNK_OVERLAP), start=1)
+        ]
+        return meta, chunks
+
+    # Stage 1: normalize + tokenize + chunk (skips docs that are already embedded)
+    def prepare_window(self, work: WindowWork) -> WindowWork:
+        for i, row in work.rows.iterrows():
+            try:
+                meta, row_chunks = self.prepare_row(i, row)
+            except Exception as e:
+                work.failures[str(i)] = {"doc_id": None, "error": f"prepare: {e}"}
+                print(f"✗ Row {i} (doc_id={row.get('sample_id')}): {e}")
+                continue
+            doc_id, chash = meta[0], content_hash(meta[11])
+            if self.existing.get(doc_id) == (chash, len(row_chunks)):
+                work.skipped_rows.append(i)
+                continue
+            work.metas.append(meta)
+            work.chunks.extend(row_chunks)
+            work.chunk_tokens.extend(self.count_tokens(c[4]) for c in row_chunks)
+            work.hashes[doc_id] = chash
+            work.doc_rows[doc_id] = i
+        return work
+
+    # Stage 2: batched embedding
+    def embed_window(self, work: WindowWork) -> WindowWork:
+        work.embeddings = self.embed_many([c[4] for c in work.chunks], work.chunk_tokens)
+        return work
+
+    # Stage 3: DB write (single thread) -> meta before vector, then checkpoint bookkeeping
+    def write_window(self, work: WindowWork) -> Tuple[int, int, int]:
+        failed = self.checkpoint["failed"]
+        failed.update(work.failures)
+        for i in work.skipped_rows:
+            failed.pop(str(i), None)
+
+        # a document is written only if every one of its chunks was embedded
+        failed_docs = {c[0] for c, emb in zip(work.chunks, work.embeddings) if emb is None}
+        for doc_id in sorted(failed_docs):
+            failed[str(work.doc_rows[doc_id])] = {"doc_id": doc_id, "error": "embedding failed"}
+            print(f"✗ doc_id={doc_id}: embedding failed")
+
+        meta_rows = [m for m in work.metas if m[0] not in failed_docs]
+        vec_rows = [
+            (to_chunk_id(doc_id, seq), doc_id, seq, s, e, EMBED_MODEL, EMBED_DIM, work.hashes[doc_id], emb)
+            for (doc_id, seq, s, e, _), emb in zip(work.chunks, work.embeddings)
+            if doc_id not in failed_docs
+        ]
+        # one transaction: searches never see a re-embedded doc without its vectors,
+        # and a failed write leaves the previous chunks in place
+        try:
+            self.delete_vectors([m[0] for m in meta_rows if m[0] in self.existing])
+            self.write_rows(meta_rows, vec_rows)
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+        n_chunks: Dict[int, int] = {}
+        for r in vec_rows:
+            n_chunks[r[1]] = n_chunks.get(r[1], 0) + 1
+        for m in meta_rows:
+            failed.pop(str(work.doc_rows[m[0]]), None)
+            self.existing[m[0]] = (work.hashes[m[0]], n_chunks.get(m[0], 0))
+        return len(meta_rows), len(work.skipped_rows), len(failed_docs)
+
+    def run(self, restart: bool = False, retry_failed: bool = False, rebuild_index: bool = False,
+            invalidate: bool = True) -> bool:
+        """Returns False if the run was interrupted before all windows were written."""
         df = self.load_df()
         total = len(df)
         print(f"✓ Loaded {total} rows")
 
-        meta_buf, vec_buf = [], []
-        done, errors = 0, 0
-
-        for i, row in df.iterrows():
+        self.ensure_schema()
+        self.existing = self.load_existing()
+        self.checkpoint = self.load_checkpoint(restart)
+        print(f"✓ {len(self.existing)} docs already embedded with {EMBED_MODEL}")
+
+        if retry_failed:
+            rows = sorted(int(r) for r in self.checkpoint["failed"])
+            targets = df.loc[[r for r in rows if r in df.index]]
+            windows = [(None, targets.iloc[s:s + ROW_WINDOW]) for s in range(0, len(targets), ROW_WINDOW)]
+            print(f"✓ Retrying {len(targets)} failed rows")
+        else:
+            start_row = self.checkpoint["next_row"]
+            if start_row:
+                print(f"✓ Resuming from row {start_row} (checkpoint: {self.checkpoint_path})")
+            else:
+                # new scan (no checkpoint, or the previous scan completed): per-scan counters start over
+                self.checkpoint.update(done=0, skipped=0)
+            windows = [
+                (min(s + ROW_WINDOW, total), df.iloc[s:s + ROW_WINDOW])
+                for s in range(start_row, total, ROW_WINDOW)
+            ]
+
+        # large loads: drop the ANN index and build it once at the end instead of per row
+        dropped_indexes = drop_vector_indexes(self.conn, self.vector_table) if rebuild_index else []
+        for indexdef in dropped_indexes:
+            print(f"✓ Dropped for rebuild: {indexdef}")
+
+        # read -> [prepare x N] -> [embed x M] -> writer (this thread)
+        pipe = Pipeline(QUEUE_SIZE)
+        source_q, prepared_q, embedded_q = pipe.queue(), pipe.queue(), pipe.queue()
+        stats = {
+            "prepare": StageStats("prepare", PREPARE_WORKERS),
+            "embed": StageStats("embed", EMBED_WORKERS),
+            "write": StageStats("write", 1),
+        }
+
+        def _feed():
             try:
-                # doc_id = sample_id (fallback i+1)
-                sample_id = row.get("sample_id")
-                doc_id = int(sample_id) if pd.notna(sample_id) else (i + 1)
-
-                q = str(row.get("question", ""))
-                a = str(row.get("answer", ""))
-                occupation = str(row.get("occupation", "") or "")
-                gender = str(row.get("gender", "") or "")
-                age_range = str(row.get("ageRange", "") or row.get("age_range", "") or "")
-                experience = str(row.get("experience", "") or "")
-                ans_intent = str(row.get("answer-intent_category", "") or row.get("answer_intent_category", "") or "")
-                ans_em_exp = str(row.get("answer-emotion_expression", "") or "")
-                ans_em_cat = str(row.get("answer-emotion_category", "") or "")
-                q_intent   = str(row.get("question_intent", "") or "")
-
-                combined = make_combined(q, a)
-                tok_ans = self.count_tokens(a)
-                tok_comb = self.count_tokens(combined)
-
-                meta_buf.append((
-                    doc_id, occupation, gender, age_range, experience,
-                    ans_intent, ans_em_exp, ans_em_cat,
-                    q_intent, q, a, combined,
-                    tok_ans, tok_comb
-                ))
-
-                # chunk + embed
-                chunks = char_chunks(combined, CHUNK_SIZE, CHUNK_OVERLAP)
-                for seq, (s, e, ch_text) in enumerate(chunks, start=1):
-                    emb = self.embed(ch_text)
-                    chunk_id = to_chunk_id(doc_id, seq)
-                    vec_buf.append((
-                        chunk_id, doc_id, seq, s, e, EMBED_MODEL, EMBED_DIM,
-                        to_pgvector_literal(emb)  # casted to vector in SQL
-                    ))
-                    time.sleep(RATE_LIMIT_DELAY)
-
-                done += 1
-
-                # Flush meta first if either buffer is full (to respect FK constraint)
-                if len(meta_buf) >= BATCH_SIZE or len(vec_buf) >= BATCH_SIZE:
-                    if meta_buf:
-                        self.upsert_meta_df(meta_buf)
-                        meta_buf = []
-                    if vec_buf:
-                        self.insert_vector_rows(vec_buf)
-                        vec_buf = []
-
-            except KeyboardInterrupt:
-                print("\n! Interrupted by user")
-                break
-            except Exception as e:
-                errors += 1
-                print(f"✗ Row {i} (doc_id={row.get('sample_id')}): {e}")
-
-        # flush
-        if meta_buf: self.upsert_meta_df(meta_buf)
-        if vec_buf:  self.insert_vector_rows(vec_buf)
-
-        print(f"\n✅ Done. processed={done}, errors={errors}")
+                for seq, (next_row, rows) in enumerate(windows):
+                    if not pipe.put(source_q, WindowWork(seq=seq, next_row=next_row, rows=rows)):
+                        return
+                pipe.put(source_q, _DONE)
+            except BaseException as e:
+                pipe.fail(e)
+
+        feeder = threading.Thread(target=_feed, name="read", daemon=True)
+        feeder.start()
+        pipe.threads.append(feeder)
+        pipe.stage(stats["prepare"], self.prepare_window, source_q, prepared_q)
+        pipe.stage(stats["embed"], self.embed_window, prepared_q, embedded_q)
+
+        written = 0
+        interrupted = False
+        finished: Dict[int, Optional[int]] = {}  # windows finish out of order; checkpoint only the contiguous prefix
+        next_seq = 0
+        started = time.time()
+        try:
+            while True:
+                work = pipe.get(embedded_q)
+                if work is _DONE:
+                    break
+                t0 = time.perf_counter()
+                ok, skipped, _ = self.write_window(work)
+                written += ok
+                self.checkpoint["done"] += ok
+                self.checkpoint["skipped"] += skipped
+                finished[work.seq] = work.next_row
+                while next_seq in finished:
+                    next_row = finished.pop(next_seq)
+                    if next_row is not None:
+                        self.checkpoint["next_row"] = next_row
+                    next_seq += 1
+                self.save_checkpoint()
+                stats["write"].add(len(work.rows), time.perf_counter() - t0)
+                elapsed = max(time.time() - started, 1e-6)
+                print(f"  window {work.seq + 1}/{len(windows)} (embedded={ok}, skipped={skipped}, {written / elapsed:.1f} rows/s)")
+        except KeyboardInterrupt:
+            print("\n! Interrupted by user (progress saved, rerun to resume)")
+            pipe.stop.set()
+            self.save_checkpoint()
+            interrupted = True
+        finally:
+            pipe.stop.set()
+            self.embed_pool.shutdown(wait=False, cancel_futures=True)
+            pipe.join()
+            if dropped_indexes:
+                print("… Rebuilding vector index")
+                restore_indexes(self.conn, dropped_indexes, maintenance_work_mem=INDEX_MAINTENANCE_WORK_MEM,
+                                parallel_workers=INDEX_PARALLEL_WORKERS)
+                print("✓ Vector index rebuilt")
+        if pipe.error is not None:
+            raise pipe.error
+        if not interrupted and not retry_failed:
+            # every window was written: the next run rescans from row 0 and the
+            # content-hash check skips the docs that did not change
+            self.checkpoint["next_row"] = 0
+            self.save_checkpoint()
+
+        wall = time.time() - started
+        print("\nStage stats:")
+        for st in stats.values():
+            print(st.report(wall))
+
+        # 재적재된 면접 데이터 기반의 의미 캐시 답변 제거
+        if written and invalidate:
+            self.invalidate_answers()
+
+        n_failed = len(self.checkpoint["failed"])
+        print(f"\n✅ Done. embedded={written}, skipped={self.checkpoint['skipped']}, failed={n_failed}")
+        if n_failed:
+            print(f"  rerun with --retry-failed to embed only the failed rows ({self.checkpoint_path})")
+        return not interrupted
+
+    def invalidate_answers(self):
+        invalidated = invalidate_cache(self.conn, domain="interview")
+        if invalidated:
+            print(f"✓ Invalidated {invalidated} cached interview answers")
+
+    def reindex(self, keep_old: bool = False, **run_kwargs):
+        """Load into shadow copies of meta_df/vector, build the ANN index once, then swap them in.
+
+        Search keeps reading the live tables until the swap, which is a single
+        rename transaction. The shadows start as a copy of the live data, so only
+        new or changed pairs are embedded. Progress goes to a separate
+        <checkpoint>.reindex.json so the live load's checkpoint is left alone.
+        """
+        if run_kwargs.get("retry_failed"):
+            # a shadow run always scans from row 0; the failed map belongs to the live checkpoint
+            raise ValueError("retry_failed cannot be combined with reindex")
+        self.ensure_schema()  # the shadows inherit the live column set
+        live = (self.meta_table, self.vector_table)
+        live_checkpoint = self.checkpoint_path
+        shadow = ShadowTables(self.conn, list(live))
+        shadows = shadow.create(copy_data=True)
+        self.meta_table, self.vector_table = shadows[live[0]], shadows[live[1]]
+        self.checkpoint_path = live_checkpoint.with_suffix(".reindex.json")
+        print(f"✓ Loading into {self.meta_table} / {self.vector_table} (ANN index dropped: {len(shadow.ann_indexes)})")
+        try:
+            # progress lives in the shadow, so a resumed checkpoint would point past rows it does not have
+            run_kwargs.update(restart=True, rebuild_index=False, invalidate=False)
+            if not self.run(**run_kwargs):
+                shadow.discard()
+                print("✗ Reindex aborted, live tables untouched")
+                return
+            print("… Building vector index / ANALYZE on shadow tables")
+            shadow.build_indexes(maintenance_work_mem=INDEX_MAINTENANCE_WORK_MEM,
+                                 parallel_workers=INDEX_PARALLEL_WORKERS)
+            shadow.swap(keep_old=keep_old)
+            print(f"✓ Swapped in new {live[0]} / {live[1]}" + (" (previous kept as *__old)" if keep_old else ""))
+        except BaseException:
+            shadow.discard()
+            raise
+        finally:
+            self.meta_table, self.vector_table = live
+            self.checkpoint_path = live_checkpoint
+        self.invalidate_answers()
 
 # -------------------
 # CLI
 # -------------------
 def main():
     global SCHEMA, CHUNK_SIZE, CHUNK_OVERLAP
+    global EMBED_CONCURRENCY, EMBED_BATCH_MAX_INPUTS, EMBED_BATCH_MAX_TOKENS, EMBED_TPM_LIMIT, EMBED_RPM_LIMIT
+    global PREPARE_WORKERS, EMBED_WORKERS, ROW_WINDOW, QUEUE_SIZE
     
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", required=True, help="Path to CSV")
     ap.add_argument("--schema", default=SCHEMA, help="DB schema (default: interview)")
     ap.add_argument("--chunk", type=int, default=CHUNK_SIZE, help="chunk char length (default 300)")
     ap.add_argument("--overlap", type=int, default=CHUNK_OVERLAP, help="overlap char length (default 100)")
+    ap.add_argument("--concurrency", type=int, default=EMBED_CONCURRENCY, help="embedding requests in flight (default 4)")
+    ap.add_argument("--batch-inputs", type=int, default=EMBED_BATCH_MAX_INPUTS, help="max chunks per embedding request (default 256)")
+    ap.add_argument("--batch-tokens", type=int, default=EMBED_BATCH_MAX_TOKENS, help="max tokens per embedding request (default 100000)")
+    ap.add_argument("--tpm", type=int, default=EMBED_TPM_LIMIT, help="tokens-per-minute limit for the embedding model")
+    ap.add_argument("--rpm", type=int, default=EMBED_RPM_LIMIT, help="requests-per-minute limit for the embedding model")
+    ap.add_argument("--checkpoint", default=None, help="progress file (default: <input>.checkpoint.json)")
+    ap.add_argument("--restart", action="store_true", help="ignore an unfinished checkpoint and scan from row 0 (already embedded docs are still skipped)")
+    ap.add_argument("--retry-failed", action="store_true", help="only process rows recorded as failed in the checkpoint")
+    ap.add_argument("--prepare-workers", type=int, default=PREPARE_WORKERS, help="threads for normalize/tokenize/chunk (default 2)")
+    ap.add_argument("--embed-workers", type=int, default=EMBED_WORKERS, help="windows being embedded at once (default 2)")
+    ap.add_argument("--window", type=int, default=ROW_WINDOW, help="rows per pipeline work item (default 500)")
+    ap.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help="windows buffered between stages (default 4)")
+    ap.add_argument("--bulk", action="store_true", help="write with binary COPY into unlogged staging tables + one merge per window")
+    ap.add_argument("--rebuild-index", action="store_true", help="drop ivfflat/hnsw indexes on the vector table during the load and rebuild them at the end")
+    ap.add_argument("--reindex", action="store_true", help="load into shadow tables, build the index, then swap them in atomically (no downtime)")
+    ap.add_argument("--keep-old", action="store_true", help="with --reindex, keep the previous tables as <table>__old for rollback")
     args = ap.parse_args()
+    if args.reindex and args.retry_failed:
+        ap.error("--retry-failed cannot be combined with --reindex (a reindex rescans every row into fresh shadow tables)")
 
     SCHEMA = args.schema
     CHUNK_SIZE = args.chunk
     CHUNK_OVERLAP = args.overlap
+    EMBED_CONCURRENCY = args.concurrency
+    EMBED_BATCH_MAX_INPUTS = min(args.batch_inputs, 2048)
+    EMBED_BATCH_MAX_TOKENS = min(args.batch_tokens, 300000)
+    EMBED_TPM_LIMIT = args.tpm
+    EMBED_RPM_LIMIT = args.rpm
+    PREPARE_WORKERS = max(1, args.prepare_workers)
+    EMBED_WORKERS = max(1, args.embed_workers)
+    ROW_WINDOW = max(1, args.window)
+    QUEUE_SIZE = max(1, args.queue_size)
 
     if not OPENAI_API_KEY:
         print("✗ OPENAI_API_KEY missing")
@@ -297,10 +877,13 @@ def main():
     # Debug: print DB config (without password)
     print(f"DB Config: host={DB_CONFIG['host']}, port={DB_CONFIG['port']}, database={DB_CONFIG['database']}, user={DB_CONFIG['user']}")
     
-    runner = PairEmbedder(args.input)
+    runner = PairEmbedder(args.input, checkpoint_path=args.checkpoint, bulk=args.bulk)
     try:
         runner.connect_db()
-        runner.run()
+        if args.reindex:
+            runner.reindex(keep_old=args.keep_old)
+        else:
+            runner.run(restart=args.restart, retry_failed=args.retry_failed, rebuild_index=args.rebuild_index)
     finally:
         runner.close_db()
 
@@ -0,0 +1,303 @@
+# 임베딩 아티팩트 덤프/복원
+# 새 환경(docker-compose)을 띄울 때 임베딩 API를 다시 호출하지 않고 벡터 테이블을 채운다.
+#
+#   python embedding_artifacts.py export --out artifacts/ [--group college interview] [--dtype float16]
+#   python embedding_artifacts.py import --src artifacts/ [--group college] [--keep-old]
+#
+# 아티팩트 구조 (테이블마다)
+#   <table>.parquet         : 임베딩을 뺀 컬럼 (zstd 압축, 명시적 스키마)
+#   <table>.embeddings.npy  : (행 수, 차원) float32 또는 float16(halfvec 정밀도) 행렬, parquet와 같은 행 순서
+#   manifest.json           : 컬럼/타입, 행 수, 차원, dtype, 파일 sha256
+#
+# export는 바이너리 COPY TO로 한 스냅샷(REPEATABLE READ)을 읽고 임베딩은 np.memmap에 바로 쓴다 (메모리 일정).
+# import는 shadow 테이블에 바이너리 COPY로 적재 -> ANN 인덱스 빌드/ANALYZE -> 운영 테이블과 원자적 교체.
+import argparse
+import hashlib
+import json
+import os
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import psycopg2
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dotenv import load_dotenv
+
+from pg_copy import copy_binary, copy_binary_out
+from SemanticCache import invalidate_cache
+from shadow_table import ShadowTables
+from utils import make_conn_str
+
+FORMAT_VERSION = 1
+BATCH_ROWS = 20_000
+INDEX_MAINTENANCE_WORK_MEM = os.getenv("INDEX_MAINTENANCE_WORK_MEM", "1GB")
+INDEX_PARALLEL_WORKERS = int(os.getenv("INDEX_PARALLEL_WORKERS", "4"))
+
+_ARROW_TYPES = {
+    "int2": pa.int16(),
+    "int4": pa.int32(),
+    "int8": pa.int64(),
+    "float4": pa.float32(),
+    "float8": pa.float64(),
+    "text": pa.string(),
+    "jsonb": pa.string(),
+}
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """덤프할 컬럼 (embedding은 마지막, id/created_at 같은 기본값 컬럼은 제외)"""
+
+    table: str
+    columns: Sequence[str]
+    types: Sequence[str]
+    embedding: Optional[str] = "embedding"
+
+
+# FK 부모 -> 자식 순서
+GROUPS: Dict[str, List[TableSpec]] = {
+    "college": [
+        TableSpec(
+            "college.college_vector_db",
+            ["major_seq", "major", "salary", "employment", "job", "qualifications", "universities",
+             "metadata", "chunk_index", "content_hash"],
+            ["text"] * 7 + ["jsonb", "int4", "text"],
+        ),
+    ],
+    "interview": [
+        TableSpec(
+            "interview.meta_df",
+            ["doc_id", "occupation", "gender", "age_range", "experience",
+             "answer_intent_category", "answer_emotion_expression", "answer_emotion_category",
+             "question_intent", "question_text", "answer_text", "content_combined",
+             "tokens_answer", "tokens_combined"],
+            ["int4"] + ["text"] * 11 + ["int4", "int4"],
+            embedding=None,
+        ),
+        TableSpec(
+            "interview.vector",
+            ["chunk_id", "doc_id", "chunk_seq", "start_char", "end_char", "emb_model", "emb_dim", "content_hash"],
+            ["text", "int4", "int2", "int4", "int4", "text", "int4", "text"],
+        ),
+    ],
+}
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _schema(spec: TableSpec) -> pa.Schema:
+    return pa.schema([(c, _ARROW_TYPES[t]) for c, t in zip(spec.columns, spec.types)])
+
+
+# --- export ---
+def export_table(conn, spec: TableSpec, out_dir: Path, dtype: str) -> dict:
+    parquet_path = out_dir / f"{spec.table}.parquet"
+    npy_path = out_dir / f"{spec.table}.embeddings.npy"
+    columns = list(spec.columns)
+    types = list(spec.types)
+    # 행 순서를 고정해야 parquet 행과 임베딩 행이 맞는다
+    order = ", ".join(columns[:1] + (["chunk_index"] if "chunk_index" in columns else []))
+
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT count(*) FROM {spec.table}")
+        n_rows = cur.fetchone()[0]
+        dim = 0
+        if spec.embedding:
+            cur.execute(f"SELECT vector_dims({spec.embedding}) FROM {spec.table} LIMIT 1")
+            found = cur.fetchone()
+            dim = found[0] if found else 0
+            columns.append(spec.embedding)
+            types.append("vector")
+
+        matrix = None
+        if spec.embedding:
+            matrix = np.lib.format.open_memmap(npy_path, mode="w+", dtype=dtype, shape=(n_rows, dim))
+        # vector는 numpy로 바로 디코딩 (파이썬 float 리스트를 거치지 않음)
+        decoders = {"vector": lambda b: np.frombuffer(b, dtype=">f4", offset=4)}
+        query = f"SELECT {', '.join(columns)} FROM {spec.table} ORDER BY {order}"
+
+        schema = _schema(spec)
+        written = 0
+        with pq.ParquetWriter(parquet_path, schema, compression="zstd") as writer:
+            batch: List[list] = []
+
+            def _flush():
+                if not batch:
+                    return
+                cols = list(zip(*batch))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(cols[i], type=schema.field(i).type) for i in range(len(spec.columns))],
+                    schema=schema,
+                ))
+                batch.clear()
+
+            for row in copy_binary_out(cur, query, types, decoders=decoders):
+                if matrix is not None:
+                    matrix[written] = row.pop()
+                batch.append(row)
+                written += 1
+                if len(batch) >= BATCH_ROWS:
+                    _flush()
+            _flush()
+
+    if written != n_rows:
+        raise RuntimeError(f"{spec.table}: expected {n_rows} rows, exported {written}")
+    entry = {
+        "rows": n_rows,
+        "columns": list(spec.columns),
+        "types": list(spec.types),
+        "parquet": parquet_path.name,
+        "sha256": {parquet_path.name: _sha256(parquet_path)},
+    }
+    if matrix is not None:
+        matrix.flush()
+        del matrix
+        entry.update(embedding=spec.embedding, dim=dim, dtype=dtype, embeddings=npy_path.name)
+        entry["sha256"][npy_path.name] = _sha256(npy_path)
+    return entry
+
+
+def export_groups(conn_str: str, groups: Sequence[str], out_dir: Path, dtype: str) -> dict:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {"format": FORMAT_VERSION, "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "tables": {}}
+    conn = psycopg2.connect(conn_str)
+    try:
+        # 그룹 안의 테이블(meta_df/vector)이 같은 스냅샷에서 읽히도록
+        conn.set_session(isolation_level="REPEATABLE READ", readonly=True)
+        for group in groups:
+            for spec in GROUPS[group]:
+                t0 = time.perf_counter()
+                entry = export_table(conn, spec, out_dir, dtype)
+                entry["group"] = group
+                manifest["tables"][spec.table] = entry
+                print(f"✓ {spec.table}: {entry['rows']} rows ({time.perf_counter() - t0:.1f}s)")
+        conn.rollback()
+    finally:
+        conn.close()
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    return manifest
+
+
+# --- import ---
+def _iter_artifact_rows(src_dir: Path, entry: dict) -> Iterator[list]:
+    parquet = pq.ParquetFile(src_dir / entry["parquet"])
+    matrix = np.load(src_dir / entry["embeddings"], mmap_mode="r") if entry.get("embeddings") else None
+    offset = 0
+    for batch in parquet.iter_batches(batch_size=BATCH_ROWS, columns=entry["columns"]):
+        cols = [batch.column(i).to_pylist() for i in range(batch.num_columns)]
+        if matrix is not None:
+            # float16으로 저장했어도 encoder가 vector(float4)로 변환한다
+            cols.append(matrix[offset:offset + batch.num_rows])
+        offset += batch.num_rows
+        yield from zip(*cols)
+
+
+def verify_artifacts(src_dir: Path, manifest: dict, tables: Sequence[str]) -> None:
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"unsupported artifact format: {manifest.get('format')}")
+    for table in tables:
+        for name, expected in manifest["tables"][table]["sha256"].items():
+            if _sha256(src_dir / name) != expected:
+                raise ValueError(f"checksum mismatch: {name}")
+
+
+def import_group(conn, src_dir: Path, manifest: dict, group: str, keep_old: bool = False) -> Dict[str, int]:
+    specs = [spec for spec in GROUPS[group] if spec.table in manifest["tables"]]
+    if not specs:
+        return {}
+    shadow = ShadowTables(conn, [spec.table for spec in specs])
+    shadow.create(copy_data=False)
+    loaded: Dict[str, int] = {}
+    try:
+        with conn.cursor() as cur:
+            for spec in specs:
+                entry = manifest["tables"][spec.table]
+                columns, types = list(entry["columns"]), list(entry["types"])
+                if entry.get("embeddings"):
+                    columns.append(entry["embedding"])
+                    types.append("vector")
+                copy_binary(cur, shadow.shadow(spec.table), columns, _iter_artifact_rows(src_dir, entry), types)
+                cur.execute(f"SELECT count(*) FROM {shadow.shadow(spec.table)}")
+                loaded[spec.table] = cur.fetchone()[0]
+                if loaded[spec.table] != entry["rows"]:
+                    raise RuntimeError(f"{spec.table}: expected {entry['rows']} rows, loaded {loaded[spec.table]}")
+        conn.commit()
+        shadow.build_indexes(maintenance_work_mem=INDEX_MAINTENANCE_WORK_MEM,
+                             parallel_workers=INDEX_PARALLEL_WORKERS)
+        shadow.swap(keep_old=keep_old)
+    except BaseException:
+        conn.rollback()
+        shadow.discard()
+        raise
+    invalidate_cache(conn, domain=group)
+    return loaded
+
+
+def import_groups(conn_str: str, src_dir: Path, groups: Sequence[str], keep_old: bool = False,
+                  verify: bool = True) -> Dict[str, int]:
+    manifest = json.loads((src_dir / "manifest.json").read_text(encoding="utf-8"))
+    tables = [spec.table for g in groups for spec in GROUPS[g] if spec.table in manifest["tables"]]
+    if verify:
+        verify_artifacts(src_dir, manifest, tables)
+    loaded: Dict[str, int] = {}
+    with closing(psycopg2.connect(conn_str)) as conn:
+        for group in groups:
+            t0 = time.perf_counter()
+            result = import_group(conn, src_dir, manifest, group, keep_old=keep_old)
+            for table, rows in result.items():
+                print(f"✓ {table}: {rows} rows")
+            if result:
+                print(f"  {group} swapped in ({time.perf_counter() - t0:.1f}s)")
+            loaded.update(result)
+    return loaded
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="벡터 테이블을 Parquet/NumPy 아티팩트로 덤프하거나 API 호출 없이 복원합니다."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="DB -> 아티팩트")
+    export.add_argument("--out", required=True, help="아티팩트 디렉터리")
+    export.add_argument("--group", nargs="+", choices=list(GROUPS), default=list(GROUPS))
+    export.add_argument(
+        "--dtype",
+        choices=["float32", "float16"],
+        default="float32",
+        help="임베딩 저장 정밀도 (float16은 halfvec 정밀도, 파일 크기 절반)",
+    )
+
+    restore = sub.add_parser("import", help="아티팩트 -> DB (shadow 적재 후 원자적 교체)")
+    restore.add_argument("--src", required=True, help="아티팩트 디렉터리")
+    restore.add_argument("--group", nargs="+", choices=list(GROUPS), default=list(GROUPS))
+    restore.add_argument("--keep-old", action="store_true", help="이전 테이블을 <table>__old 로 남겨 둠")
+    restore.add_argument("--no-verify", dest="verify", action="store_false", help="sha256 검증 생략")
+    return parser.parse_args()
+
+
+def main():
+    load_dotenv()
+    args = parse_args()
+    started = time.perf_counter()
+    if args.command == "export":
+        manifest = export_groups(make_conn_str(), args.group, Path(args.out), args.dtype)
+        total = sum(t["rows"] for t in manifest["tables"].values())
+    else:
+        loaded = import_groups(make_conn_str(), Path(args.src), args.group, keep_old=args.keep_old, verify=args.verify)
+        total = sum(loaded.values())
+    print(f"✅ {args.command}: {total} rows in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
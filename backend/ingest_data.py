@@ -1,9 +1,15 @@
 import argparse
 import glob
-import math
+import hashlib
+import json
+import os
+from collections import deque
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import psycopg2
 from psycopg2 import sql
@@ -16,10 +22,14 @@ from tqdm import tqdm
 try:
     from CustomLoader import CSVLoader
     from CustomPGvector import CustomPGVector
+    from SemanticCache import invalidate_cache
+    from shadow_table import ShadowTables
     from utils import make_conn_str
 except ModuleNotFoundError:
     from backend.CustomLoader import CSVLoader  # type: ignore
     from backend.CustomPGvector import CustomPGVector  # type: ignore
+    from backend.SemanticCache import invalidate_cache  # type: ignore
+    from backend.shadow_table import ShadowTables  # type: ignore
     from backend.utils import make_conn_str  # type: ignore
 
 from models import get_embedding_model
@@ -35,6 +45,54 @@ class IngestConfig:
     chunk_overlap: int
     batch_size: int
     reset: bool
+    embed_workers: int = 4
+    load_workers: int = 4
+    prune: bool = True
+    reindex: bool = False
+    keep_old: bool = False
+
+
+def _make_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n\n", "\n", ". ", " ", ""],
+    )
+
+
+def _split(documents: Iterable[Document], splitter: RecursiveCharacterTextSplitter) -> Iterator[Document]:
+    """Document를 청크 단위로 나누고 chunk_index를 metadata에 기록한다."""
+    for doc in documents:
+        chunks = splitter.split_text(doc.page_content)
+        for chunk_idx, chunk_text in enumerate(chunks):
+            chunk_clean = chunk_text.strip()
+            if not chunk_clean:
+                continue
+            metadata = dict(doc.metadata)
+            metadata["chunk_index"] = chunk_idx
+            yield Document(page_content=chunk_clean, metadata=metadata)
+
+
+def content_hash(doc: Document) -> str:
+    """청크 내용 + 저장되는 메타데이터의 해시. 행 위치/파일명처럼 내용과 무관한 값은 제외한다."""
+    metadata = {
+        key: value
+        for key, value in doc.metadata.items()
+        if key not in ("row_index", "source", "content_hash")
+    }
+    payload = json.dumps(
+        {"text": doc.page_content, "metadata": metadata},
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _load_and_split(csv_path: str, chunk_size: int, chunk_overlap: int) -> List[Document]:
+    """CSV 파일 하나를 읽어 청크 Document로 나눈다 (파일별로 별도 프로세스에서 실행)."""
+    splitter = _make_splitter(chunk_size, chunk_overlap)
+    return list(_split(CSVLoader(csv_path).lazy_load(), splitter))
 
 
 class CustomVectorIngestor:
@@ -45,36 +103,86 @@ class CustomVectorIngestor:
         self.connection_str = make_conn_str()
         self.embedding_model = None
         self.vectorstore = None
-        self.splitter = None
+        # 실제로 적재할 테이블 (--reindex 면 shadow 테이블)
+        self.target_table = config.table_name
+        # 이미 저장된 청크: (major_seq, chunk_index) -> content_hash
+        self.existing: Dict[Tuple[str, int], Optional[str]] = {}
 
     def run(self) -> dict:
-        """LangChain Runnable 파이프라인으로 전체 적재 과정을 실행한다."""
+        """LangChain Runnable 파이프라인으로 전체 적재 과정을 실행한다.
+
+        청크는 파일 단위로 스트리밍되어 persist 단계로 넘어가므로,
+        앞 파일의 임베딩/저장과 뒤 파일의 로드/분할이 겹쳐서 진행된다.
+        """
         pipeline = (
             RunnableLambda(lambda _: self._prepare_storage())
             | RunnableLambda(lambda _: self._load_documents())
-            | RunnableLambda(self._split_documents)
             | RunnableLambda(self._persist_documents)
         )
-        return pipeline.invoke(None)
+        if self.config.reindex:
+            stats = self._run_reindex(pipeline)
+        else:
+            stats = pipeline.invoke(None)
+        changed = stats["chunks"] or stats["deleted"]
+        stats["cache_invalidated"] = self._invalidate_answer_cache() if changed else 0
+        return stats
+
+    def _run_reindex(self, pipeline) -> dict:
+        """shadow 테이블에 적재 -> ANN 인덱스 빌드/ANALYZE -> 운영 테이블과 원자적으로 교체.
+
+        적재하는 동안 검색은 기존 테이블을 그대로 읽는다. --reset 이 아니면 현재 데이터를
+        shadow로 복사한 뒤 증분 적재하므로 바뀐 청크만 임베딩한다.
+        """
+        live = CustomPGVector(
+            conn_str=self.connection_str,
+            embedding_fn=get_embedding_model(),
+            table=self.config.table_name,
+        )
+        live.ensure_chunk_key()  # shadow가 같은 키 구조를 물려받도록
+
+        with closing(psycopg2.connect(self.connection_str)) as conn:
+            shadow = ShadowTables(conn, [self.config.table_name])
+            self.target_table = shadow.create(copy_data=not self.config.reset)[self.config.table_name]
+            try:
+                stats = pipeline.invoke(None)
+                print(f"🔧 Building vector index / ANALYZE on {self.target_table}")
+                shadow.build_indexes(
+                    maintenance_work_mem=os.getenv("INDEX_MAINTENANCE_WORK_MEM", "1GB"),
+                    parallel_workers=int(os.getenv("INDEX_PARALLEL_WORKERS", "4")),
+                )
+                shadow.swap(keep_old=self.config.keep_old)
+            except BaseException:
+                shadow.discard()
+                raise
+            finally:
+                self.target_table = self.config.table_name
+        return stats
+
+    def _invalidate_answer_cache(self) -> int:
+        """재적재된 대학 데이터 기반의 의미 캐시 답변을 제거한다."""
+        with closing(psycopg2.connect(self.connection_str)) as conn:
+            return invalidate_cache(conn, domain="college")
 
     def _prepare_storage(self) -> None:
         """테이블 초기화 및 VectorStore 준비."""
-        if self.config.reset:
+        if self.config.reset and not self.config.reindex:
             self._truncate_table()
         self.embedding_model = get_embedding_model()
         self.vectorstore = CustomPGVector(
             conn_str=self.connection_str,
             embedding_fn=self.embedding_model,
-            table=self.config.table_name,
+            table=self.target_table,
         )
+        self.vectorstore.ensure_chunk_key()
+        self.existing = self.vectorstore.chunk_hashes()
 
     def _truncate_table(self) -> None:
         """재적재 전에 테이블을 비운다."""
-        with psycopg2.connect(self.connection_str) as conn:
+        with closing(psycopg2.connect(self.connection_str)) as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     sql.SQL("TRUNCATE TABLE {}").format(
-                        sql.Identifier(self.config.table_name)
+                        sql.Identifier(*self.config.table_name.split("."))
                     )
                 )
             conn.commit()
@@ -91,70 +199,103 @@ class CustomVectorIngestor:
             raise FileNotFoundError(f"CSV 파일을 찾을 수 없습니다: {pattern}")
         return matches
 
-    def _load_documents(self) -> List[Document]:
-        """CSV 파일들을 Document 리스트로 변환한다."""
-        documents: List[Document] = []
-        for csv_path in self._resolve_csv_files():
-            loader = CSVLoader(str(csv_path))
-            documents.extend(loader.load())
-        if not documents:
-            raise RuntimeError("적재할 Document가 없습니다. CSV 내용을 확인하세요.")
-        return documents
+    def _load_documents(self) -> Iterator[Document]:
+        """CSV 파일들을 병렬로 읽고 분할해, 파일 목록 순서대로 청크 Document를 흘려보낸다.
+
+        끝나는 순서(as_completed)로 내보내지 않는 이유: 여러 CSV에 같은 전공이 있으면
+        _changed_documents가 먼저 들어온 것만 쓰므로, 순서가 실행마다 바뀌면 어느 파일의 내용이
+        저장될지(-> content_hash, 재임베딩 여부)도 바뀐다. 앞 파일이 느리면 뒤 파일은 그동안 분할을
+        끝내고 기다리므로, 늦어지는 것은 앞 파일의 임베딩 시작뿐이다.
+        """
+        csv_files = [str(path) for path in self._resolve_csv_files()]
+        workers = max(1, min(self.config.load_workers, len(csv_files)))
+        args = (self.config.chunk_size, self.config.chunk_overlap)
+        if workers == 1:
+            for csv_path in csv_files:
+                yield from _load_and_split(csv_path, *args)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_load_and_split, csv_path, *args) for csv_path in csv_files]
+            for future in futures:
+                yield from future.result()
 
     def batched(
-        self, items: Sequence[Document], batch_size: int
-    ) -> Iterable[Sequence[Document]]:
-        """Sequence를 batch_size 단위로 분할한다."""
-        total = len(items)
-        for start in range(0, total, batch_size):
-            end = min(start + batch_size, total)
-            yield items[start:end]
-
-    def _split_documents(self, documents: List[Document]) -> List[Document]:
-        """Document를 RecursiveCharacterTextSplitter로 청크 단위로 나눈다."""
-        chunk_docs: List[Document] = []
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.config.chunk_size,
-            chunk_overlap=self.config.chunk_overlap,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
+        self, items: Iterable[Document], batch_size: int
+    ) -> Iterable[List[Document]]:
+        """Iterable을 batch_size 단위로 분할한다 (전체를 메모리에 올리지 않음)."""
+        iterator = iter(items)
+        while batch := list(islice(iterator, batch_size)):
+            yield batch
+
+    def _changed_documents(
+        self, documents: Iterable[Document], seen: Set[Tuple[str, int]], counts: dict
+    ) -> Iterator[Document]:
+        """내용이 바뀌었거나 새로 생긴 청크만 흘려보낸다 (같은 해시면 임베딩/쓰기 생략)."""
         for doc in documents:
-            chunks = self.splitter.split_text(doc.page_content)
-            for chunk_idx, chunk_text in enumerate(chunks):
-                chunk_clean = chunk_text.strip()
-                if not chunk_clean:
-                    continue
-                metadata = dict(doc.metadata)
-                metadata["chunk_index"] = chunk_idx
-                chunk_docs.append(Document(page_content=chunk_clean, metadata=metadata))
-        return chunk_docs
-
-    def _persist_documents(self, documents: List[Document]) -> dict:
-        """청크 Document를 CustomPGVector 테이블에 저장한다."""
+            key = CustomPGVector.chunk_key(doc.metadata)
+            if key in seen:  # 여러 CSV에 같은 전공이 있으면 처음 것만 사용 (한 upsert 안의 키 중복 방지)
+                continue
+            seen.add(key)
+            counts["majors"].add(doc.metadata.get("major") or doc.metadata.get("majorName"))
+            chash = content_hash(doc)
+            if self.existing.get(key) == chash:
+                counts["unchanged"] += 1
+                continue
+            doc.metadata["content_hash"] = chash
+            yield doc
+
+    def _persist_documents(self, documents: Iterable[Document]) -> dict:
+        """청크 Document를 CustomPGVector 테이블에 저장한다.
+
+        (major_seq, chunk_index)를 키로 upsert 하고, 내용 해시가 같은 청크는 건너뛴다.
+        임베딩은 embed_workers개의 배치를 동시에 요청하고, 완료된 배치는 순서대로
+        이 스레드에서 저장한다 -> 배치 N 저장과 배치 N+1.. 임베딩이 겹친다.
+        적재가 끝나면 이번 CSV에 없는 청크(prune)를 삭제한다.
+        """
         if self.vectorstore is None:
             raise RuntimeError("VectorStore가 초기화되지 않았습니다.")
 
-        total_chunks = len(documents)
-        total_batches = (
-            math.ceil(total_chunks / self.config.batch_size) if total_chunks else 0
-        )
-        majors = {
-            doc.metadata.get("major") or doc.metadata.get("majorName")
-            for doc in documents
-        }
-        majors.discard(None)
+        total_chunks = 0
+        seen: Set[Tuple[str, int]] = set()
+        counts = {"unchanged": 0, "majors": set()}
+        max_in_flight = max(1, self.config.embed_workers) * 2
+        pending: deque = deque()
 
-        if not total_chunks:
-            return {"chunks": 0, "majors": len(majors)}
+        def _write(future, batch: List[Document]) -> None:
+            embeddings = future.result()
+            self.vectorstore.add_embeddings(
+                [doc.page_content for doc in batch],
+                embeddings,
+                metadatas=[doc.metadata for doc in batch],
+                upsert=True,
+            )
+            progress.update(len(batch))
 
-        with tqdm(total=total_batches, desc="Uploading chunks") as progress:
-            for batch in self.batched(documents, self.config.batch_size):
+        with ThreadPoolExecutor(max_workers=max(1, self.config.embed_workers)) as pool, \
+                tqdm(desc="Uploading chunks", unit="chunk") as progress:
+            changed = self._changed_documents(documents, seen, counts)
+            for batch in self.batched(changed, self.config.batch_size):
+                total_chunks += len(batch)
                 texts = [doc.page_content for doc in batch]
-                metadatas = [doc.metadata for doc in batch]
-                self.vectorstore.add_texts(texts, metadatas=metadatas)
-                progress.update(1)
+                pending.append((pool.submit(self.embedding_model.embed_documents, texts), batch))
+                if len(pending) >= max_in_flight:
+                    _write(*pending.popleft())
+            while pending:
+                _write(*pending.popleft())
 
-        return {"chunks": total_chunks, "majors": len(majors)}
+        if not seen:
+            raise RuntimeError("적재할 Document가 없습니다. CSV 내용을 확인하세요.")
+        deleted = self.vectorstore.delete_chunks_except(sorted(seen)) if self.config.prune else 0
+
+        majors = counts["majors"]
+        majors.discard(None)
+        return {
+            "chunks": total_chunks,
+            "unchanged": counts["unchanged"],
+            "deleted": deleted,
+            "majors": len(majors),
+        }
 
 
 def parse_args() -> IngestConfig:
@@ -189,11 +330,39 @@ def parse_args() -> IngestConfig:
         default=64,
         help="DB 적재 시 배치 크기",
     )
+    parser.add_argument(
+        "--embed-workers",
+        type=int,
+        default=4,
+        help="동시에 요청할 임베딩 배치 수",
+    )
+    parser.add_argument(
+        "--load-workers",
+        type=int,
+        default=4,
+        help="CSV 로드/분할을 병렬로 처리할 프로세스 수",
+    )
     parser.add_argument(
         "--reset",
         action="store_true",
         help="기존 데이터를 제거하고 다시 적재",
     )
+    parser.add_argument(
+        "--no-prune",
+        dest="prune",
+        action="store_false",
+        help="이번 CSV에 없는 청크를 삭제하지 않음 (일부 파일만 적재할 때)",
+    )
+    parser.add_argument(
+        "--reindex",
+        action="store_true",
+        help="shadow 테이블에 적재하고 인덱스 빌드 후 운영 테이블과 원자적으로 교체 (서비스 중단 없음)",
+    )
+    parser.add_argument(
+        "--keep-old",
+        action="store_true",
+        help="--reindex 교체 후 이전 테이블을 <table>__old 로 남겨 둠 (롤백용)",
+    )
     args = parser.parse_args()
     return IngestConfig(
         csv_pattern=args.csv,
@@ -202,6 +371,11 @@ def parse_args() -> IngestConfig:
         chunk_overlap=args.chunk_overlap,
         batch_size=args.batch_size,
         reset=args.reset,
+        embed_workers=args.embed_workers,
+        load_workers=args.load_workers,
+        prune=args.prune,
+        reindex=args.reindex,
+        keep_old=args.keep_old,
     )
 
 
@@ -211,9 +385,12 @@ def main() -> None:
     ingestor = CustomVectorIngestor(config)
     stats = ingestor.run()
     print(
-        f"✅ Done. Inserted {stats['chunks']} chunks "
-        f"from {stats['majors']} majors into table '{config.table_name}'."
+        f"✅ Done. Upserted {stats['chunks']} chunks "
+        f"from {stats['majors']} majors into table '{config.table_name}' "
+        f"({stats['unchanged']} unchanged, {stats['deleted']} deleted)."
     )
+    if stats.get("cache_invalidated"):
+        print(f"🧹 Invalidated {stats['cache_invalidated']} cached college answers.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+# LLM 클라이언트 레지스트리
+# - provider(openai / ollama)마다 keep-alive HTTP 클라이언트를 하나만 만들고
+#   모델 설정(model, temperature 등)이 달라도 같은 커넥션 풀을 공유한다
+# - 비동기 클라이언트의 커넥션은 만든 이벤트 루프에 묶여 있어 다른 루프에서 쓰면
+#   "Event loop is closed"가 난다 (runserver + async 뷰는 요청마다 새 루프).
+#   그래서 동기 클라이언트만 프로세스 전체가 공유하고, 비동기 클라이언트는 실행 중인 루프마다 따로 만든다
+#   (ASGI 워커는 루프가 하나라 그 루프 안에서는 커넥션 풀을 계속 공유한다)
+# - 모델 객체는 (provider, 설정) 별로 한 번만 만들고 계속 재사용한다 (evict 없음)
+#
+# 환경변수
+#   LLM_HTTP_MAX_CONNECTIONS   provider별 최대 동시 커넥션 (기본 100)
+#   LLM_HTTP_MAX_KEEPALIVE     유지할 idle keep-alive 커넥션 (기본 20)
+#   LLM_HTTP_KEEPALIVE_EXPIRY  idle 커넥션 유지 시간(초) (기본 30)
+#   LLM_HTTP_TIMEOUT           요청 타임아웃(초) (기본 120)
+#   LLM_HTTP_CONNECT_TIMEOUT   연결 타임아웃(초) (기본 10)
+import asyncio
+import os
+import weakref
+from threading import Lock
+from typing import Any, Callable, Dict, Generic, Tuple, TypeVar
+
+import httpx
+
+
+def http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30")),
+    )
+
+
+def http_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        float(os.getenv("LLM_HTTP_TIMEOUT", "120")),
+        connect=float(os.getenv("LLM_HTTP_CONNECT_TIMEOUT", "10")),
+    )
+
+
+T = TypeVar("T")
+
+
+class PerLoop(Generic[T]):
+    """실행 중인 이벤트 루프마다 factory()로 만든 객체를 하나씩 보관한다."""
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self._factory = factory
+        self._lock = Lock()
+        self._by_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, T]" = weakref.WeakKeyDictionary()
+
+    def get(self) -> T:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._by_loop.get(loop)
+            if client is None:
+                # 닫힌 루프의 클라이언트는 커넥션이 루프를 참조해 약한 참조만으로는 풀리지 않으므로 직접 정리
+                for old in [old for old in self._by_loop if old.is_closed()]:
+                    del self._by_loop[old]
+                client = self._by_loop[loop] = self._factory()
+            return client
+
+
+class LoopLocalAsyncClient(httpx.AsyncClient):
+    """httpx.AsyncClient 자리에 넘기는 클라이언트 (openai는 isinstance로 타입을 검사한다).
+
+    요청은 만들기만 하고 send는 현재 루프의 실제 AsyncClient로 넘긴다.
+    """
+
+    def __init__(self, factory: Callable[[], httpx.AsyncClient], **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._per_loop = PerLoop(factory)
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        return await self._per_loop.get().send(request, **kwargs)
+
+
+class LoopLocalProxy:
+    """속성 접근을 현재 루프의 객체로 넘긴다 (ollama.AsyncClient처럼 타입 검사가 없는 자리에 사용)."""
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self._per_loop = PerLoop(factory)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._per_loop.get(), name)
+
+
+class LLMClientRegistry:
+    """provider별 공유 HTTP 클라이언트와 설정별 모델 객체를 보관한다."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._clients: Dict[str, Tuple[Any, Any]] = {}
+        self._models: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], Any] = {}
+
+    # --- HTTP 클라이언트 ---
+    def openai_clients(self) -> Tuple[httpx.Client, httpx.AsyncClient]:
+        """ChatOpenAI(http_client=..., http_async_client=...)에 넘길 httpx 클라이언트 (비동기는 루프별)"""
+        return self._get_clients("openai", lambda: (
+            httpx.Client(limits=http_limits(), timeout=http_timeout()),
+            LoopLocalAsyncClient(
+                lambda: httpx.AsyncClient(limits=http_limits(), timeout=http_timeout()),
+                timeout=http_timeout(),
+            ),
+        ))
+
+    def ollama_clients(self, host: str):
+        """ollama.Client / AsyncClient (내부적으로 httpx 커넥션 풀 사용, 비동기는 루프별)"""
+        from ollama import AsyncClient, Client
+
+        return self._get_clients(f"ollama:{host}", lambda: (
+            Client(host=host, limits=http_limits(), timeout=http_timeout()),
+            LoopLocalProxy(lambda: AsyncClient(host=host, limits=http_limits(), timeout=http_timeout())),
+        ))
+
+    def _get_clients(self, key: str, factory: Callable[[], Tuple[Any, Any]]):
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = factory()
+            return self._clients[key]
+
+    # --- 모델 ---
+    def chat_model(self, provider: str, params: Dict[str, Any], factory: Callable[[], Any]):
+        """(provider, params) 조합마다 모델 객체를 한 번만 만든다."""
+        key = (provider, tuple(sorted(params.items())))
+        with self._lock:
+            model = self._models.get(key)
+        if model is not None:
+            return model
+        model = factory()
+        with self._lock:
+            return self._models.setdefault(key, model)
+
+    def close(self) -> None:
+        """동기 클라이언트를 닫는다 (프로세스 종료/테스트 정리용)."""
+        with self._lock:
+            for sync_client, _ in self._clients.values():
+                close = getattr(sync_client, "close", None) or getattr(getattr(sync_client, "_client", None), "close", None)
+                if close:
+                    close()
+            self._clients.clear()
+            self._models.clear()
+
+
+registry = LLMClientRegistry()
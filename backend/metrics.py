@@ -0,0 +1,271 @@
+# Prometheus 지표 수집 모듈
+# - LangGraph 노드: create_graph_flow에서 instrument_node로 감싸 지연시간/호출 수 기록
+# - LLM 호출: models.py에서 생성하는 모델에 MetricsCallbackHandler를 붙여 지연시간/토큰 수 기록
+# - 임베딩/벡터 검색: InstrumentedEmbeddings, observe_vector_query로 지연시간 기록
+# - 의미 캐시: record_cache로 hit/miss 기록
+# - single-flight: record_singleflight로 실제 실행(leader)/결과 공유(shared) 횟수 기록
+# Django의 /metrics 엔드포인트가 render_latest()를 그대로 내보낸다.
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    REGISTRY,
+)
+
+# LLM 응답은 수 초 단위이므로 기본 버킷보다 긴 구간까지 둔다
+_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64)
+
+NODE_LATENCY = Histogram(
+    "langgraph_node_duration_seconds",
+    "LangGraph 노드 실행 시간",
+    ["node"],
+    buckets=_LATENCY_BUCKETS,
+)
+NODE_CALLS = Counter(
+    "langgraph_node_calls_total",
+    "LangGraph 노드 호출 수",
+    ["node", "status"],
+)
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds",
+    "LLM 호출 시간",
+    ["model"],
+    buckets=_LATENCY_BUCKETS,
+)
+LLM_CALLS = Counter(
+    "llm_requests_total",
+    "LLM 호출 수",
+    ["model", "status"],
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "LLM 사용 토큰 수",
+    ["model", "type"],
+)
+EMBEDDING_LATENCY = Histogram(
+    "embedding_request_duration_seconds",
+    "임베딩 호출 시간",
+    ["operation"],
+    buckets=_LATENCY_BUCKETS,
+)
+VECTOR_QUERY_LATENCY = Histogram(
+    "vector_query_duration_seconds",
+    "pgvector 검색 쿼리 시간",
+    ["store", "operation"],
+    buckets=_LATENCY_BUCKETS,
+)
+VECTOR_QUERIES = Counter(
+    "vector_queries_total",
+    "pgvector 검색 쿼리 수",
+    ["store", "operation", "status"],
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "캐시 조회 수",
+    ["cache", "result"],
+)
+SINGLEFLIGHT_REQUESTS = Counter(
+    "singleflight_requests_total",
+    "single-flight 호출 수 (leader: 직접 실행, shared: 진행 중인 호출 결과 공유)",
+    ["name", "result"],
+)
+
+
+# --- 노드 ---
+# 벤치마크 등에서 노드별 원시 실행 시간이 필요할 때 등록하는 콜백 (name, seconds, status)
+_node_observers: List[Callable[[str, float, str], None]] = []
+
+
+def add_node_observer(observer: Callable[[str, float, str], None]) -> None:
+    _node_observers.append(observer)
+
+
+def remove_node_observer(observer: Callable[[str, float, str], None]) -> None:
+    if observer in _node_observers:
+        _node_observers.remove(observer)
+
+
+def _observe_node(name: str, elapsed: float, status: str) -> None:
+    NODE_LATENCY.labels(node=name).observe(elapsed)
+    NODE_CALLS.labels(node=name, status=status).inc()
+    for observer in list(_node_observers):
+        observer(name, elapsed, status)
+
+
+def instrument_node(name: str, func):
+    """노드 함수(동기/비동기)를 감싸 실행 시간과 성공/실패 횟수를 기록한다."""
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def _async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            status = "error"
+            try:
+                result = await func(*args, **kwargs)
+                status = "ok"
+                return result
+            finally:
+                _observe_node(name, time.perf_counter() - start, status)
+        return _async_wrapper
+
+    @functools.wraps(func)
+    def _wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        status = "error"
+        try:
+            result = func(*args, **kwargs)
+            status = "ok"
+            return result
+        finally:
+            _observe_node(name, time.perf_counter() - start, status)
+    return _wrapper
+
+
+# --- 벡터 검색 / 캐시 ---
+@contextmanager
+def observe_vector_query(store: str, operation: str = "search"):
+    start = time.perf_counter()
+    status = "error"
+    try:
+        yield
+        status = "ok"
+    finally:
+        VECTOR_QUERY_LATENCY.labels(store=store, operation=operation).observe(time.perf_counter() - start)
+        VECTOR_QUERIES.labels(store=store, operation=operation, status=status).inc()
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def record_singleflight(name: str, shared: bool) -> None:
+    SINGLEFLIGHT_REQUESTS.labels(name=name, result="shared" if shared else "leader").inc()
+
+
+# --- 임베딩 ---
+class InstrumentedEmbeddings:
+    """임베딩 모델을 감싸 embed_* 호출 시간을 기록한다. 그 외 속성은 원본으로 위임."""
+
+    def __init__(self, embeddings):
+        self._embeddings = embeddings
+
+    def __getattr__(self, name):
+        return getattr(self._embeddings, name)
+
+    def embed_query(self, text: str):
+        with _timed_embedding("embed_query"):
+            return self._embeddings.embed_query(text)
+
+    def embed_documents(self, texts):
+        with _timed_embedding("embed_documents"):
+            return self._embeddings.embed_documents(texts)
+
+    async def aembed_query(self, text: str):
+        with _timed_embedding("embed_query"):
+            return await self._embeddings.aembed_query(text)
+
+    async def aembed_documents(self, texts):
+        with _timed_embedding("embed_documents"):
+            return await self._embeddings.aembed_documents(texts)
+
+
+@contextmanager
+def _timed_embedding(operation: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        EMBEDDING_LATENCY.labels(operation=operation).observe(time.perf_counter() - start)
+
+
+# --- LLM ---
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """LangChain 콜백으로 LLM 호출 시간/토큰 수를 기록한다 (동기/비동기 호출 모두)."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._runs: Dict[UUID, Tuple[str, float]] = {}
+
+    @staticmethod
+    def _model_name(serialized: Optional[Dict[str, Any]], kwargs: Dict[str, Any]) -> str:
+        metadata = kwargs.get("metadata") or {}
+        params = kwargs.get("invocation_params") or {}
+        return (
+            metadata.get("ls_model_name")
+            or params.get("model")
+            or params.get("model_name")
+            or ((serialized or {}).get("kwargs") or {}).get("model")
+            or "unknown"
+        )
+
+    def _start(self, run_id: UUID, model: str) -> None:
+        with self._lock:
+            self._runs[run_id] = (model, time.perf_counter())
+
+    def _finish(self, run_id: UUID, status: str) -> Optional[str]:
+        with self._lock:
+            model, start = self._runs.pop(run_id, (None, None))
+        if model is None:
+            return None
+        LLM_LATENCY.labels(model=model).observe(time.perf_counter() - start)
+        LLM_CALLS.labels(model=model, status=status).inc()
+        return model
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, self._model_name(serialized, kwargs))
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, self._model_name(serialized, kwargs))
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        model = self._finish(run_id, "ok")
+        if model is None:
+            return
+        prompt_tokens, completion_tokens = _token_usage(response)
+        if prompt_tokens:
+            LLM_TOKENS.labels(model=model, type="prompt").inc(prompt_tokens)
+        if completion_tokens:
+            LLM_TOKENS.labels(model=model, type="completion").inc(completion_tokens)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, "error")
+
+
+def _token_usage(response) -> Tuple[int, int]:
+    """LLMResult에서 (prompt, completion) 토큰 수를 꺼낸다 (OpenAI/Ollama 공통)."""
+    for generations in response.generations or []:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return int(usage.get("input_tokens", 0)), int(usage.get("output_tokens", 0))
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    return int(token_usage.get("prompt_tokens", 0)), int(token_usage.get("completion_tokens", 0))
+
+
+LLM_METRICS_CALLBACK = MetricsCallbackHandler()
+
+
+# --- 노출 ---
+def render_latest() -> Tuple[bytes, str]:
+    """Prometheus text format으로 현재 지표를 직렬화한다.
+
+    gunicorn 등 멀티 프로세스 환경에서는 PROMETHEUS_MULTIPROC_DIR을 지정하면
+    모든 워커의 지표를 합쳐서 내보낸다.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
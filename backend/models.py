@@ -3,10 +3,23 @@ from functools import lru_cache
 from typing import Tuple, Any, Mapping, Optional
 
 from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.chat_models import ChatOllama
+from langchain_ollama import ChatOllama
 from langchain_openai import OpenAIEmbeddings
 from langchain_openai import ChatOpenAI
 
+from llm_clients import registry
+from metrics import InstrumentedEmbeddings, LLM_METRICS_CALLBACK
+from singleflight import CoalescingChatModel, CoalescingEmbeddings
+
+
+def _single_flight_enabled() -> bool:
+    """동시에 들어온 같은 임베딩/LLM 호출을 한 번으로 합칠지 (SINGLE_FLIGHT_ENABLED, 기본 true)"""
+    return os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+
+def _coalesce(llm):
+    return CoalescingChatModel(llm) if _single_flight_enabled() else llm
+
 
 @lru_cache(maxsize=1) # 함수 결과를 메모리에 저장해 두는 파이썬 표준 라이브러리
 def _load_embeddings():
@@ -14,7 +27,13 @@ def _load_embeddings():
     model_name = os.getenv("LOCAL_EMBEDDING_MODEL")
 
     if backend == "openai":
-        embeddings_model = OpenAIEmbeddings(model=model_name)
+        # 채팅 모델과 같은 OpenAI 커넥션 풀 사용
+        http_client, http_async_client = registry.openai_clients()
+        embeddings_model = OpenAIEmbeddings(
+            model=model_name,
+            http_client=http_client,
+            http_async_client=http_async_client,
+        )
 
     elif backend == "huggingface":
         normalize = os.getenv("LOCAL_EMBEDDING_NORMALIZE", "false").lower() == "true"
@@ -23,6 +42,19 @@ def _load_embeddings():
             encode_kwargs={"normalize_embeddings": normalize},
         )
 
+    elif backend == "fake":
+        # 네트워크 없이 벤치마크/테스트용 (benchmarks/fakes.py)
+        from benchmarks.fakes import FakeEmbeddings
+        embeddings_model = FakeEmbeddings(
+            dim=int(os.getenv("LOCAL_EMBEDDING_DIM", "3072")),
+            latency=float(os.getenv("FAKE_EMBEDDING_LATENCY_MS", "0")) / 1000,
+        )
+
+    # embed_* 호출 시간을 Prometheus 지표로 기록
+    embeddings_model = InstrumentedEmbeddings(embeddings_model)
+    if _single_flight_enabled():
+        embeddings_model = CoalescingEmbeddings(embeddings_model)
+
     dim_env = os.getenv("LOCAL_EMBEDDING_DIM")
     if dim_env:
         dimension = int(dim_env)
@@ -40,28 +72,74 @@ def get_embedding_dim() -> int:
     """Return the embedding dimension for the current model."""
     return _load_embeddings()[1]
 
-@lru_cache(maxsize=2)
 def load_openai_model(*, params_key: Tuple[Tuple[str, Any], ...]) -> ChatOpenAI:
-    """답변생성 혹은 평가 모델을 로드하는 함수"""
+    """답변생성 혹은 평가 모델을 로드하는 함수
+
+    설정(params_key)별 모델 객체는 레지스트리에 계속 보관되고,
+    HTTP 커넥션 풀은 모든 OpenAI 모델이 하나를 공유한다.
+    """
     params = dict(params_key)
-    return ChatOpenAI(**params)
+    if _use_fake_llm():
+        return registry.chat_model("fake", params, lambda: _coalesce(_load_fake_model(params.get("model") or "fake-openai")))
+
+    def _factory() -> ChatOpenAI:
+        http_client, http_async_client = registry.openai_clients()
+        return _coalesce(ChatOpenAI(
+            **params,
+            http_client=http_client,
+            http_async_client=http_async_client,
+            callbacks=[LLM_METRICS_CALLBACK],
+        ))
+
+    return registry.chat_model("openai", params, _factory)
+
+def _use_fake_llm() -> bool:
+    """LLM_BACKEND=fake 이면 모든 채팅 모델을 결정적 가짜 모델로 대체 (네트워크 불필요)"""
+    return os.getenv("LLM_BACKEND", "").lower() == "fake"
+
+
+def _load_fake_model(model_name: str):
+    from benchmarks.fakes import FakeChatModel
+    return FakeChatModel(
+        model_name=model_name,
+        latency=float(os.getenv("FAKE_LLM_LATENCY_MS", "0")) / 1000,
+        callbacks=[LLM_METRICS_CALLBACK],
+    )
+
 
 def _ollama_base_url() -> str:
     """Return the Ollama endpoint."""
     return os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 
 
-@lru_cache(maxsize=1) 
+def _load_ollama(model: str, temperature: float) -> ChatOllama:
+    """Ollama 모델을 레지스트리에서 가져온다 (같은 host의 모델은 ollama Client를 공유)."""
+    base_url = _ollama_base_url()
+    params = {"model": model, "temperature": temperature, "base_url": base_url}
+
+    def _factory() -> ChatOllama:
+        llm = ChatOllama(**params, callbacks=[LLM_METRICS_CALLBACK])
+        # 모델마다 만들어지는 ollama Client 대신 공유 Client(커넥션 풀)를 사용
+        llm._client, llm._async_client = registry.ollama_clients(base_url)
+        return _coalesce(llm)
+
+    return registry.chat_model("ollama", params, _factory)
+
+
 def load_ollama_model() -> ChatOllama:
     """채Ollama LLM을 초기화"""
     model = os.getenv("OLLAMA_MODEL", "llama3.2:latest")
+    if _use_fake_llm():
+        return registry.chat_model("fake", {"model": model}, lambda: _coalesce(_load_fake_model(model)))
     temperature = float(os.getenv("CLASSIFY_TEMPERATURE", "0.2"))
-    return ChatOllama(model=model, temperature=temperature, base_url=_ollama_base_url())
+    return _load_ollama(model, temperature)
 
 
 # 파인튜닝 모델 
-@lru_cache(maxsize=1)
 def load_finetune_ollama_model() -> ChatOllama:
     model = os.getenv("FINETUNE_MODEL", "") # 이곳에 해당 모델명 입력
+    if _use_fake_llm():
+        return registry.chat_model("fake", {"model": model or "fake-finetune"},
+                                   lambda: _coalesce(_load_fake_model(model or "fake-finetune")))
     temperature = float(os.getenv("FINETUNE_TEMPERATURE", "0.2"))
-    return ChatOllama(model=model, temperature=temperature, base_url=_ollama_base_url())
+    return _load_ollama(model, temperature)
@@ -0,0 +1,223 @@
+# PostgreSQL 바이너리 COPY 대량 적재 도우미
+# - copy_binary: 행 iterator를 PGCOPY 바이너리 포맷으로 스트리밍 (텍스트 캐스팅/행 단위 INSERT 없음)
+# - staged_upsert: UNLOGGED 스테이징 테이블에 COPY 후 한 번의 INSERT ... ON CONFLICT로 병합
+# - drop_vector_indexes / restore_indexes: 대량 적재 동안 ANN 인덱스를 내렸다가 다시 생성
+# - copy_binary_out: COPY (query) TO STDOUT 바이너리 결과를 행 단위로 디코딩 (덤프용)
+#
+# 지원 타입: int2, int4, int8, float4, float8, text, jsonb, vector, halfvec
+#   pgvector 바이너리 표현: int16 차원, int16 예약(0), 이후 요소 (vector=float4, halfvec=float2), 빅엔디언
+import struct
+import tempfile
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_TRAILER = struct.pack(">h", -1)
+_NULL = struct.pack(">i", -1)
+
+
+def _pack_floats(values, be_dtype: str, struct_code: str) -> bytes:
+    if hasattr(values, "astype"):  # numpy 배열은 한 번에 변환
+        return values.astype(be_dtype, copy=False).tobytes()
+    return struct.pack(f">{len(values)}{struct_code}", *values)
+
+
+def _vector(values) -> bytes:
+    return struct.pack(">HH", len(values), 0) + _pack_floats(values, ">f4", "f")
+
+
+def _halfvec(values) -> bytes:
+    return struct.pack(">HH", len(values), 0) + _pack_floats(values, ">f2", "e")
+
+
+_ENCODERS: Dict[str, Callable[[Any], bytes]] = {
+    "int2": lambda v: struct.pack(">h", int(v)),
+    "int4": lambda v: struct.pack(">i", int(v)),
+    "int8": lambda v: struct.pack(">q", int(v)),
+    "float4": lambda v: struct.pack(">f", float(v)),
+    "float8": lambda v: struct.pack(">d", float(v)),
+    "text": lambda v: str(v).encode("utf-8"),
+    "jsonb": lambda v: b"\x01" + str(v).encode("utf-8"),  # 버전 바이트 1 + JSON 텍스트
+    "vector": _vector,
+    "halfvec": _halfvec,
+}
+
+_DECODERS: Dict[str, Callable[[bytes], Any]] = {
+    "int2": lambda b: struct.unpack(">h", b)[0],
+    "int4": lambda b: struct.unpack(">i", b)[0],
+    "int8": lambda b: struct.unpack(">q", b)[0],
+    "float4": lambda b: struct.unpack(">f", b)[0],
+    "float8": lambda b: struct.unpack(">d", b)[0],
+    "text": lambda b: b.decode("utf-8"),
+    "jsonb": lambda b: b[1:].decode("utf-8"),
+    "vector": lambda b: list(struct.unpack(f">{(len(b) - 4) // 4}f", b[4:])),
+    "halfvec": lambda b: list(struct.unpack(f">{(len(b) - 4) // 2}e", b[4:])),
+}
+
+
+def encode_rows(rows: Iterable[Sequence[Any]], types: Sequence[str], chunk_bytes: int = 1 << 20) -> Iterator[bytes]:
+    """행들을 PGCOPY 바이너리 조각(chunk_bytes 단위)으로 인코딩한다. None은 NULL."""
+    encoders = [_ENCODERS[t] for t in types]
+    field_count = struct.pack(">h", len(encoders))
+    buf = bytearray(_HEADER)
+    for row in rows:
+        buf += field_count
+        for value, encode in zip(row, encoders):
+            if value is None:
+                buf += _NULL
+                continue
+            data = encode(value)
+            buf += struct.pack(">i", len(data))
+            buf += data
+        if len(buf) >= chunk_bytes:
+            yield bytes(buf)
+            buf.clear()
+    buf += _TRAILER
+    yield bytes(buf)
+
+
+class _IterStream:
+    """bytes iterator를 copy_expert가 읽을 수 있는 file-like 객체로 감싼다 (전체를 메모리에 올리지 않음)."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buf = b""
+        self._pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        # 현재 조각을 다 읽었을 때만 다음 조각을 가져온다 (큰 버퍼를 매번 잘라 복사하지 않도록 offset 사용)
+        while self._pos >= len(self._buf):
+            try:
+                self._buf, self._pos = next(self._chunks), 0
+            except StopIteration:
+                return b""
+        end = len(self._buf) if size < 0 else self._pos + size
+        data = self._buf[self._pos:end]
+        self._pos += len(data)
+        return data
+
+
+def copy_binary(cur, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]], types: Sequence[str]) -> int:
+    """rows를 table(columns)에 바이너리 COPY로 적재하고 적재한 행 수를 반환한다."""
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT binary)"
+    cur.copy_expert(sql, _IterStream(encode_rows(rows, types)))
+    return cur.rowcount
+
+
+def _read_exact(stream, n: int) -> bytes:
+    data = stream.read(n)
+    if len(data) != n:
+        raise ValueError("truncated PGCOPY stream")
+    return data
+
+
+def decode_rows(stream, types: Sequence[str], decoders: Optional[Dict[str, Callable[[bytes], Any]]] = None) -> Iterator[List[Any]]:
+    """PGCOPY 바이너리 스트림을 행(list)으로 디코딩한다. decoders로 타입별 디코더를 바꿀 수 있다 (예: vector -> numpy)."""
+    table = {**_DECODERS, **(decoders or {})}
+    fns = [table[t] for t in types]
+    header = _read_exact(stream, 19)
+    if header[:11] != _HEADER[:11]:
+        raise ValueError("not a PGCOPY binary stream")
+    ext_len = struct.unpack(">i", header[15:19])[0]
+    _read_exact(stream, ext_len)
+    while True:
+        n_fields = struct.unpack(">h", _read_exact(stream, 2))[0]
+        if n_fields == -1:
+            return
+        if n_fields != len(fns):
+            raise ValueError(f"expected {len(fns)} fields, got {n_fields}")
+        row = []
+        for decode in fns:
+            size = struct.unpack(">i", _read_exact(stream, 4))[0]
+            row.append(None if size == -1 else decode(_read_exact(stream, size)))
+        yield row
+
+
+def copy_binary_out(cur, query: str, types: Sequence[str],
+                    decoders: Optional[Dict[str, Callable[[bytes], Any]]] = None,
+                    spool_bytes: int = 64 << 20) -> Iterator[List[Any]]:
+    """query 결과를 바이너리 COPY로 받아 행 단위로 돌려준다 (spool_bytes를 넘으면 임시 파일에 둔다)."""
+    with tempfile.SpooledTemporaryFile(max_size=spool_bytes) as spool:
+        cur.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT binary)", spool)
+        spool.seek(0)
+        yield from decode_rows(spool, types, decoders)
+
+
+def staged_upsert(
+    conn,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    types: Sequence[str],
+    conflict_columns: Sequence[str],
+    update_columns: Optional[Sequence[str]] = None,
+    commit: bool = True,
+) -> int:
+    """UNLOGGED 스테이징 테이블에 COPY한 뒤 한 문장으로 table에 upsert 한다 (한 트랜잭션).
+
+    스테이징 안에서 conflict 키가 중복되면 마지막으로 들어온 행만 반영한다.
+    commit=False 이면 호출한 쪽의 트랜잭션에 포함된다 (다른 쓰기와 함께 커밋/롤백).
+    """
+    if update_columns is None:
+        update_columns = [c for c in columns if c not in conflict_columns]
+    staging = f"{table}_staging"
+    cols = ", ".join(columns)
+    keys = ", ".join(conflict_columns)
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in update_columns)
+    on_conflict = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+
+    with conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {staging}")
+        # 제약/인덱스 없이 컬럼 정의만 복사 -> COPY가 WAL/인덱스 유지 비용 없이 들어간다
+        cur.execute(f"CREATE UNLOGGED TABLE {staging} (LIKE {table} INCLUDING DEFAULTS)")
+        cur.execute(f"ALTER TABLE {staging} ADD COLUMN _stage_seq BIGSERIAL")
+        copy_binary(cur, staging, columns, rows, types)
+        cur.execute(
+            f"""
+            INSERT INTO {table} ({cols})
+            SELECT {cols} FROM (
+                SELECT DISTINCT ON ({keys}) {cols}
+                FROM {staging}
+                ORDER BY {keys}, _stage_seq DESC
+            ) s
+            ON CONFLICT ({keys}) {on_conflict}
+            """
+        )
+        merged = cur.rowcount
+        cur.execute(f"DROP TABLE {staging}")
+    if commit:
+        conn.commit()
+    return merged
+
+
+def drop_vector_indexes(conn, table: str) -> List[str]:
+    """table의 ivfflat/hnsw 인덱스를 삭제하고, 다시 만들 때 쓸 CREATE INDEX 문을 반환한다."""
+    schema, _, name = table.rpartition(".")
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT schemaname, indexname, indexdef FROM pg_indexes
+            WHERE tablename = %s AND (%s = '' OR schemaname = %s)
+              AND (indexdef ILIKE '%%USING ivfflat%%' OR indexdef ILIKE '%%USING hnsw%%')
+            """,
+            (name, schema, schema),
+        )
+        found = cur.fetchall()
+        for index_schema, index_name, _ in found:
+            cur.execute(f"DROP INDEX IF EXISTS {index_schema}.{index_name}")
+    conn.commit()
+    return [indexdef for _, _, indexdef in found]
+
+
+def restore_indexes(conn, index_defs: Sequence[str], maintenance_work_mem: Optional[str] = None,
+                    parallel_workers: Optional[int] = None) -> None:
+    """drop_vector_indexes가 돌려준 인덱스를 다시 만든다 (적재 후 한 번에 빌드하는 편이 훨씬 빠르다)."""
+    if not index_defs:
+        return
+    with conn.cursor() as cur:
+        if maintenance_work_mem:
+            cur.execute("SET maintenance_work_mem = %s", (maintenance_work_mem,))
+        if parallel_workers is not None:
+            cur.execute("SET max_parallel_maintenance_workers = %s", (int(parallel_workers),))
+        for indexdef in index_defs:
+            cur.execute(indexdef)
+    conn.commit()
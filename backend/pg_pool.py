@@ -0,0 +1,79 @@
+# 검색용 PostgreSQL 연결 풀
+# - 웹 프로세스의 벡터 검색(CustomPGVector / InterviewPGVector)은 연결 하나를 모든 요청이 나눠 쓰거나
+#   요청마다 새로 연결하지 않고, conn_str별 ThreadedConnectionPool에서 연결을 빌려 쓴다.
+#   -> 동시 검색이 한 연결 뒤에 줄 서지 않고 PG_POOL_MAX개까지 병렬로 실행된다.
+# - 풀 연결은 autocommit: SELECT 후 "idle in transaction"으로 남아 ACCESS SHARE 락을 쥐고 있지 않으므로
+#   재적재의 테이블 교체(ALTER TABLE ... RENAME)가 서비스 중에도 락을 잡을 수 있고,
+#   실패한 조회가 연결을 InFailedSqlTransaction 상태로 남기지 않는다.
+# - 오류가 나면 롤백하고, 끊어진 연결은 풀에 돌려주지 않고 닫는다.
+# - settings(예: {"hnsw.ef_search": 100})를 주면 그 조회만 한 트랜잭션으로 묶어 SET LOCAL로 적용한다
+#   (커밋하면 사라지므로 풀에 반납된 연결의 다른 조회에는 남지 않는다).
+# - ThreadedConnectionPool.getconn은 빈 연결이 없으면 기다리지 않고 PoolError를 내므로
+#   세마포어로 빈 연결이 생길 때까지 (PG_POOL_TIMEOUT초) 기다린다.
+#
+# 설정: PG_POOL_MIN(기본 1), PG_POOL_MAX(기본 20), PG_POOL_TIMEOUT(기본 30)
+import os
+from contextlib import contextmanager
+from threading import BoundedSemaphore, Lock
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+_pools: Dict[str, Tuple[ThreadedConnectionPool, BoundedSemaphore]] = {}
+_pools_lock = Lock()
+
+
+def get_pool(conn_str: str) -> Tuple[ThreadedConnectionPool, BoundedSemaphore]:
+    """conn_str별 풀 (프로세스에서 하나씩, 처음 쓸 때 만든다)"""
+    with _pools_lock:
+        entry = _pools.get(conn_str)
+        if entry is None:
+            maxconn = max(1, int(os.getenv("PG_POOL_MAX", "20")))
+            minconn = min(int(os.getenv("PG_POOL_MIN", "1")), maxconn)
+            pool = ThreadedConnectionPool(minconn, maxconn, conn_str)
+            # 기본 구현은 반납된 연결 중 minconn 초과분을 닫아 부하 때마다 재연결하므로,
+            # minconn은 시작 시 미리 여는 수로만 쓰고 반납된 연결은 maxconn개까지 유지한다
+            pool.minconn = maxconn
+            entry = (pool, BoundedSemaphore(maxconn))
+            _pools[conn_str] = entry
+        return entry
+
+
+@contextmanager
+def pooled_cursor(conn_str: str, settings: Optional[Dict[str, Any]] = None) -> Iterator:
+    """풀에서 autocommit 연결을 빌려 cursor를 돌려주고, 끝나면 반납한다.
+
+        with pooled_cursor(conn_str, {"ivfflat.probes": 10}) as cur:
+            cur.execute(...)
+    """
+    pool, slots = get_pool(conn_str)
+    if not slots.acquire(timeout=float(os.getenv("PG_POOL_TIMEOUT", "30"))):
+        raise PoolError("connection pool exhausted")
+    try:
+        conn = pool.getconn()
+        try:
+            autocommit = not settings
+            if conn.autocommit != autocommit:
+                conn.autocommit = autocommit
+            with conn.cursor() as cur:
+                for name, value in (settings or {}).items():
+                    cur.execute("SELECT set_config(%s, %s, true)", (name, str(value)))
+                yield cur
+            if not autocommit:
+                conn.commit()
+        except BaseException:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            pool.putconn(conn, close=bool(conn.closed))
+    finally:
+        slots.release()
+
+
+def close_pools() -> None:
+    """모든 풀의 연결을 닫는다 (프로세스 종료/테스트용)"""
+    with _pools_lock:
+        for pool, _ in _pools.values():
+            pool.closeall()
+        _pools.clear()
@@ -0,0 +1,162 @@
+# 무중단 재적재용 shadow 테이블
+# 1) create: 운영 테이블과 같은 구조(LIKE ... INCLUDING ALL)의 <table>__shadow 를 만들고
+#    ANN(ivfflat/hnsw) 인덱스는 빼 둔다. copy_data=True 면 현재 데이터를 복사해 증분 적재의 출발점으로 쓴다.
+# 2) 호출한 쪽이 shadow 테이블에 적재
+# 3) build_indexes: 적재가 끝난 뒤 ANN 인덱스를 병렬 maintenance worker로 한 번에 빌드하고 ANALYZE
+# 4) swap: 한 트랜잭션에서 이름을 바꿔치기 (운영 -> __old, shadow -> 운영) 후 이전 테이블 삭제
+#
+# 검색 쪽(retrieve_chunks / interview_vector_search)은 적재 중에도 기존 테이블을 그대로 읽는다.
+# 여러 테이블(interview.meta_df + interview.vector)은 FK까지 shadow끼리 연결해 함께 교체한다.
+import re
+import time
+from typing import Dict, List, Optional, Sequence
+
+from psycopg2 import errors
+
+from pg_copy import drop_vector_indexes, restore_indexes
+
+SHADOW_SUFFIX = "__shadow"
+OLD_SUFFIX = "__old"
+
+_INDEX_HEAD = re.compile(r"^CREATE (UNIQUE )?INDEX \S+ ON (ONLY )?\S+ ")
+
+
+def _split(table: str):
+    schema, _, name = table.rpartition(".")
+    return schema or "public", name
+
+
+def _normalize_indexdef(indexdef: str) -> str:
+    """인덱스 이름/테이블 이름을 뺀 정의 (운영/shadow 인덱스 짝 맞추기용)"""
+    return _INDEX_HEAD.sub(lambda m: f"CREATE {m.group(1) or ''}INDEX ON ", indexdef)
+
+
+class ShadowTables:
+    """tables(FK 부모 -> 자식 순서)의 shadow 생성, 인덱스 빌드, 원자적 교체"""
+
+    def __init__(self, conn, tables: Sequence[str]):
+        self.conn = conn
+        self.tables = list(tables)
+        self.shadows: Dict[str, str] = {t: t + SHADOW_SUFFIX for t in self.tables}
+        self.ann_indexes: List[str] = []
+
+    def shadow(self, table: str) -> str:
+        return self.shadows[table]
+
+    # --- 1) 생성 ---
+    def create(self, copy_data: bool = True) -> Dict[str, str]:
+        self.discard()  # 이전에 실패한 실행이 남긴 shadow 정리
+        with self.conn.cursor() as cur:
+            for table, shadow in self.shadows.items():
+                cur.execute(f"CREATE TABLE {shadow} (LIKE {table} INCLUDING ALL)")
+            for table, shadow in self.shadows.items():
+                for fk_name, fk_def in self._foreign_keys(cur, table):
+                    for parent, parent_shadow in self.shadows.items():
+                        # search_path에 있는 스키마면 이름만 나오므로 두 형태 모두 처리
+                        for ref in (parent, _split(parent)[1]):
+                            fk_def = re.sub(rf"REFERENCES {re.escape(ref)}\(", f"REFERENCES {parent_shadow}(", fk_def)
+                    cur.execute(f"ALTER TABLE {shadow} ADD CONSTRAINT {fk_name} {fk_def}")
+
+        # LIKE ... INCLUDING ALL로 따라온 ANN 인덱스는 데이터를 넣기 전에 내린다
+        # (복사/적재 동안 행 단위 유지 비용 없이, build_indexes에서 한 번에 빌드)
+        self.ann_indexes = []
+        for shadow in self.shadows.values():
+            self.ann_indexes.extend(drop_vector_indexes(self.conn, shadow))
+
+        if copy_data:
+            with self.conn.cursor() as cur:
+                for table, shadow in self.shadows.items():
+                    cur.execute(f"INSERT INTO {shadow} SELECT * FROM {table}")
+            self.conn.commit()
+        return dict(self.shadows)
+
+    @staticmethod
+    def _foreign_keys(cur, table: str):
+        cur.execute(
+            """
+            SELECT conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype = 'f'
+            """,
+            (table,),
+        )
+        return cur.fetchall()
+
+    # --- 3) 인덱스 ---
+    def build_indexes(self, maintenance_work_mem: Optional[str] = None,
+                      parallel_workers: Optional[int] = None) -> None:
+        restore_indexes(self.conn, self.ann_indexes, maintenance_work_mem=maintenance_work_mem,
+                        parallel_workers=parallel_workers)
+        with self.conn.cursor() as cur:
+            for shadow in self.shadows.values():
+                cur.execute(f"ANALYZE {shadow}")
+        self.conn.commit()
+
+    # --- 4) 교체 ---
+    def swap(self, keep_old: bool = False, lock_timeout: str = "5s", retries: int = 5) -> None:
+        """이름 변경만 하는 짧은 트랜잭션. 락을 못 잡으면 lock_timeout 후 재시도한다."""
+        for attempt in range(retries):
+            try:
+                self._swap_once(lock_timeout)
+                break
+            except errors.LockNotAvailable:
+                self.conn.rollback()
+                if attempt == retries - 1:
+                    raise
+                time.sleep(2 ** attempt)
+
+        if not keep_old:
+            olds = ", ".join(t + OLD_SUFFIX for t in reversed(self.tables))
+            with self.conn.cursor() as cur:
+                cur.execute(f"DROP TABLE IF EXISTS {olds}")
+            self.conn.commit()
+
+    def _swap_once(self, lock_timeout: str) -> None:
+        with self.conn.cursor() as cur:
+            cur.execute("SET LOCAL lock_timeout = %s", (lock_timeout,))
+            for table in self.tables:
+                cur.execute(f"DROP TABLE IF EXISTS {table + OLD_SUFFIX} CASCADE")
+            for table, shadow in self.shadows.items():
+                schema, name = _split(table)
+                live_indexes = self._indexes(cur, table)
+                cur.execute(f"ALTER TABLE {table} RENAME TO {name + OLD_SUFFIX}")
+                cur.execute(f"ALTER TABLE {shadow} RENAME TO {name}")
+
+                # 인덱스 이름을 운영 때와 같게 맞춘다 (정의가 같은 것끼리)
+                by_def = {_normalize_indexdef(d): n for n, d in live_indexes}
+                for index_name, _ in live_indexes:
+                    cur.execute(f"ALTER INDEX {schema}.{index_name} RENAME TO {index_name + OLD_SUFFIX}")
+                for index_name, indexdef in self._indexes(cur, table):
+                    target = by_def.pop(_normalize_indexdef(indexdef), None)
+                    if target and target != index_name:
+                        cur.execute(f"ALTER INDEX {schema}.{index_name} RENAME TO {target}")
+
+                # serial 시퀀스는 이전 테이블 소유 -> 새 테이블로 넘겨야 __old 삭제 때 같이 지워지지 않는다
+                cur.execute(
+                    """
+                    SELECT a.attname, pg_get_serial_sequence(%s, a.attname)
+                    FROM pg_attribute a
+                    WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+                    """,
+                    (table + OLD_SUFFIX, table + OLD_SUFFIX),
+                )
+                for column, sequence in cur.fetchall():
+                    if sequence:
+                        cur.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.{column}")
+        self.conn.commit()
+
+    @staticmethod
+    def _indexes(cur, table: str):
+        schema, name = _split(table)
+        cur.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = %s AND tablename = %s",
+            (schema, name),
+        )
+        return cur.fetchall()
+
+    def discard(self) -> None:
+        """shadow 테이블을 버린다 (적재 실패 시)."""
+        with self.conn.cursor() as cur:
+            for shadow in reversed(list(self.shadows.values())):
+                cur.execute(f"DROP TABLE IF EXISTS {shadow} CASCADE")
+        self.conn.commit()
@@ -0,0 +1,154 @@
+# Single-flight: 같은 key로 동시에 들어온 호출은 먼저 시작된 호출 하나만 실행하고
+# 나머지는 그 결과를 기다렸다가 함께 받는다 (결과 캐시는 하지 않음 - 진행 중인 호출만 공유)
+#
+# - SingleFlight: 스레드용 (graph.invoke, embed_query, llm.invoke)
+# - AsyncSingleFlight: asyncio용 (graph.ainvoke, aembed_query, llm.ainvoke)
+# - CoalescingEmbeddings / CoalescingChatModel: 임베딩/채팅 모델 호출에 적용하는 프록시
+#
+# SINGLE_FLIGHT_ENABLED=false 이면 모델 프록시를 씌우지 않는다 (models.py)
+import asyncio
+from threading import Event, Lock
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from metrics import record_singleflight
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """스레드 간 중복 호출 병합"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, bool]:
+        """(결과, 다른 호출의 결과를 공유받았는지)를 반환한다. 예외도 함께 공유된다."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        record_singleflight(self.name, shared=not leader)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+
+class AsyncSingleFlight:
+    """이벤트 루프 안에서의 중복 호출 병합
+
+    실제 작업은 별도 Task로 실행하고 모든 호출자가 shield로 기다리므로,
+    먼저 들어온 요청이 취소(클라이언트 연결 종료 등)돼도 나머지는 결과를 받는다.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._tasks: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Tuple[Any, bool]:
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+        task = self._tasks.get(task_key)
+        shared = task is not None
+        if not shared:
+            task = loop.create_task(fn(*args, **kwargs))
+            self._tasks[task_key] = task
+            task.add_done_callback(lambda t: self._tasks.pop(task_key, None) if self._tasks.get(task_key) is t else None)
+        record_singleflight(self.name, shared=shared)
+        return await asyncio.shield(task), shared
+
+
+def normalize_question(question: str) -> str:
+    """공백/대소문자/끝 문장부호만 다른 질문을 같은 key로 본다."""
+    return " ".join((question or "").split()).lower().rstrip("?!.。 ")
+
+
+# --- 모델 프록시 ---
+_embedding_flight = SingleFlight("embedding")
+_async_embedding_flight = AsyncSingleFlight("embedding")
+_llm_flight = SingleFlight("llm")
+_async_llm_flight = AsyncSingleFlight("llm")
+
+
+class CoalescingEmbeddings:
+    """같은 텍스트의 embed_query 동시 호출을 한 번의 API 호출로 합친다."""
+
+    def __init__(self, embeddings):
+        self._embeddings = embeddings
+
+    def __getattr__(self, name):
+        return getattr(self._embeddings, name)
+
+    def embed_query(self, text: str):
+        result, _ = _embedding_flight.do((id(self._embeddings), text), self._embeddings.embed_query, text)
+        return list(result)
+
+    async def aembed_query(self, text: str):
+        result, _ = await _async_embedding_flight.do(
+            (id(self._embeddings), text), self._embeddings.aembed_query, text
+        )
+        return list(result)
+
+    def embed_documents(self, texts):
+        return self._embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts):
+        return await self._embeddings.aembed_documents(texts)
+
+
+class CoalescingChatModel:
+    """같은 모델에 같은 메시지로 동시에 들어온 invoke/ainvoke를 한 번의 호출로 합친다.
+
+    메시지 리스트 입력만 병합하고, 그 외 입력이나 추가 인자가 있는 호출은 그대로 전달한다.
+    """
+
+    def __init__(self, llm):
+        self._llm = llm
+
+    def __getattr__(self, name):
+        return getattr(self._llm, name)
+
+    def _key(self, messages) -> Optional[Hashable]:
+        if not isinstance(messages, list):
+            return None
+        try:
+            return (id(self._llm), tuple((m.type, str(m.content)) for m in messages))
+        except AttributeError:
+            return None
+
+    def invoke(self, messages, config=None, **kwargs):
+        key = self._key(messages)
+        if key is None or config is not None or kwargs:
+            return self._llm.invoke(messages, config, **kwargs)
+        result, _ = _llm_flight.do(key, self._llm.invoke, messages)
+        return result
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        key = self._key(messages)
+        if key is None or config is not None or kwargs:
+            return await self._llm.ainvoke(messages, config, **kwargs)
+        result, _ = await _async_llm_flight.do(key, self._llm.ainvoke, messages)
+        return result
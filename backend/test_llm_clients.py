@@ -0,0 +1,97 @@
+"""
+공유 LLM 클라이언트가 이벤트 루프가 바뀌어도 (요청마다 asyncio.run) 계속 동작하는지 확인한다.
+
+  python -m pytest backend/test_llm_clients.py
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from llm_clients import registry
+from models import _load_ollama, load_openai_model
+
+
+class _ChatCompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: 다음 요청이 풀에 남은 커넥션을 재사용하게 한다
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path == "/api/chat":  # ollama (NDJSON 스트림의 마지막 줄 하나)
+            body = json.dumps({
+                "model": "test-model",
+                "created_at": "2026-01-01T00:00:00Z",
+                "message": {"role": "assistant", "content": "pong"},
+                "done": True,
+                "done_reason": "stop",
+            }).encode() + b"\n"
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        body = json.dumps({
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "test-model",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "pong"},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def llm_server(monkeypatch):
+    monkeypatch.delenv("LLM_BACKEND", raising=False)
+    monkeypatch.setenv("SINGLE_FLIGHT_ENABLED", "false")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatCompletionHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    registry.close()
+
+
+def test_same_model_across_event_loops(llm_server):
+    # runserver + async 뷰는 요청마다 새 이벤트 루프에서 돈다
+    params = (("api_key", "test"), ("base_url", f"{llm_server}/v1"), ("max_retries", 0), ("model", "test-model"))
+    llm = load_openai_model(params_key=params)
+
+    for _ in range(3):
+        assert asyncio.run(llm.ainvoke("ping")).content == "pong"
+    assert load_openai_model(params_key=params) is llm
+
+
+def test_sync_and_async_calls_share_model(llm_server):
+    params = (("api_key", "test"), ("base_url", f"{llm_server}/v1"), ("max_retries", 0), ("model", "test-model"))
+    llm = load_openai_model(params_key=params)
+
+    assert llm.invoke("ping").content == "pong"
+    assert asyncio.run(llm.ainvoke("ping")).content == "pong"
+    assert llm.invoke("ping").content == "pong"
+
+
+def test_ollama_model_across_event_loops(llm_server, monkeypatch):
+    monkeypatch.setenv("OLLAMA_BASE_URL", llm_server)
+    llm = _load_ollama("test-model", 0.2)
+
+    for _ in range(3):
+        assert asyncio.run(llm.ainvoke("ping")).content == "pong"
+    assert llm.invoke("ping").content == "pong"
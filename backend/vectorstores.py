@@ -0,0 +1,32 @@
+import os
+
+from models import get_embedding_model
+from utils import make_conn_str
+
+
+def _vector_backend() -> str:
+    """VECTOR_BACKEND: pgvector(기본값) | memory (benchmarks의 인메모리 스토어, DB 불필요)"""
+    return os.getenv("VECTOR_BACKEND", "pgvector").lower()
+
+
+def get_college_vectorstore(embedding_fn=None):
+    """대학/학과 검색용 벡터 스토어"""
+    embedding_fn = embedding_fn or get_embedding_model()
+    if _vector_backend() == "memory":
+        from benchmarks.fakes import InMemoryCollegeStore
+        return InMemoryCollegeStore.shared(embedding_fn)
+
+    from CustomPGvector import CustomPGVector
+    return CustomPGVector(conn_str=make_conn_str(), embedding_fn=embedding_fn)
+
+
+def get_interview_vectorstore(embedding_fn=None):
+    """면접 질문/답변 검색용 벡터 스토어"""
+    embedding_fn = embedding_fn or get_embedding_model()
+    if _vector_backend() == "memory":
+        from benchmarks.fakes import InMemoryInterviewStore
+        return InMemoryInterviewStore.shared(embedding_fn)
+
+    # 생성 비용 없음: 연결은 conn_str별 공유 풀(pg_pool)에서 조회할 때만 빌린다
+    from InterviewPGVector import InterviewPGVector
+    return InterviewPGVector(conn_str=make_conn_str(), embedding_fn=embedding_fn)
@@ -1,9 +1,10 @@
 import json
 import logging
+import os
 import sys
 from pathlib import Path
 from threading import Lock
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 from django.conf import settings
 
@@ -18,6 +19,10 @@ if str(BACKEND_ROOT) not in sys.path:
 
 try:
     from LangGraph.graph import create_graph_flow  # type: ignore
+    from SemanticCache import SemanticAnswerCache  # type: ignore
+    from models import get_embedding_model  # type: ignore
+    from singleflight import AsyncSingleFlight, SingleFlight, normalize_question  # type: ignore
+    from utils import make_conn_str  # type: ignore
 except Exception as exc:  # pragma: no cover - import guard
     logger.exception("Failed to import LangGraph.graph: {exc}")
     raise
@@ -25,6 +30,13 @@ except Exception as exc:  # pragma: no cover - import guard
 _graph_lock = Lock()
 _graph_app = None
 
+_cache_lock = Lock()
+_semantic_cache = None
+
+# 같은 질문(정규화) + 같은 그래프 입력 프로필로 동시에 들어온 요청은 그래프를 한 번만 실행
+_chat_flight = SingleFlight("chat_flow")
+_async_chat_flight = AsyncSingleFlight("chat_flow")
+
 
 def get_graph_app():
     global _graph_app
@@ -35,6 +47,21 @@ def get_graph_app():
     return _graph_app
 
 
+def get_semantic_cache() -> Optional[SemanticAnswerCache]:
+    """SEMANTIC_CACHE_ENABLED=true 일 때만 의미 캐시를 초기화해 반환한다."""
+    global _semantic_cache
+    if os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() != "true":
+        return None
+    with _cache_lock:
+        if _semantic_cache is None:
+            logger.info("Initializing semantic answer cache")
+            _semantic_cache = SemanticAnswerCache(
+                conn_str=make_conn_str(),
+                embedding_fn=get_embedding_model(),
+            )
+    return _semantic_cache
+
+
 def build_user_profile(profile: Dict[str, Any]) -> str:
     name = profile.get("name") or "알 수 없음"
     stage = profile.get("careerStage") or "미정"
@@ -57,7 +84,112 @@ def build_user_profile(profile: Dict[str, Any]) -> str:
     )
 
 
-def run_chat_flow(user_profile: str, question: str) -> Dict[str, Any]:
+def build_profile_bucket(profile: Dict[str, Any]) -> str:
+    """의미 캐시 키로 쓰는 거친 프로필 버킷 (이름/관심사 제외, 단계와 전공 계열만)"""
+    stage_type = profile.get("stageType") or "student"
+    stage = profile.get("careerStage") or "미정"
+    major = profile.get("major") or ("해당 없음" if stage_type != "student" else "미정")
+    return "|".join(str(field).replace("|", "/") for field in (stage_type, stage, major))
+
+
+def build_bucket_profile(profile_bucket: str) -> str:
+    """버킷 필드(단계/전공 계열)만으로 만든 그래프 입력 프로필 (이름/관심사 없음)"""
+    stage_type, stage, major = profile_bucket.split("|", 2)
+    hint = "고등학생" if stage_type == "student" else "취업/면접 준비생"
+    return f"단계: {stage} ({hint}) | 전공 계열: {major}"
+
+
+def _resolve_profile(user_profile: str, profile_bucket: Optional[str]) -> Tuple[str, Optional[str]]:
+    """(그래프에 넘길 프로필, 의미 캐시 버킷)
+
+    버킷은 의미 캐시를 쓸 때만 사용하고, 그때는 그래프에도 버킷 필드만 넘긴다.
+    -> 버킷 단위로 공유되는 답변에 다른 사용자의 이름/관심사가 들어가지 않는다.
+    캐시를 쓰지 않으면 전체 프로필로 실행해 개인화된 답변을 유지한다.
+    """
+    if profile_bucket and get_semantic_cache() is not None:
+        return build_bucket_profile(profile_bucket), profile_bucket
+    return user_profile, None
+
+
+def _flight_key(graph_profile: str, question: str):
+    # 그래프가 실제로 받는 프로필 전체를 키에 넣는다 -> 같은 입력으로 만든 답변만 공유
+    return (normalize_question(question), graph_profile)
+
+
+def run_chat_flow(
+    user_profile: str,
+    question: str,
+    profile_bucket: Optional[str] = None,
+) -> Dict[str, Any]:
+    graph_profile, profile_bucket = _resolve_profile(user_profile, profile_bucket)
+    result, shared = _chat_flight.do(
+        _flight_key(graph_profile, question),
+        _run_chat_flow, graph_profile, question, profile_bucket,
+    )
+    return {**result, "coalesced": True} if shared else result
+
+
+def _run_chat_flow(
+    user_profile: str,
+    question: str,
+    profile_bucket: Optional[str] = None,
+) -> Dict[str, Any]:
+    cache = get_semantic_cache() if profile_bucket else None
+    embedding = None
+    if cache is not None:
+        try:
+            cached, embedding = cache.lookup(question, profile_bucket)
+            if cached is not None:
+                return {**cached, "cache_hit": True}
+        except Exception:
+            logger.exception("Semantic cache lookup failed")
+
     graph = get_graph_app()
     result = graph.invoke({"user": user_profile, "question": question})
+
+    if cache is not None and result:
+        try:
+            cache.store(question, profile_bucket, result, embedding=embedding)
+        except Exception:
+            logger.exception("Semantic cache store failed")
+    return result or {}
+
+
+async def arun_chat_flow(
+    user_profile: str,
+    question: str,
+    profile_bucket: Optional[str] = None,
+) -> Dict[str, Any]:
+    """run_chat_flow의 비동기 버전. LLM 대기 중에도 워커 스레드를 점유하지 않는다."""
+    graph_profile, profile_bucket = _resolve_profile(user_profile, profile_bucket)
+    result, shared = await _async_chat_flight.do(
+        _flight_key(graph_profile, question),
+        _arun_chat_flow, graph_profile, question, profile_bucket,
+    )
+    return {**result, "coalesced": True} if shared else result
+
+
+async def _arun_chat_flow(
+    user_profile: str,
+    question: str,
+    profile_bucket: Optional[str] = None,
+) -> Dict[str, Any]:
+    cache = get_semantic_cache() if profile_bucket else None
+    embedding = None
+    if cache is not None:
+        try:
+            cached, embedding = await cache.alookup(question, profile_bucket)
+            if cached is not None:
+                return {**cached, "cache_hit": True}
+        except Exception:
+            logger.exception("Semantic cache lookup failed")
+
+    graph = get_graph_app()
+    result = await graph.ainvoke({"user": user_profile, "question": question})
+
+    if cache is not None and result:
+        try:
+            await cache.astore(question, profile_bucket, result, embedding=embedding)
+        except Exception:
+            logger.exception("Semantic cache store failed")
     return result or {}
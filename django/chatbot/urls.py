@@ -10,4 +10,5 @@ urlpatterns = [
     path("chat/", views.chatbot_chat, name="chat"),
     path("chat/conversation/", views.chatbot_conversation, name="chat-detail"),
     path("api/ask/", views.chatbot_ask, name="api-ask"),
+    path("metrics", views.metrics, name="metrics"),
 ]
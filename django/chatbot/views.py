@@ -2,11 +2,15 @@ import json
 import logging
 import re
 
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render
-from django.views.decorators.http import require_POST
+from django.views.decorators.csrf import ensure_csrf_cookie
+from django.views.decorators.http import require_GET, require_POST
 
-from .backend_client import build_user_profile, run_chat_flow
+from .backend_client import arun_chat_flow, build_profile_bucket, build_user_profile
+
+# backend_client가 backend 경로를 sys.path에 추가한 뒤에 import
+from metrics import render_latest  # type: ignore  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
@@ -21,13 +25,15 @@ def chatbot_chat(request):
     return render(request, "chatbot/chat_v2.html")
 
 
+@ensure_csrf_cookie
 def chatbot_conversation(request):
     """Render the full conversation interface (v3)."""
     return render(request, "chatbot/chat_v3.html")
 
 
 @require_POST
-def chatbot_ask(request):
+async def chatbot_ask(request):
+    """LangGraph 흐름을 비동기로 실행한다 (ASGI 서버에서 동시 요청을 한 워커로 처리)."""
     try:
         payload = json.loads(request.body or "{}")
     except json.JSONDecodeError:
@@ -42,7 +48,9 @@ def chatbot_ask(request):
     user_profile = build_user_profile(profile)
 
     try:
-        result = run_chat_flow(user_profile, question)
+        result = await arun_chat_flow(
+            user_profile, question, profile_bucket=build_profile_bucket(profile)
+        )
     except Exception as exc:  # pragma: no cover - runtime safeguard
         logger.exception("Chat flow execution failed")
         return JsonResponse({"error": "답변을 생성하는 중 문제가 발생했습니다."}, status=500)
@@ -61,11 +69,20 @@ def chatbot_ask(request):
         "metadata": {
             "classification_reason": result.get("classification_reason"),
             "evaluation": result.get("answer_eval", {}),
+            "cached": bool(result.get("cache_hit")),
+            "coalesced": bool(result.get("coalesced")),
         },
     }
     return JsonResponse(response)
 
 
+@require_GET
+def metrics(request):
+    """Prometheus scrape 엔드포인트 (노드/LLM/벡터 검색 지연시간, 토큰 수, 캐시 hit)."""
+    body, content_type = render_latest()
+    return HttpResponse(body, content_type=content_type)
+
+
 def _normalize_answer_text(text: str) -> str:
     """LLM 답변에서 마크다운 기호 제거 및 줄바꿈 보정."""
     if not text:
@@ -3,6 +3,11 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+``chatbot_ask`` is an async view, so serving this module with an ASGI worker
+lets a single process keep many LangGraph conversations in flight:
+
+    gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -0,0 +1,21 @@
+CREATE EXTENSION IF NOT EXISTS vector;
+
+CREATE SCHEMA IF NOT EXISTS cache;
+
+-- 의미 캐시: 질문 임베딩 + 프로필 버킷으로 생성된 답변을 재사용
+CREATE TABLE IF NOT EXISTS cache.semantic_answer_cache (
+    id BIGSERIAL PRIMARY KEY,
+    profile_bucket TEXT NOT NULL,
+    domain TEXT,                                   -- 'interview' / 'college' (재적재 시 무효화 단위)
+    question TEXT NOT NULL,
+    embedding VECTOR NOT NULL,
+    result JSONB NOT NULL,                         -- final_answer / answer / category ...
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS semantic_answer_cache_bucket_idx
+    ON cache.semantic_answer_cache (profile_bucket, expires_at);
+CREATE INDEX IF NOT EXISTS semantic_answer_cache_domain_idx
+    ON cache.semantic_answer_cache (domain);
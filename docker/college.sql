@@ -13,5 +13,11 @@ CREATE TABLE IF NOT EXISTS college.college_vector_db (
     universities TEXT,
     embedding VECTOR(3072) NOT NULL,
     metadata JSONB,
+    chunk_index INTEGER NOT NULL DEFAULT 0,      -- 전공 문서 내 청크 순서
+    content_hash TEXT,                           -- 청크 내용+메타데이터 해시 (바뀐 청크만 재임베딩)
     created_at TIMESTAMPTZ DEFAULT NOW()
-);
\ No newline at end of file
+);
+
+-- 증분 적재(upsert) 키
+CREATE UNIQUE INDEX IF NOT EXISTS college_college_vector_db_chunk_key
+    ON college.college_vector_db (major_seq, chunk_index);
\ No newline at end of file
@@ -36,6 +36,7 @@ CREATE TABLE IF NOT EXISTS interview.vector (
     end_char   INTEGER,                            -- 선택: 원문 내 끝 위치
     emb_model  TEXT NOT NULL,
     emb_dim    INT  NOT NULL,
+    content_hash TEXT,                             -- 임베딩한 원문+청킹 설정 해시 (재실행 시 변경분만 임베딩)
     embedding  vector(3072) NOT NULL,              -- text-embedding-3-large
     created_at TIMESTAMP DEFAULT NOW(),
     UNIQUE (doc_id, chunk_seq),                    -- 문서 내 중복 방지
@@ -12,5 +12,19 @@ done
 echo "Applying migrations..."
 python manage.py migrate --noinput
 
+if [ "${WEB_SERVER:-runserver}" = "asgi" ]; then
+  echo "Starting Django ASGI server (gunicorn + uvicorn workers)..."
+  # 워커가 여러 개면 /metrics가 모든 워커의 지표를 합치도록 multiprocess 모드 사용
+  if [ "${WEB_WORKERS:-1}" -gt 1 ]; then
+    export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}"
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+  fi
+  exec gunicorn config.asgi:application \
+    -k uvicorn.workers.UvicornWorker \
+    -b 0.0.0.0:8000 \
+    --workers "${WEB_WORKERS:-1}" \
+    --timeout "${WEB_TIMEOUT:-120}"
+fi
+
 echo "Starting Django runserver..."
 exec python manage.py runserver 0.0.0.0:8000